@@ -1,79 +1,175 @@
-from utils.openrouter_client import OpenRouterClient
+from utils.openrouter_client import OpenRouterClient, StructuredOutputError
+from config.generation_profiles import get_profile
+from utils.structured_output import BOSS_REVIEW_SCHEMA, BOSS_PICK_SCHEMA
+from utils.tweet_lint import truncate_weighted
 import os
-import re
+
+BOSS_CRITERIA = """You are the CEO reviewing content before publication. The request says which attempt this is.
+
+You have high standards for:
+1. Content quality and accuracy
+2. Brand consistency for an AI automation consultant
+3. Business value and client attraction
+4. Professional presentation with specific metrics (when appropriate)
+5. Authority positioning and credibility markers
+6. For personal journey content, focus on process and learning over metrics
+
+Approved content should:
+- Attract small business owners who need automation services
+- Demonstrate expertise and authority
+- Include specific metrics and concrete examples for promotional content
+- For personal journey content, focus on process, learning, and technical details
+- Have clear business value proposition
+- Include professional call-to-action
+- Avoid generic or vague statements"""
+
+BOSS_SYSTEM_PROMPT = BOSS_CRITERIA + """
+
+Decide APPROVE or REJECT and reply with a single JSON object, nothing else:
+{"verdict": "APPROVE" or "REJECT", "tweet": "...", "feedback": "...", "hashtags": ["#..."]}
+
+If APPROVE: "tweet" is ONLY the final clean tweet content ready to post, "feedback" may be empty.
+If REJECT: "feedback" is specific, actionable feedback for improvement, "tweet" may be empty.
+"hashtags" lists the hashtags in the tweet (empty when rejecting)."""
+
+BOSS_PICK_SYSTEM_PROMPT = BOSS_CRITERIA + """
+
+You are shown several numbered candidates for the same post. Pick the single best one if it meets
+the bar, otherwise reject them all. Reply with a single JSON object, nothing else:
+{"verdict": "APPROVE" or "REJECT", "choice": <candidate number, 0 when rejecting>, "tweet": "...", "feedback": "...", "hashtags": ["#..."]}
+
+If APPROVE: "choice" is the number of the best candidate and "tweet" is ONLY its final clean content
+ready to post (you may polish it), "feedback" may be empty.
+If REJECT: "choice" is 0 and "feedback" is specific, actionable feedback that applies to the next
+round of drafts, "tweet" may be empty.
+"hashtags" lists the hashtags in the tweet (empty when rejecting)."""
+
+# Feedback for a review that could not be parsed; the raw output is logged, never passed on, since it
+# would steer classify_feedback and the writer's revision prompt with text that is not a critique
+UNREADABLE_REVIEW_FEEDBACK = "Review output was unreadable; revise for clarity and template compliance"
 
 class BossAgent:
     def __init__(self):
         # Load authentic personal persona
         self.load_persona()
         
-        self.client = OpenRouterClient()
-        self.model = os.getenv('SONNET_MODEL', 'anthropic/claude-3.5-sonnet')
+        self.client = OpenRouterClient(agent_name="boss")
+        self.profile = get_profile("boss")
+        self.model = self.profile["model"]
 
     def review_and_approve(self, research_data, writer_data, keyword_data, seo_data, attempt_number=1):
+        # Static review criteria first so the provider can cache them; only the user turn varies
         messages = [
             {
                 "role": "system",
-                "content": f"""You are the CEO reviewing content before publication. This is attempt {attempt_number}.
+                "content": BOSS_SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": f"""
+                Review this content pipeline for an AI automation business:
 
-                You have high standards for:
-                1. Content quality and accuracy
-                2. Brand consistency for an AI automation consultant
-                3. Business value and client attraction
-                4. Professional presentation with specific metrics (when appropriate)
-                5. Authority positioning and credibility markers
-                6. For personal journey content, focus on process and learning over metrics
+                ATTEMPT: {attempt_number}
+                RESEARCH THEME: {research_data.get('theme', 'general')}
+                CONTENT TYPE: {research_data.get('content_type', 'general')}
+                FINAL CONTENT: {seo_data['final_content']}
 
-                Respond with either APPROVE or REJECT.
+                Decision (JSON): APPROVE or REJECT
+                """
+            }
+        ]
 
-                If APPROVE: Start with "APPROVE:" then provide ONLY the final clean tweet content ready to post (no additional commentary).
-                If REJECT: Start with "REJECT:" then provide specific, actionable feedback for improvement."""
+        # Schema-constrained verdict; malformed output gets one cheap repair call, not a new attempt
+        try:
+            review = self.client.chat_completion_json(messages, BOSS_REVIEW_SCHEMA, "boss_review", self.model,
+                                                      check=self._check_review, stream=True)
+        except StructuredOutputError as e:
+            # Still unreadable: treat as a rejection so the pipeline revises rather than posting
+            self._log_unreadable(e)
+            review = {"verdict": "REJECT", "tweet": "", "feedback": UNREADABLE_REVIEW_FEEDBACK, "hashtags": []}
+
+        return self._decision(review, attempt_number)
+
+    def review_candidates(self, research_data, candidates, attempt_number=1):
+        """Review several finished candidates in one call; pick the best or reject them all
+
+        candidates are seo_data dicts. The decision has the review_and_approve
+        shape plus "choice", the 1-based index of the picked candidate (None
+        when all are rejected).
+        """
+        listing = "\n\n".join(f"CANDIDATE {i}:\n{candidate['final_content']}"
+                               for i, candidate in enumerate(candidates, 1))
+        messages = [
+            {
+                "role": "system",
+                "content": BOSS_PICK_SYSTEM_PROMPT
             },
             {
                 "role": "user",
                 "content": f"""
-                Review this content pipeline for an AI automation business:
+                Review these {len(candidates)} candidates for an AI automation business:
 
                 ATTEMPT: {attempt_number}
                 RESEARCH THEME: {research_data.get('theme', 'general')}
                 CONTENT TYPE: {research_data.get('content_type', 'general')}
-                FINAL CONTENT: {seo_data['final_content']}
 
-                This content should:
-                - Attract small business owners who need automation services
-                - Demonstrate expertise and authority
-                - Include specific metrics and concrete examples for promotional content
-                - For personal journey content, focus on process, learning, and technical details
-                - Have clear business value proposition
-                - Include professional call-to-action
-                - Avoid generic or vague statements
+                {listing}
 
-                Decision: APPROVE or REJECT
+                Decision (JSON): APPROVE the best candidate or REJECT all
                 """
             }
         ]
 
-        decision = self.client.chat_completion(messages, self.model)
+        def check(review):
+            errors = self._check_review(review)
+            if review["verdict"] == "APPROVE" and not 1 <= review["choice"] <= len(candidates):
+                errors.append(f"choice {review['choice']} is not a candidate number (1-{len(candidates)})")
+            return errors
+
+        try:
+            review = self.client.chat_completion_json(messages, BOSS_PICK_SCHEMA, "boss_pick", self.model,
+                                                      check=check, stream=True)
+        except StructuredOutputError as e:
+            self._log_unreadable(e)
+            review = {"verdict": "REJECT", "choice": 0, "tweet": "", "feedback": UNREADABLE_REVIEW_FEEDBACK,
+                      "hashtags": []}
+
+        decision = self._decision(review, attempt_number)
+        decision["choice"] = review["choice"] if review["verdict"] == "APPROVE" else None
+        return decision
+
+    @staticmethod
+    def _log_unreadable(error):
+        print(f"⚠️ Boss review unreadable, treating as REJECT: {error}")
+        if error.output:
+            print(f"   Raw review output: {error.output[:500]}")
 
-        # Extract clean content if approved
+    @staticmethod
+    def _decision(review, attempt_number):
         final_approved_content = None
-        if "APPROVE" in decision.upper():
-            if "APPROVE:" in decision:
-                final_approved_content = decision.split("APPROVE:", 1)[1].strip()
-            else:
-                final_approved_content = re.sub(r'^.*?APPROVE[:\s]*', '', decision, flags=re.IGNORECASE).strip()
+        if review["verdict"] == "APPROVE":
+            final_approved_content = review["tweet"].strip()
 
-            # Ensure tweet fits Twitter’s 280 char limit
-            if len(final_approved_content) > 280:
-                final_approved_content = final_approved_content[:277] + "..."
+            # Ensure tweet fits Twitter’s 280 char limit, counted the way Twitter counts (emojis and links weigh more)
+            final_approved_content = truncate_weighted(final_approved_content)
 
         return {
-            "decision": decision,
+            "decision": review["verdict"],
+            "feedback": review["feedback"],
+            "hashtags": review["hashtags"],
             "attempt_number": attempt_number,
             "final_approved_content": final_approved_content,
             "agent": "boss"
         }
 
+    @staticmethod
+    def _check_review(review):
+        """Verdict-dependent fields the schema cannot require on its own"""
+        if review["verdict"] == "APPROVE" and not review["tweet"].strip():
+            return ["APPROVE without a tweet"]
+        if review["verdict"] == "REJECT" and not review["feedback"].strip():
+            return ["REJECT without feedback"]
+        return []
 
     def load_persona(self):
         """Load authentic personal persona"""
@@ -52,18 +52,21 @@ class EngagementAgent:
         except Exception as e:
             return {"error": f"Failed to find target audience content: {str(e)}"}
     
+    def _comment_data(self, tweet_data):
+        """Prepare comment data for the response agent"""
+        return {
+            'tweet_id': tweet_data['id'],
+            'user_id': tweet_data['author_id'],
+            'username': f"user_{tweet_data['author_id']}",  # Would need to fetch actual username
+            'content': tweet_data['text']
+        }
+    
     def generate_engagement_response(self, tweet_data):
         """
         Generate a valuable response to engage with target audience content
         """
         try:
-            # Prepare comment data for the response agent
-            comment_data = {
-                'tweet_id': tweet_data['id'],
-                'user_id': tweet_data['author_id'],
-                'username': f"user_{tweet_data['author_id']}",  # Would need to fetch actual username
-                'content': tweet_data['text']
-            }
+            comment_data = self._comment_data(tweet_data)
             
             # Generate response using the ResponseAgent
             response_content = self.response_agent.generate_response(comment_data)
@@ -73,10 +76,35 @@ class EngagementAgent:
         except Exception as e:
             return None
     
-    def engage_with_content(self, tweet_data, engagement_type="like_and_comment"):
+    def engage_with_content_batch(self, engagements, max_concurrency=None):
+        """
+        Engage with many tweets, generating all comments concurrently first
+        engagements: List of (tweet_data, engagement_type) pairs
+        Returns one result per engagement, in order
+        """
+        to_comment = [tweet_data for tweet_data, engagement_type in engagements
+                      if engagement_type in ["comment", "like_and_comment"]]
+        comments = {}
+        if to_comment:
+            results = self.response_agent.generate_responses(
+                [(self._comment_data(tweet_data), None) for tweet_data in to_comment],
+                max_concurrency=max_concurrency
+            )
+            for tweet_data, result in zip(to_comment, results):
+                # An empty comment is reported as comment_generation_failed, not regenerated
+                comments[tweet_data['id']] = result['content'] or ''
+        
+        return [
+            self.engage_with_content(tweet_data, engagement_type,
+                                     response_content=comments.get(tweet_data['id']))
+            for tweet_data, engagement_type in engagements
+        ]
+    
+    def engage_with_content(self, tweet_data, engagement_type="like_and_comment", response_content=None):
         """
         Proactively engage with content from your target audience
         engagement_type: "like", "retweet", "comment", or "like_and_comment"
+        response_content: Pre-generated comment (e.g. from engage_with_content_batch)
         """
         try:
             results = {
@@ -102,7 +130,8 @@ class EngagementAgent:
             
             # Comment on the tweet
             if engagement_type in ["comment", "like_and_comment"]:
-                response_content = self.generate_engagement_response(tweet_data)
+                if response_content is None:
+                    response_content = self.generate_engagement_response(tweet_data)
                 if response_content:
                     try:
                         reply_response = self.twitter_client.reply_to_tweet(response_content, tweet_data['id'])
@@ -1,4 +1,6 @@
 from utils.openrouter_client import OpenRouterClient
+from config.generation_profiles import get_profile
+from utils.prompt_budget import PromptBudget
 import os
 
 class KeywordAgent:
@@ -6,10 +8,12 @@ class KeywordAgent:
         # Load authentic personal persona
         self.load_persona()
         
-        self.client = OpenRouterClient()
-        self.model = os.getenv('HAIKU_MODEL', 'anthropic/claude-3-haiku')
+        self.client = OpenRouterClient(agent_name="keyword")
+        self.profile = get_profile("keyword")
+        self.model = self.profile["model"]
+        self.prompt_budget = PromptBudget("keyword")
     
-    def optimize_keywords(self, content_data):
+    def optimize_keywords(self, content_data, model=None):
         messages = [
             {
                 "role": "system",
@@ -29,7 +33,7 @@ class KeywordAgent:
             }
         ]
         
-        keywords = self.client.chat_completion(messages, self.model)
+        keywords = self.client.chat_completion(messages, model or self.model)
         
         return {
             "optimized_content": keywords,
@@ -37,8 +41,25 @@ class KeywordAgent:
             "agent": "keyword"
         }
 
-    def optimize_keywords_with_feedback(self, content_data, boss_feedback):
-        messages = [
+    def optimize_keywords_with_feedback(self, content_data, boss_feedback, model=None):
+        # The draft itself is never trimmed, only the feedback wrapped around it
+        messages = self.prompt_budget.fit(
+            lambda boss_feedback: self._build_revision_messages(content_data, boss_feedback),
+            {"boss_feedback": (boss_feedback, 1)}
+        )
+
+        keywords = self.client.chat_completion(messages, model or self.model)
+
+        return {
+            "optimized_content": keywords,
+            "original_content": content_data['content'],
+            "boss_feedback_addressed": boss_feedback,
+            "revision": True,
+            "agent": "keyword"
+        }
+
+    def _build_revision_messages(self, content_data, boss_feedback):
+        return [
             {
                 "role": "system",
                 "content": f"""You are revising keyword optimization based on CEO feedback.
@@ -74,17 +95,6 @@ class KeywordAgent:
             }
         ]
 
-        keywords = self.client.chat_completion(messages, self.model)
-
-        return {
-            "optimized_content": keywords,
-            "original_content": content_data['content'],
-            "boss_feedback_addressed": boss_feedback,
-            "revision": True,
-            "agent": "keyword"
-        }
-
-
     def load_persona(self):
         """Load authentic personal persona"""
         import sys
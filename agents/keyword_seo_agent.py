@@ -0,0 +1,126 @@
+from utils.openrouter_client import OpenRouterClient, StructuredOutputError
+from config.generation_profiles import get_profile
+from utils.prompt_budget import PromptBudget
+from utils.structured_output import SEO_TWEET_SCHEMA
+import os
+
+class KeywordSEOAgent:
+    """Keyword and SEO optimisation in one call
+
+    Replaces the KeywordAgent -> SEOAgent pair, which rewrote the draft twice
+    with nearly the same instructions. Returns keyword_data and seo_data in
+    the shapes the separate stages produce, so the boss review is unchanged.
+    """
+
+    def __init__(self):
+        # Load authentic personal persona
+        self.load_persona()
+
+        self.client = OpenRouterClient(agent_name="keyword_seo")
+        self.profile = get_profile("keyword_seo")
+        self.model = self.profile["model"]
+        self.prompt_budget = PromptBudget("keyword_seo")
+
+    def optimize(self, content_data, model=None):
+        """Place hashtags and produce the final tweet for a first draft"""
+        return self._optimize(self._build_messages(content_data), content_data, model)
+
+    def optimize_with_feedback(self, content_data, boss_feedback, model=None):
+        # The draft itself is never trimmed, only the feedback wrapped around it
+        messages = self.prompt_budget.fit(
+            lambda boss_feedback: self._build_revision_messages(content_data, boss_feedback),
+            {"boss_feedback": (boss_feedback, 1)}
+        )
+        keyword_data, seo_data = self._optimize(messages, content_data, model)
+        for data in (keyword_data, seo_data):
+            data.update({"boss_feedback_addressed": boss_feedback, "revision": True})
+        return keyword_data, seo_data
+
+    def _optimize(self, messages, content_data, model):
+        try:
+            result = self.client.chat_completion_json(messages, SEO_TWEET_SCHEMA, "seo_tweet",
+                                                      model or self.model, stream=True)
+        except StructuredOutputError as e:
+            print(f"⚠️ Keyword/SEO output unreadable, keeping the writer draft: {e}")
+            result = {"tweet": content_data['content'], "hashtags": []}
+
+        keyword_data = {
+            "optimized_content": result["tweet"],
+            "original_content": content_data['content'],
+            "hashtags": result["hashtags"],
+            "agent": "keyword_seo"
+        }
+        seo_data = {
+            "final_content": result["tweet"],
+            "hashtags": result["hashtags"],
+            "agent": "keyword_seo"
+        }
+        return keyword_data, seo_data
+
+    def _build_messages(self, content_data):
+        return [
+            {
+                "role": "system",
+                "content": "You are a keyword and SEO specialist for Twitter in the AI automation space. "
+                           "Choose hashtags and produce the final, ready-to-post tweet in one pass."
+            },
+            {
+                "role": "user",
+                "content": f"""
+                Optimize this Twitter content: {content_data['content']}
+
+                1. Pick 3-5 relevant hashtags, e.g. #AI #Automation #Python #Business #Productivity #Tech
+                2. Place them strategically for discoverability and the Twitter algorithm
+                3. Maximize engagement potential while keeping the same message and authentic voice
+                4. Stay under 280 characters
+
+                Reply with only a JSON object: {{"tweet": "<final tweet, ready to post>", "hashtags": ["#..."]}}
+                """
+            }
+        ]
+
+    def _build_revision_messages(self, content_data, boss_feedback):
+        return [
+            {
+                "role": "system",
+                "content": f"""You are creating the final keyword and SEO revision based on CEO feedback.
+
+                PREVIOUS VERSION WAS REJECTED. Address these specific concerns:
+                {boss_feedback}
+
+                Focus on hashtags that:
+                - Attract business decision makers
+                - Emphasize measurable results and ROI
+                - Target small business automation needs
+                - Include professional service keywords
+                """
+            },
+            {
+                "role": "user",
+                "content": f"""
+                Content: {content_data['content']}
+
+                Create the final optimized version addressing CEO feedback:
+                - Must include specific metrics/numbers
+                - Must demonstrate professional authority
+                - Must have clear business value and a professional CTA
+                - Use 3-5 results-focused hashtags, e.g. #BusinessAutomation #AIConsultant #ProcessOptimization #SmallBusiness
+                - Must stay under 280 characters
+
+                Reply with only a JSON object: {{"tweet": "<final tweet, ready to post>", "hashtags": ["#..."]}}
+                """
+            }
+        ]
+
+    def load_persona(self):
+        """Load authentic personal persona"""
+        import sys
+        import os
+        sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
+        try:
+            from personal_persona import PERSONAL_PERSONA, AUTHENTIC_PHRASES
+            self.persona = PERSONAL_PERSONA
+            self.authentic_phrases = AUTHENTIC_PHRASES
+        except ImportError:
+            self.persona = {}
+            self.authentic_phrases = []
@@ -157,7 +157,8 @@ class MonitoringAgent:
             
             print(f"💬 Found {len(unresponded_mentions)} unresponded mentions")
             
-            # Respond to each mention
+            # Gather context for each mention
+            pending = []
             for mention_row in unresponded_mentions:
                 tweet_id, user_id, username, content = mention_row
                 
@@ -176,9 +177,21 @@ class MonitoringAgent:
                     'username': username,
                     'content': content
                 }
+                pending.append((comment_data, original_content))
+            
+            # Generate all responses concurrently instead of one round-trip at a time
+            results = self.response_agent.generate_responses(pending)
+            
+            for (comment_data, _), result in zip(pending, results):
+                tweet_id = comment_data['tweet_id']
+                username = comment_data['username']
+                
+                if result['error'] is not None:
+                    print(f"❌ Error generating response for @{username}: {result['error']}")
+                    continue
                 
-                # Generate response using the ResponseAgent
-                response_content = self.response_agent.generate_response(comment_data, original_content)
+                response_content = result['content']
+                print(f"   Generated reply for @{username} in {result['latency']:.1f}s")
                 
                 if response_content:
                     # Post the response
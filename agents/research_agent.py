@@ -1,14 +1,23 @@
 from utils.openrouter_client import OpenRouterClient
+from config.generation_profiles import get_profile
 import os
 import random
 import requests
 from datetime import datetime
+from utils.http_transport import get_session, get_timeout
+from utils.prompt_budget import PromptBudget, format_search_results
+from utils.retry import RetryEngine, RetryableHTTPError, RETRY_STATUSES, parse_retry_after
+from utils.cassette import get_cassette
+from utils.rate_limiter import get_rate_limiter
 
 class ResearchAgent:
     def __init__(self):
-        self.client = OpenRouterClient()
-        self.model = os.getenv('HAIKU_MODEL', 'anthropic/claude-3-haiku')
+        self.client = OpenRouterClient(agent_name="research")
+        self.profile = get_profile("research")
+        self.model = self.profile["model"]
         self.brave_api_key = os.getenv('BRAVE_API_KEY')
+        self.prompt_budget = PromptBudget("research")
+        self.brave_retry = RetryEngine("brave", retry_on=(requests.Timeout, requests.ConnectionError))
         
 
         # Load authentic personal persona
@@ -42,6 +51,11 @@ class ResearchAgent:
     
     def search_brave(self, query, count=3):
         """Search using Brave Search API for current information"""
+        # Recorded and replayed as a whole when CASSETTE_MODE is set
+        return get_cassette().call("brave", [query, count], lambda: self._search_brave(query, count),
+                                   label="search")
+
+    def _search_brave(self, query, count):
         if not self.brave_api_key:
             return "No current search results available"
             
@@ -57,9 +71,18 @@ class ResearchAgent:
             "country": "US"
         }
         
+        def fetch():
+            # Every attempt spends quota on the Brave key shared with the other processes
+            get_rate_limiter().acquire("brave", self.brave_api_key)
+            response = get_session().get("https://api.search.brave.com/res/v1/web/search",
+                                         headers=headers, params=params, timeout=get_timeout())
+            if response.status_code in RETRY_STATUSES:
+                raise RetryableHTTPError(response.status_code,
+                                         parse_retry_after(response.headers.get('Retry-After')))
+            return response
+
         try:
-            response = requests.get("https://api.search.brave.com/res/v1/web/search", 
-                                  headers=headers, params=params, timeout=10)
+            response = self.brave_retry.call(fetch)
             
             if response.status_code == 200:
                 results = response.json()
@@ -76,29 +99,66 @@ class ResearchAgent:
             else:
                 return f"Search unavailable (status: {response.status_code})"
                 
+        except RetryableHTTPError as e:
+            return f"Search unavailable (status: {e.status_code})"
         except Exception as e:
             return f"Search error: {str(e)}"
 
-    def research_topic(self, content_type=None, day_of_month=None):
+    def research_topic(self, content_type=None, day_of_month=None, model=None):
         """Enhanced research with real-time data"""
-        
+        plan = self.plan_research(content_type, day_of_month)
+        return self.write_research(plan, self.run_searches(plan), model=model)
+
+    def plan_research(self, content_type=None, day_of_month=None):
+        """Content type, monthly theme and the Brave queries to run for them"""
         # Auto-select content type if not specified
         if not content_type:
             content_type = self._select_content_type(day_of_month)
-        
+
         # Get current month theme
         current_month = datetime.now().month
         theme = self.monthly_themes.get(current_month, "foundation_building")
-        
-        # Get current trends via Brave search
-        search_queries = self._get_search_queries(content_type, theme)
-        current_trends = {}
-        
-        for query_name, query in search_queries.items():
-            search_results = self.search_brave(query)
-            current_trends[query_name] = search_results
-        
-        messages = [
+
+        return {
+            "content_type": content_type,
+            "theme": theme,
+            "search_queries": self._get_search_queries(content_type, theme)
+        }
+
+    def run_searches(self, plan):
+        """Get current trends via Brave search, one query after another"""
+        return {query_name: self.search_brave(query) for query_name, query in plan["search_queries"].items()}
+
+    def write_research(self, plan, current_trends, boss_feedback=None, model=None):
+        """Research completion over search results that were already fetched"""
+        theme, content_type = plan["theme"], plan["content_type"]
+        if boss_feedback is None:
+            # Search snippets are the first thing trimmed when the prompt runs long
+            messages = self.prompt_budget.fit(
+                lambda trends: self._build_research_messages(theme, content_type, trends),
+                {"trends": (format_search_results(current_trends), 1)}
+            )
+        else:
+            messages = self.prompt_budget.fit(
+                lambda trends, boss_feedback: self._build_revision_messages(theme, content_type, trends, boss_feedback),
+                {"trends": (format_search_results(current_trends), 1), "boss_feedback": (boss_feedback, 2)}
+            )
+
+        research = self.client.chat_completion(messages, model or self.model)
+
+        research_data = {
+            "content_type": content_type,
+            "theme": theme,
+            "research": research,
+            "current_trends": current_trends,
+            "agent": "research"
+        }
+        if boss_feedback is not None:
+            research_data.update({"boss_feedback_addressed": boss_feedback, "revision": True})
+        return research_data
+
+    def _build_research_messages(self, theme, content_type, trends):
+        return [
             {
                 "role": "system",
                 "content": f"""You are researching content for an AI automation business owner's Twitter.
@@ -116,7 +176,7 @@ class ResearchAgent:
                 {self._get_research_prompt(content_type, theme)}
                 
                 CURRENT TRENDS AND NEWS:
-                {current_trends}
+                {trends}
                 
                 Use this current information to make your research timely and relevant.
                 Reference recent developments, case studies, or trends when appropriate.
@@ -124,17 +184,7 @@ class ResearchAgent:
                 """
             }
         ]
-        
-        research = self.client.chat_completion(messages, self.model)
-        
-        return {
-            "content_type": content_type,
-            "theme": theme,
-            "research": research,
-            "current_trends": current_trends,
-            "agent": "research"
-        }
-    
+
     def _get_search_queries(self, content_type, theme):
         """Get relevant search queries for current content"""
         
@@ -272,26 +322,13 @@ class ResearchAgent:
         
         return prompts.get(content_type, prompts["education_explainer"])
 
-    def research_topic_with_feedback(self, content_type, boss_feedback, day_of_month=None):
+    def research_topic_with_feedback(self, content_type, boss_feedback, day_of_month=None, model=None):
         """Enhanced research incorporating boss feedback for revision"""
+        plan = self.plan_research(content_type, day_of_month)
+        return self.write_research(plan, self.run_searches(plan), boss_feedback, model=model)
 
-        # Auto-select content type if not specified
-        if not content_type:
-            content_type = self._select_content_type(day_of_month)
-
-        # Get current month theme
-        current_month = datetime.now().month
-        theme = self.monthly_themes.get(current_month, "foundation_building")
-
-        # Get current trends via Brave search
-        search_queries = self._get_search_queries(content_type, theme)
-        current_trends = {}
-
-        for query_name, query in search_queries.items():
-            search_results = self.search_brave(query)
-            current_trends[query_name] = search_results
-
-        messages = [
+    def _build_revision_messages(self, theme, content_type, trends, boss_feedback):
+        return [
             {
                 "role": "system",
                 "content": f"""You are researching content for an AI automation business owner's Twitter.
@@ -320,7 +357,7 @@ class ResearchAgent:
                 {self._get_research_prompt(content_type, theme)}
 
                 CURRENT TRENDS AND NEWS:
-                {current_trends}
+                {trends}
 
                 REVISION REQUIREMENTS BASED ON CEO FEEDBACK:
                 1. Find specific metrics (time saved, cost reduced, efficiency gained)
@@ -335,19 +372,6 @@ class ResearchAgent:
             }
         ]
 
-        research = self.client.chat_completion(messages, self.model)
-
-        return {
-            "content_type": content_type,
-            "theme": theme,
-            "research": research,
-            "current_trends": current_trends,
-            "boss_feedback_addressed": boss_feedback,
-            "revision": True,
-            "agent": "research"
-        }
-
-
     def load_persona(self):
         """Load authentic personal persona"""
         import sys
@@ -1,4 +1,6 @@
 from utils.openrouter_client import OpenRouterClient
+from config.generation_profiles import get_profile
+from utils.prompt_budget import PromptBudget
 import os
 import re
 
@@ -7,24 +9,70 @@ class ResponseAgent:
         # Load authentic personal persona
         self.load_persona()
         
-        self.client = OpenRouterClient()
-        self.model = os.getenv('SONNET_MODEL', 'anthropic/claude-3.5-sonnet')
+        self.client = OpenRouterClient(agent_name="response")
+        self.profile = get_profile("response")
+        self.model = self.profile["model"]
+        self.prompt_budget = PromptBudget("response")
+        # Built once so every reply sends a byte-identical, cacheable prefix
+        self.system_prompt = self._system_prompt()
 
-    def generate_response(self, comment_data, original_tweet_content=None):
+    def generate_response(self, comment_data, original_tweet_content=None, use_cache=False):
         """
         Generate an authentic response to a comment using the personal persona
         
         Args:
             comment_data (dict): Contains comment text, user info, etc.
             original_tweet_content (str): The content of the original tweet being commented on
+            use_cache (bool): Allow a cached reply (off by default so replies stay fresh)
             
         Returns:
             str: The generated response content
         """
-        messages = [
+        messages = self._build_messages(comment_data, original_tweet_content)
+        response = self.client.chat_completion(messages, self.model, use_cache=use_cache)
+        return self._clean_response(response)
+
+    async def agenerate_response(self, comment_data, original_tweet_content=None, use_cache=False):
+        """Async version of generate_response for replying to many comments at once"""
+        messages = self._build_messages(comment_data, original_tweet_content)
+        response = await self.client.achat_completion(messages, self.model, use_cache=use_cache)
+        return self._clean_response(response)
+
+    def generate_responses(self, comments, max_concurrency=None, use_cache=False):
+        """
+        Generate responses for many comments concurrently
+
+        Args:
+            comments (list): (comment_data, original_tweet_content) pairs
+            max_concurrency (int): Most replies generated at once (defaults to the client limit)
+            use_cache (bool): Allow cached replies
+
+        Returns:
+            list: One result dict per comment, in order, with the cleaned reply in
+            "content" or the exception in "error"
+        """
+        requests = [self._build_messages(comment_data, original_tweet_content)
+                    for comment_data, original_tweet_content in comments]
+        results = self.client.chat_completion_many(requests, max_concurrency=max_concurrency,
+                                                   use_cache=use_cache)
+        for result in results:
+            if result["error"] is None:
+                result["content"] = self._clean_response(result["content"])
+        return results
+
+    def _build_messages(self, comment_data, original_tweet_content=None):
+        """Build the persona prompt for a single comment, trimming the quoted tweet first"""
+        return self.prompt_budget.fit(
+            lambda original_tweet, comment: self._render_messages(comment_data, original_tweet, comment),
             {
-                "role": "system",
-                "content": f"""You are Abraham Vasquez (@AbrahamAv9728), an AI Platform Engineer at Autonomiq with 15+ years in tech.
+                "original_tweet": (original_tweet_content or 'Not available', 1),
+                "comment": (comment_data.get('content', ''), 2)
+            }
+        )
+
+    def _system_prompt(self):
+        """Persona prompt; identical for every reply so the provider can cache it"""
+        return f"""You are Abraham Vasquez (@AbrahamAv9728), an AI Platform Engineer at Autonomiq with 15+ years in tech.
                 
                 PERSONA DETAILS:
                 - Name: {self.persona.get('name', 'Abraham Vasquez')}
@@ -49,14 +97,20 @@ class ResponseAgent:
                 - Responses outside your areas of expertise
                 
                 You are responding to a comment on your tweet. Be helpful, authentic, and professional."""
+
+    def _render_messages(self, comment_data, original_tweet, comment):
+        return [
+            {
+                "role": "system",
+                "content": self.system_prompt
             },
             {
                 "role": "user",
                 "content": f"""
-                ORIGINAL TWEET: {original_tweet_content or 'Not available'}
+                ORIGINAL TWEET: {original_tweet}
                 
                 COMMENT TO RESPOND TO: 
-                @{comment_data.get('username', 'user')}: "{comment_data.get('content', '')}"
+                @{comment_data.get('username', 'user')}: "{comment}"
                 
                 COMMENT AUTHOR ID: {comment_data.get('user_id', 'unknown')}
                 
@@ -67,9 +121,8 @@ class ResponseAgent:
             }
         ]
 
-        response = self.client.chat_completion(messages, self.model)
-        
-        # Clean up the response if needed
+    def _clean_response(self, response):
+        """Trim the generated reply to fit in a tweet"""
         if response and len(response) > 280:
             response = response[:277] + "..."
             
@@ -1,4 +1,7 @@
-from utils.openrouter_client import OpenRouterClient
+from utils.openrouter_client import OpenRouterClient, StructuredOutputError
+from config.generation_profiles import get_profile
+from utils.prompt_budget import PromptBudget
+from utils.structured_output import SEO_TWEET_SCHEMA
 import os
 
 class SEOAgent:
@@ -6,10 +9,12 @@ class SEOAgent:
         # Load authentic personal persona
         self.load_persona()
         
-        self.client = OpenRouterClient()
-        self.model = os.getenv('HAIKU_MODEL', 'anthropic/claude-3-haiku')
+        self.client = OpenRouterClient(agent_name="seo")
+        self.profile = get_profile("seo")
+        self.model = self.profile["model"]
+        self.prompt_budget = PromptBudget("seo")
     
-    def optimize_seo(self, keyword_data):
+    def optimize_seo(self, keyword_data, model=None):
         messages = [
             {
                 "role": "system",
@@ -27,20 +32,47 @@ class SEOAgent:
                 4. Maintains authentic voice
                 5. Stays under 280 characters
                 
-                Return only the final tweet content, ready to post.
+                Reply with only a JSON object: {{"tweet": "<final tweet, ready to post>", "hashtags": ["#..."]}}
                 """
             }
         ]
         
-        seo_content = self.client.chat_completion(messages, self.model)
+        seo_tweet = self._final_tweet(messages, model, keyword_data)
         
         return {
-            "final_content": seo_content,
+            "final_content": seo_tweet["tweet"],
+            "hashtags": seo_tweet["hashtags"],
             "agent": "seo"
         }
 
-    def optimize_seo_with_feedback(self, keyword_data, boss_feedback):
-        messages = [
+    def optimize_seo_with_feedback(self, keyword_data, boss_feedback, model=None):
+        # The draft itself is never trimmed, only the feedback wrapped around it
+        messages = self.prompt_budget.fit(
+            lambda boss_feedback: self._build_revision_messages(keyword_data, boss_feedback),
+            {"boss_feedback": (boss_feedback, 1)}
+        )
+
+        seo_tweet = self._final_tweet(messages, model, keyword_data)
+
+        return {
+            "final_content": seo_tweet["tweet"],
+            "hashtags": seo_tweet["hashtags"],
+            "boss_feedback_addressed": boss_feedback,
+            "revision": True,
+            "agent": "seo"
+        }
+
+    def _final_tweet(self, messages, model, keyword_data):
+        """Schema-constrained final tweet; keeps the keyword draft if the output stays invalid"""
+        try:
+            return self.client.chat_completion_json(messages, SEO_TWEET_SCHEMA, "seo_tweet", model or self.model,
+                                                    stream=True)
+        except StructuredOutputError as e:
+            print(f"⚠️ SEO output unreadable, keeping the keyword draft: {e}")
+            return {"tweet": keyword_data['optimized_content'], "hashtags": []}
+
+    def _build_revision_messages(self, keyword_data, boss_feedback):
+        return [
             {
                 "role": "system",
                 "content": f"""You are creating the final revision based on CEO feedback.
@@ -72,22 +104,12 @@ class SEOAgent:
                 - Must optimize for Twitter algorithm
                 - Must attract potential business clients
 
-                Return only the final tweet content, ready to post.
+                Reply with only a JSON object: {{"tweet": "<final tweet, ready to post>", "hashtags": ["#..."]}}
                 This version must address all CEO concerns while maintaining engagement.
                 """
             }
         ]
 
-        seo_content = self.client.chat_completion(messages, self.model)
-
-        return {
-            "final_content": seo_content,
-            "boss_feedback_addressed": boss_feedback,
-            "revision": True,
-            "agent": "seo"
-        }
-
-
     def load_persona(self):
         """Load authentic personal persona"""
         import sys
@@ -1,4 +1,6 @@
 from utils.openrouter_client import OpenRouterClient
+from config.generation_profiles import get_profile
+from utils.prompt_budget import PromptBudget
 import os
 
 class WriterAgent:
@@ -6,8 +8,10 @@ class WriterAgent:
         # Load authentic personal persona
         self.load_persona()
         
-        self.client = OpenRouterClient()
-        self.model = os.getenv('HAIKU_MODEL', 'anthropic/claude-3-haiku')
+        self.client = OpenRouterClient(agent_name="writer")
+        self.profile = get_profile("writer")
+        self.model = self.profile["model"]
+        self.prompt_budget = PromptBudget("writer")
 
         # Your proven tweet templates
         self.templates = {
@@ -91,17 +95,45 @@ class WriterAgent:
             """
         }
 
-    def create_content(self, research_data):
+        # Built once so every call sends an identical, cacheable prefix
+        self.system_prompt = self._system_prompt()
+
+    def create_content(self, research_data, use_cache=False, model=None, dedupe=True):
+        # Drafts bypass the response cache by default so the 09:00 and 15:00
+        # posts never come out identical from the same research; dedupe=False
+        # keeps concurrent candidate drafts from collapsing into one call
         content_type = research_data.get('content_type', 'education_explainer')
         template = self.templates.get(content_type, self.templates['education_explainer'])
 
-        messages = [
-            {
-                "role": "system",
-                "content": f"""You are writing Twitter content for Abraham Vasquez (@AbrahamAv9728), AI Platform Engineer at Autonomiq.
+        theme = research_data.get('theme', 'general')
+        messages = self.prompt_budget.fit(
+            lambda research: self._build_content_messages(content_type, template, theme, research),
+            {"research": (research_data['research'], 1)}
+        )
+
+        content = self.client.chat_completion(messages, model or self.model, use_cache=use_cache, dedupe=dedupe)
+
+        return {
+            "content": content,
+            "content_type": content_type,
+            "theme": research_data.get('theme'),
+            "template_used": template,
+            "research_used": research_data,
+            "agent": "writer"
+        }
+
+    def _system_prompt(self):
+        """Static persona, voice and rules, byte-identical on every call
+
+        Everything that varies (the chosen template, research, feedback) goes in
+        the user message, so this prefix can be cached once it is long enough.
+        Only the chosen template is sent: listing all six here would not reach
+        Haiku's 2048-token caching minimum and would only add input tokens.
+        """
+        return f"""You are writing Twitter content for Abraham Vasquez (@AbrahamAv9728), AI Platform Engineer at Autonomiq.
 
 AUTHENTIC BACKGROUND:
-- 42-year-old AI Platform Engineer with 15+ years tech experience  
+- 42-year-old AI Platform Engineer with 15+ years tech experience
 - Real achievements: 552% ROI, 99.8% efficiency improvements
 - Previous roles: Tesla Process Engineer, Quest Diagnostics specialist
 - Current projects: Azure SOC implementation, AWS honeypots, AI agents
@@ -110,30 +142,36 @@ AUTHENTIC BACKGROUND:
 
 VOICE: Professional, mature, faith-informed, results-driven
 
-                Brand voice:
-                - Authoritative but approachable
-                - Practical and results-focused
-                - Helpful, not salesy
-                - Technical but understandable
-
-                Use this proven template:
-                {template}
-
-                Rules:
-                - Keep tweets under 280 characters
-                - Use 🧵👇 for threads
-                - Maximum 1 emoji per tweet
-                - Always end with engagement hook
-                - Focus on business automation value
-                - Be authentic and relatable
-                """
+Brand voice:
+- Authoritative but approachable
+- Practical and results-focused
+- Helpful, not salesy
+- Technical but understandable
+- For personal journey content, emphasize learning and process over achievements
+
+Rules:
+- Keep tweets under 280 characters
+- Use 🧵👇 for threads
+- Maximum 1 emoji per tweet
+- Always end with engagement hook
+- Focus on business automation value
+- Be authentic and relatable"""
+
+    def _build_content_messages(self, content_type, template, theme, research):
+        return [
+            {
+                "role": "system",
+                "content": self.system_prompt
             },
             {
                 "role": "user",
                 "content": f"""
+                Use the {content_type} template:
+                {template}
+
                 Content type: {content_type}
-                Theme: {research_data.get('theme', 'general')}
-                Research: {research_data['research']}
+                Theme: {theme}
+                Research: {research}
 
                 Create engaging Twitter content that:
                 1. Follows the template structure exactly
@@ -151,7 +189,21 @@ VOICE: Professional, mature, faith-informed, results-driven
             }
         ]
 
-        content = self.client.chat_completion(messages, self.model)
+    def create_content_with_feedback(self, research_data, boss_feedback, use_cache=False, model=None, dedupe=True):
+        """Create revised content based on boss feedback"""
+        
+        content_type = research_data.get('content_type', 'education_explainer')
+        template = self.templates.get(content_type, self.templates['education_explainer'])
+
+        theme = research_data.get('theme', 'general')
+        messages = self.prompt_budget.fit(
+            lambda research, boss_feedback: self._build_revision_messages(
+                content_type, template, theme, research, boss_feedback
+            ),
+            {"boss_feedback": (boss_feedback, 1), "research": (research_data['research'], 2)}
+        )
+
+        content = self.client.chat_completion(messages, model or self.model, use_cache=use_cache, dedupe=dedupe)
 
         return {
             "content": content,
@@ -159,41 +211,32 @@ VOICE: Professional, mature, faith-informed, results-driven
             "theme": research_data.get('theme'),
             "template_used": template,
             "research_used": research_data,
+            "boss_feedback_addressed": boss_feedback,
+            "revision": True,
             "agent": "writer"
         }
 
-    def create_content_with_feedback(self, research_data, boss_feedback):
-        """Create revised content based on boss feedback"""
-        
-        content_type = research_data.get('content_type', 'education_explainer')
-        template = self.templates.get(content_type, self.templates['education_explainer'])
-
-        messages = [
+    def _build_revision_messages(self, content_type, template, theme, research, boss_feedback):
+        return [
             {
                 "role": "system",
-                "content": f"""You are revising Twitter content for Abraham Vasquez (@AbrahamAv9728), AI Platform Engineer at Autonomiq, based on CEO feedback.
+                "content": self.system_prompt
+            },
+            {
+                "role": "user",
+                "content": f"""
+                You are revising content based on CEO feedback.
 
                 PREVIOUS VERSION WAS REJECTED. Address these CEO concerns:
                 {boss_feedback}
 
-                AUTHENTIC BACKGROUND:
-                - 42-year-old AI Platform Engineer with 15+ years tech experience  
-                - Real achievements: 552% ROI, 99.8% efficiency improvements
-                - Previous roles: Tesla Process Engineer, Quest Diagnostics specialist
-                - Current projects: Azure SOC implementation, AWS honeypots, AI agents
-                - Seventh-day Adventist Christian, conservative values
-                - Pursuing cybersecurity certifications (CompTIA Security+, CISSP, etc.)
-
-                Brand voice:
-                - Authoritative but approachable
-                - Practical and results-focused
-                - Helpful, not salesy
-                - Technical but understandable
-                - For personal journey content, emphasize learning and process over achievements
-
-                Use this proven template:
+                Use the {content_type} template:
                 {template}
 
+                Content type: {content_type}
+                Theme: {theme}
+                Research: {research}
+
                 REVISION REQUIREMENTS:
                 1. For personal journey content, focus on the process and learning rather than just results
                 2. Add professional credibility markers from actual background
@@ -201,22 +244,6 @@ VOICE: Professional, mature, faith-informed, results-driven
                 4. Add clear business value proposition
                 5. Include professional call-to-action
 
-                Rules:
-                - Keep tweets under 280 characters
-                - Use 🧵👇 for threads
-                - Maximum 1 emoji per tweet
-                - Always end with engagement hook
-                - Focus on business automation value
-                - Be authentic and relatable
-                """
-            },
-            {
-                "role": "user",
-                "content": f"""
-                Content type: {content_type}
-                Theme: {research_data.get('theme', 'general')}
-                Research: {research_data['research']}
-
                 SPECIFIC REVISIONS NEEDED (from CEO feedback):
                 - Add concrete metrics and specific results (use Abraham's real 552% ROI, 99.8% improvements)
                 - Include professional credibility indicators (Tesla, Autonomiq experience)
@@ -239,19 +266,6 @@ VOICE: Professional, mature, faith-informed, results-driven
             }
         ]
 
-        content = self.client.chat_completion(messages, self.model)
-
-        return {
-            "content": content,
-            "content_type": content_type,
-            "theme": research_data.get('theme'),
-            "template_used": template,
-            "research_used": research_data,
-            "boss_feedback_addressed": boss_feedback,
-            "revision": True,
-            "agent": "writer"
-        }
-
     def load_persona(self):
         """Load authentic personal persona"""
         import sys
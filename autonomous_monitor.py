@@ -26,6 +26,7 @@ from main import TwitterAgentPipeline
 from utils.twitter_client import TwitterClient
 from utils.database import TwitterDatabase
 from utils.content_calendar import ContentCalendar
+from utils.rate_limiter import rate_priority
 
 # Configure logging
 logging.basicConfig(
@@ -51,6 +52,8 @@ class AutonomousMonitor:
             'internet': True,
             'disk_space': True
         }
+        # Last budget_exhausted count seen per (process, pid, target), so each exhaustion alerts once
+        self.retry_budget_seen = {}
         
     def check_twitter_api_health(self):
         """Check if Twitter API is accessible and functional"""
@@ -355,8 +358,30 @@ class AutonomousMonitor:
         """Monitor the posting pipeline for failures"""
         logger.info("🔍 Monitoring posting pipeline for failures")
         # This would involve checking logs or database for recent failures
-        # For now, we'll just log that monitoring is happening
-        pass
+        self.report_retry_metrics()
+    
+    def report_retry_metrics(self):
+        """Log HTTP retry attempts and backoff time reported by each process"""
+        try:
+            from utils.retry import load_retry_metrics
+            for snapshot in load_retry_metrics():
+                for target, metrics in snapshot.get('targets', {}).items():
+                    logger.info(
+                        f"📈 Retries [{snapshot.get('process')}/{target}]: "
+                        f"{metrics['attempts']} attempts for {metrics['calls']} calls, "
+                        f"{metrics['retries']} retries, {metrics['backoff_seconds']:.1f}s backoff, "
+                        f"{metrics['gave_up']} gave up, {metrics['budget_exhausted']} over budget"
+                    )
+                    # Counters are cumulative per process; only a rise is news
+                    key = (snapshot.get('process'), snapshot.get('pid'), target)
+                    previous = self.retry_budget_seen.get(key, 0)
+                    self.retry_budget_seen[key] = metrics['budget_exhausted']
+                    if metrics['budget_exhausted'] > previous:
+                        self.send_notification(
+                            f"Retry budget exhausted for {target} in {snapshot.get('process')} - provider may be down"
+                        )
+        except Exception as e:
+            logger.error(f"❌ Failed to read retry metrics: {e}")
     
     def start_monitoring(self):
         """Start the autonomous monitoring system"""
@@ -396,6 +421,7 @@ if __name__ == "__main__":
     # Ensure logs directory exists
     os.makedirs('logs', exist_ok=True)
     
-    # Start the autonomous monitoring system
+    # Start the autonomous monitoring system; its checks never compete with posting for quota
     monitor = AutonomousMonitor()
-    monitor.start_monitoring()
\ No newline at end of file
+    with rate_priority("background"):
+        monitor.start_monitoring()
\ No newline at end of file
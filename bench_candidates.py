@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Benchmark parallel candidates with one comparative boss review against the retry loop
+
+    python3 bench_candidates.py --runs 5 --candidates 3
+    OPENROUTER_BASE_URL=http://127.0.0.1:8099/api/v1 RATE_LIMIT_ENABLED=0 python3 bench_candidates.py --runs 20
+
+Each run executes the full strategic pipeline (research, writer, keyword, SEO,
+boss, up to --max-attempts attempts) once as the single-draft retry loop and
+once with N candidates per attempt. Reports wall time, attempts, sequential
+model round-trips, LLM calls, tokens and estimated cost per run and per
+approved post. Posting is replaced by a dry run and routing history goes to
+a scratch database, so nothing is published and live routing is unaffected.
+"""
+
+import sys
+import os
+import time
+import uuid
+import random
+import argparse
+import tempfile
+from types import SimpleNamespace
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Every draft must reach the model to be measured
+os.environ['LLM_CACHE_ENABLED'] = '0'
+
+from main import TwitterAgentPipeline
+from agents.research_agent import ResearchAgent
+from agents.writer_agent import WriterAgent
+from agents.keyword_agent import KeywordAgent
+from agents.seo_agent import SEOAgent
+from agents.keyword_seo_agent import KeywordSEOAgent
+from agents.boss_agent import BossAgent
+from utils.database import TwitterDatabase
+from utils.content_calendar import ContentCalendar
+from utils.model_router import ModelRouter
+from utils.tweet_lint import TweetLinter, pre_review_lint_enabled
+
+
+class DryRunTwitter:
+    """Accepts posts without calling the Twitter API"""
+
+    def post_tweet(self, content):
+        return SimpleNamespace(data={"id": f"dry-run-{uuid.uuid4().hex[:8]}"})
+
+
+class DryRunPipeline(TwitterAgentPipeline):
+    """The content stages of TwitterAgentPipeline with posting stubbed out
+
+    Only the agents run_strategic_pipeline uses are built, so no Twitter
+    credentials are needed.
+    """
+
+    def __init__(self, db_path, fused_optimize=False):
+        self.research_agent = ResearchAgent()
+        self.writer_agent = WriterAgent()
+        self.keyword_agent = KeywordAgent()
+        self.seo_agent = SEOAgent()
+        self.keyword_seo_agent = KeywordSEOAgent()
+        self.boss_agent = BossAgent()
+
+        self.twitter_client = DryRunTwitter()
+        self.db = TwitterDatabase(db_path)
+        self.content_calendar = ContentCalendar()
+        self.model_router = ModelRouter(self.db)
+        self.fused_optimize = fused_optimize
+        self.candidates = 1
+        self.linter = TweetLinter(self.writer_agent.templates) if pre_review_lint_enabled() else None
+        self.posted_tweets = []
+
+    def save_failed_content(self, research_data, writer_data, feedback):
+        pass
+
+    def clients(self):
+        agents = (self.research_agent, self.writer_agent, self.keyword_agent, self.seo_agent,
+                  self.keyword_seo_agent, self.boss_agent)
+        return [agent.client for agent in agents]
+
+
+class Benchmark:
+    def __init__(self, candidates, max_attempts, fused_optimize=False):
+        self.candidates = candidates
+        self.max_attempts = max_attempts
+        self.fused_optimize = fused_optimize
+        self.pipeline = DryRunPipeline(os.path.join(tempfile.mkdtemp(prefix="bench_candidates_"), "bench.db"),
+                                       fused_optimize)
+        self.modes = {"retry loop": 1, f"{candidates} cands": candidates}
+        self.results = {mode: [] for mode in self.modes}
+
+    def measure(self, mode, daily_plan):
+        clients = self.pipeline.clients()
+        before = [client.get_usage() for client in clients]
+        posted_before = len(self.pipeline.posted_tweets)
+        start = time.monotonic()
+        approved = self.pipeline.run_strategic_pipeline(dict(daily_plan), self.max_attempts,
+                                                        candidates=self.modes[mode])
+        wall = time.monotonic() - start
+
+        attempts = self.max_attempts
+        if len(self.pipeline.posted_tweets) > posted_before:
+            attempts = self.pipeline.posted_tweets[-1]["attempts_needed"]
+        # Model calls that must wait for each other: research, the draft chain and the boss, per attempt
+        chain = 4 if self.fused_optimize else 5
+        result = {"approved": bool(approved), "wall": wall, "attempts": attempts, "rounds": attempts * chain,
+                  "calls": 0, "tokens": 0, "cost": 0.0}
+        for client, usage_before in zip(clients, before):
+            usage = client.get_usage()
+            result["calls"] += usage["calls"] - usage_before["calls"]
+            result["tokens"] += (usage["prompt_tokens"] + usage["completion_tokens"]
+                                 - usage_before["prompt_tokens"] - usage_before["completion_tokens"])
+            result["cost"] += usage["cost"] - usage_before["cost"]
+        self.results[mode].append(result)
+        return result
+
+    def run(self, runs, content_type=None):
+        daily_plan = self.pipeline.content_calendar.get_today_content()
+        if content_type:
+            daily_plan["type"] = content_type
+        print(f"🔬 {runs} runs on {daily_plan['type']} / {daily_plan['topic']}, "
+              f"up to {self.max_attempts} attempts each\n")
+
+        lines = []
+        for i in range(runs):
+            # Alternate the order so neither mode always runs on a warmer connection
+            modes = list(self.modes) if i % 2 == 0 else list(reversed(self.modes))
+            for mode in modes:
+                result = self.measure(mode, daily_plan)
+                lines.append(f"Run {i + 1}/{runs} {mode:<11} {result['wall']:7.2f}s "
+                             f"{result['attempts']} attempts {result['calls']:>3} calls "
+                             f"{result['tokens']:>7} tokens {'APPROVE' if result['approved'] else 'REJECT'}")
+        # Pipeline output is verbose; repeat the per-run lines together at the end
+        print("\n" + "\n".join(lines))
+
+    def summary(self, mode):
+        results = self.results[mode]
+        totals = {key: sum(r[key] for r in results) for key in ("wall", "attempts", "rounds", "calls", "tokens", "cost")}
+        return {"runs": len(results), "approved": sum(1 for r in results if r["approved"]), **totals}
+
+    def report(self):
+        print("\n📊 Strategic pipeline, single-draft retry loop vs parallel candidates\n")
+        header = (f"{'mode':<11} {'runs':>4} {'appr':>4} {'rate':>5} {'att/run':>7} {'s/run':>7} "
+                  f"{'s/appr':>7} {'rounds/appr':>11} {'calls/appr':>10} {'tok/appr':>9} {'$/appr':>9}")
+        print(header)
+        print("-" * len(header))
+        summaries = {mode: self.summary(mode) for mode in self.modes}
+        for mode, s in summaries.items():
+            runs, approved = max(1, s["runs"]), s["approved"]
+            per_approved = (lambda value: value / approved) if approved else (lambda value: float('nan'))
+            print(f"{mode:<11} {s['runs']:>4} {approved:>4} {approved / runs:>5.0%} {s['attempts'] / runs:>7.2f} "
+                  f"{s['wall'] / runs:>7.2f} {per_approved(s['wall']):>7.2f} {per_approved(s['rounds']):>11.1f} "
+                  f"{per_approved(s['calls']):>10.1f} {per_approved(s['tokens']):>9.0f} "
+                  f"{per_approved(s['cost']):>9.5f}")
+
+        baseline, parallel = (summaries[mode] for mode in self.modes)
+        if baseline["approved"] and parallel["approved"]:
+            for key, label in (("wall", "wall time"), ("rounds", "sequential round-trips"), ("cost", "cost")):
+                before = baseline[key] / baseline["approved"]
+                after = parallel[key] / parallel["approved"]
+                change = (after - before) / before if before else 0.0
+                print(f"   candidates change {label} per approved post by {change:+.0%}")
+        else:
+            print("   (no approvals in one mode; per-approved comparisons need at least one each)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel candidates against the boss retry loop")
+    parser.add_argument("--runs", type=int, default=3, help="pipeline runs in each mode")
+    parser.add_argument("--candidates", type=int, default=3, help="candidates per attempt in parallel mode")
+    parser.add_argument("--max-attempts", type=int, default=3, help="boss attempts per run in both modes")
+    parser.add_argument("--fused", action="store_true", help="use the fused keyword+SEO stage in both modes")
+    parser.add_argument("--content-type", help="content type to research (default: today's calendar entry)")
+    parser.add_argument("--seed", type=int, help="random seed so template choices repeat")
+    args = parser.parse_args()
+
+    if args.candidates < 2:
+        parser.error("--candidates must be at least 2")
+    if args.seed is not None:
+        random.seed(args.seed)
+    benchmark = Benchmark(args.candidates, args.max_attempts, args.fused)
+    benchmark.run(args.runs, args.content_type)
+    benchmark.report()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
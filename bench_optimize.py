@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark the fused keyword+SEO stage against the separate keyword and SEO stages
+
+    python3 bench_optimize.py --runs 10
+    OPENROUTER_BASE_URL=http://127.0.0.1:8099/api/v1 RATE_LIMIT_ENABLED=0 python3 bench_optimize.py --runs 20
+
+Each run writes one first draft and optimizes it both ways, so both modes see
+the same input; the boss then reviews each result. Reports latency, tokens
+and estimated cost of the optimization stage per run and per approved post.
+Nothing is posted.
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Every optimization call must reach the model to be measured
+os.environ['LLM_CACHE_ENABLED'] = '0'
+
+from agents.research_agent import ResearchAgent
+from agents.writer_agent import WriterAgent
+from agents.keyword_agent import KeywordAgent
+from agents.seo_agent import SEOAgent
+from agents.keyword_seo_agent import KeywordSEOAgent
+from agents.boss_agent import BossAgent
+from utils.llm_telemetry import estimate_cost
+
+MODES = ("separate", "fused")
+
+
+class Benchmark:
+    def __init__(self):
+        self.research_agent = ResearchAgent()
+        self.writer_agent = WriterAgent()
+        self.keyword_agent = KeywordAgent()
+        self.seo_agent = SEOAgent()
+        self.keyword_seo_agent = KeywordSEOAgent()
+        self.boss_agent = BossAgent()
+        self.results = {mode: [] for mode in MODES}
+
+    def clients(self, mode):
+        if mode == "fused":
+            return [self.keyword_seo_agent.client]
+        return [self.keyword_agent.client, self.seo_agent.client]
+
+    def optimize(self, mode, writer_data):
+        if mode == "fused":
+            return self.keyword_seo_agent.optimize(writer_data)
+        keyword_data = self.keyword_agent.optimize_keywords(writer_data)
+        return keyword_data, self.seo_agent.optimize_seo(keyword_data)
+
+    def measure(self, mode, research_data, writer_data):
+        clients = self.clients(mode)
+        before = [client.get_usage() for client in clients]
+        start = time.monotonic()
+        keyword_data, seo_data = self.optimize(mode, writer_data)
+        latency = time.monotonic() - start
+
+        result = {"latency": latency, "calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost": 0.0}
+        for client, usage_before in zip(clients, before):
+            usage = client.get_usage()
+            prompt = usage["prompt_tokens"] - usage_before["prompt_tokens"]
+            completion = usage["completion_tokens"] - usage_before["completion_tokens"]
+            result["calls"] += usage["calls"] - usage_before["calls"]
+            result["prompt_tokens"] += prompt
+            result["completion_tokens"] += completion
+            result["cost"] += estimate_cost(client.profile["model"], prompt, completion)
+
+        decision = self.boss_agent.review_and_approve(research_data, writer_data, keyword_data, seo_data)
+        result["approved"] = bool(decision["final_approved_content"])
+        self.results[mode].append(result)
+        print(f"   {mode:<8} {latency:6.2f}s {result['calls']} calls "
+              f"{result['prompt_tokens'] + result['completion_tokens']:>6} tokens "
+              f"{'APPROVE' if result['approved'] else 'REJECT'}")
+
+    def run(self, runs, content_type=None):
+        research_data = self.research_agent.research_topic(content_type)
+        print(f"🔬 {runs} runs on {research_data['content_type']} / {research_data['theme']}\n")
+        for i in range(runs):
+            writer_data = self.writer_agent.create_content(research_data)
+            print(f"Run {i + 1}/{runs}")
+            # Alternate the order so neither mode always runs on a warmer connection
+            for mode in (MODES if i % 2 == 0 else reversed(MODES)):
+                self.measure(mode, research_data, writer_data)
+
+    def summary(self, mode):
+        results = self.results[mode]
+        approved = sum(1 for r in results if r["approved"])
+        totals = {key: sum(r[key] for r in results)
+                  for key in ("latency", "calls", "prompt_tokens", "completion_tokens", "cost")}
+        totals["tokens"] = totals["prompt_tokens"] + totals["completion_tokens"]
+        return {"runs": len(results), "approved": approved, **totals}
+
+    def report(self):
+        print("\n📊 Optimization stage, separate vs fused\n")
+        header = (f"{'mode':<9} {'runs':>4} {'appr':>4} {'rate':>5} {'s/run':>6} {'tok/run':>8} "
+                  f"{'s/appr':>7} {'tok/appr':>9} {'$/appr':>9}")
+        print(header)
+        print("-" * len(header))
+        summaries = {mode: self.summary(mode) for mode in MODES}
+        for mode, s in summaries.items():
+            runs, approved = max(1, s["runs"]), s["approved"]
+            per_approved = (lambda value: value / approved) if approved else (lambda value: float('nan'))
+            print(f"{mode:<9} {s['runs']:>4} {approved:>4} {approved / runs:>5.0%} {s['latency'] / runs:>6.2f} "
+                  f"{s['tokens'] / runs:>8.0f} {per_approved(s['latency']):>7.2f} "
+                  f"{per_approved(s['tokens']):>9.0f} {per_approved(s['cost']):>9.5f}")
+
+        separate, fused = summaries["separate"], summaries["fused"]
+        if separate["approved"] and fused["approved"]:
+            for key, label in (("latency", "latency"), ("tokens", "tokens"), ("cost", "cost")):
+                before = separate[key] / separate["approved"]
+                after = fused[key] / fused["approved"]
+                saved = (before - after) / before if before else 0.0
+                print(f"   fused saves {saved:.0%} {label} per approved post")
+        else:
+            print("   (no approvals in one mode; per-approved savings need at least one each)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fused vs separate keyword+SEO optimization")
+    parser.add_argument("--runs", type=int, default=5, help="drafts to optimize in each mode")
+    parser.add_argument("--content-type", help="content type to research (default: calendar choice)")
+    parser.add_argument("--seed", type=int, help="random seed so template choices repeat")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    benchmark = Benchmark()
+    benchmark.run(args.runs, args.content_type)
+    benchmark.report()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
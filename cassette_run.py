@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Record real OpenRouter, Brave and Twitter traffic, then replay it offline
+
+    python3 cassette_run.py record pipeline --cassette data/cassettes/pipeline.json
+    python3 cassette_run.py replay pipeline --cassette data/cassettes/pipeline.json --latency-scale 0.5 --profile
+
+Replays serve every external call from the cassette with its recorded latency
+(scaled), so the pipeline can be timed and regression-tested with no network.
+Replays write to a scratch database (data/cassettes/replay.db) unless --db is given.
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+import cProfile
+import pstats
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+FLOWS = {
+    "pipeline": "run_strategic_pipeline",
+    "comments": "respond_to_comments",
+    "engagement": "proactive_engagement",
+}
+
+
+def run_flow(pipeline, flow):
+    if flow == "pipeline":
+        daily_plan = pipeline.content_calendar.get_today_content()
+        return pipeline.run_strategic_pipeline(daily_plan)
+    return getattr(pipeline, FLOWS[flow])()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or replay external traffic for a pipeline flow")
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("flow", choices=sorted(FLOWS), help="which entry point to run")
+    parser.add_argument("--cassette", help="cassette file (default data/cassettes/<flow>.json)")
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="replay: multiply recorded latencies by this (0 = instant)")
+    parser.add_argument("--db", help="database path (replay default: data/cassettes/replay.db)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed so template choices repeat")
+    parser.add_argument("--profile", action="store_true", help="print the top cProfile entries")
+    args = parser.parse_args()
+
+    # The cassette reads its settings at import time, so set them before importing the pipeline
+    os.environ['CASSETTE_MODE'] = args.mode
+    os.environ['CASSETTE_PATH'] = args.cassette or f"data/cassettes/{args.flow}.json"
+    os.environ['CASSETTE_LATENCY_SCALE'] = str(args.latency_scale)
+    db_path = args.db or ("data/cassettes/replay.db" if args.mode == "replay" else None)
+    if db_path:
+        os.environ['TWITTER_DB_PATH'] = db_path
+    if args.mode == "replay":
+        # Replays never reach the APIs, so they should not spend live quota
+        os.environ['RATE_LIMIT_ENABLED'] = '0'
+    random.seed(args.seed)
+
+    from main import TwitterAgentPipeline
+    from utils.cassette import get_cassette
+
+    pipeline = TwitterAgentPipeline()
+    profiler = cProfile.Profile() if args.profile else None
+
+    start = time.monotonic()
+    if profiler:
+        profiler.enable()
+    result = run_flow(pipeline, args.flow)
+    if profiler:
+        profiler.disable()
+    elapsed = time.monotonic() - start
+
+    stats = get_cassette().get_stats()
+    print(f"\n📼 {args.mode} {args.flow}: result={result}, wall time {elapsed:.2f}s")
+    print(f"   recorded={stats['recorded']} replayed={stats['replayed']} "
+          f"(label matches {stats['fuzzy']}) misses={stats['misses']} -> {stats['path']}")
+
+    if profiler:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+
+    return 0 if result else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+Generation profiles for every LLM-backed agent
+Model, fallback chain and sampling settings live here instead of in each agent
+"""
+import os
+
+HAIKU_MODEL = os.getenv('HAIKU_MODEL', 'anthropic/claude-3-haiku')
+SONNET_MODEL = os.getenv('SONNET_MODEL', 'anthropic/claude-3.5-sonnet')
+
+# Tried in order when the primary model fails or its circuit breaker is open
+HAIKU_FALLBACK_MODEL = os.getenv('HAIKU_FALLBACK_MODEL', 'anthropic/claude-3.5-haiku')
+SONNET_FALLBACK_MODEL = os.getenv('SONNET_FALLBACK_MODEL', 'anthropic/claude-3.7-sonnet')
+
+# Fixes structured output that failed validation; a reformat, not a rewrite, so the cheap model will do
+REPAIR_MODEL = os.getenv('STRUCTURED_REPAIR_MODEL', HAIKU_MODEL)
+
+# The one-size-fits-all settings every agent used before profiles existed
+LEGACY_PROFILE = {
+    "model": HAIKU_MODEL,
+    "fallback_models": [],
+    "max_tokens": 4000,
+    "temperature": 0.7,
+    "stop": [],
+    "prompt_cache": False
+}
+
+GENERATION_PROFILES = {
+    # Research notes feed the writer; a page of bullet points is plenty
+    "research": {
+        "model": HAIKU_MODEL,
+        "fallback_models": [HAIKU_FALLBACK_MODEL],
+        "max_tokens": 1200,
+        "temperature": 0.7,
+        "stop": []
+    },
+    # A single tweet, or a hook plus up to six thread tweets
+    "writer": {
+        "model": HAIKU_MODEL,
+        "fallback_models": [HAIKU_FALLBACK_MODEL],
+        "max_tokens": 800,
+        "temperature": 0.8,
+        "stop": [],
+        # Static persona/rules system prompt is marked for provider prompt caching once it reaches
+        # the model's minimum cacheable length (1024 tokens, 2048 for Haiku); today it is shorter
+        "prompt_cache": True
+    },
+    # Rewrites the draft with hashtags placed
+    "keyword": {
+        "model": HAIKU_MODEL,
+        "fallback_models": [HAIKU_FALLBACK_MODEL],
+        "max_tokens": 600,
+        "temperature": 0.5,
+        "stop": []
+    },
+    # One final tweet
+    "seo": {
+        "model": HAIKU_MODEL,
+        "fallback_models": [HAIKU_FALLBACK_MODEL],
+        "max_tokens": 250,
+        "temperature": 0.5,
+        "stop": []
+    },
+    # Keyword and SEO passes fused into one call: hashtags plus the final tweet
+    "keyword_seo": {
+        "model": HAIKU_MODEL,
+        "fallback_models": [HAIKU_FALLBACK_MODEL],
+        "max_tokens": 300,
+        "temperature": 0.5,
+        "stop": []
+    },
+    # APPROVE plus a tweet, or REJECT plus actionable feedback
+    "boss": {
+        "model": SONNET_MODEL,
+        "fallback_models": [SONNET_FALLBACK_MODEL],
+        "max_tokens": 600,
+        "temperature": 0.2,
+        "stop": [],
+        # Static persona/rules system prompt is marked for provider prompt caching once it reaches
+        # the model's minimum cacheable length (1024 tokens, 2048 for Haiku); today it is shorter
+        "prompt_cache": True
+    },
+    # A reply under 280 characters
+    "response": {
+        "model": SONNET_MODEL,
+        "fallback_models": [SONNET_FALLBACK_MODEL, HAIKU_FALLBACK_MODEL],
+        "max_tokens": 150,
+        "temperature": 0.7,
+        "stop": [],
+        # Static persona/rules system prompt is marked for provider prompt caching once it reaches
+        # the model's minimum cacheable length (1024 tokens, 2048 for Haiku); today it is shorter
+        "prompt_cache": True
+    },
+}
+
+# USD per million tokens, and typical output speed in tokens/second (estimates)
+MODEL_PRICING = {
+    "anthropic/claude-3-haiku": {"input": 0.25, "output": 1.25, "output_tokens_per_second": 120},
+    "anthropic/claude-3.5-haiku": {"input": 0.80, "output": 4.00, "output_tokens_per_second": 65},
+    "anthropic/claude-3.5-sonnet": {"input": 3.00, "output": 15.00, "output_tokens_per_second": 55},
+    "anthropic/claude-3.7-sonnet": {"input": 3.00, "output": 15.00, "output_tokens_per_second": 55},
+}
+DEFAULT_PRICING = {"input": 3.00, "output": 15.00, "output_tokens_per_second": 50}
+
+# Anthropic bills prompt-cache reads at a tenth of the input price
+CACHE_READ_PRICE_FACTOR = 0.1
+
+
+def get_profile(agent_name):
+    """Profile for an agent, falling back to the legacy defaults"""
+    return GENERATION_PROFILES.get(agent_name, LEGACY_PROFILE)
+
+
+def get_pricing(model):
+    return MODEL_PRICING.get(model, DEFAULT_PRICING)
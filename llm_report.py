@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+LLM usage reports for the Twitter agent pipeline
+
+    python3 llm_report.py profiles            # per-profile latency/cost ceiling vs the legacy 4000-token default
+    python3 llm_report.py calls [--days 7]    # recorded latency percentiles and cost per agent, model and day
+    python3 llm_report.py routing [--days 7]  # model router decisions, approval rates and latency per approved tweet
+    python3 llm_report.py stages [--days 7]   # pipeline stage wall time, retries, timeouts, fallbacks and reuse
+"""
+
+import sys
+import os
+import math
+import argparse
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config.generation_profiles import GENERATION_PROFILES, LEGACY_PROFILE, get_pricing
+from utils.prompt_budget import get_prompt_budget
+from utils.database import TwitterDatabase
+
+
+def profile_ceiling(profile, prompt_tokens):
+    """Worst-case cost (USD) and generation time (s) for one call under a profile"""
+    pricing = get_pricing(profile["model"])
+    cost = (prompt_tokens * pricing["input"] + profile["max_tokens"] * pricing["output"]) / 1_000_000
+    seconds = profile["max_tokens"] / pricing["output_tokens_per_second"]
+    return cost, seconds
+
+
+def report_profiles():
+    """Compare each agent's profile against the old hard-coded settings"""
+    print("📐 Generation profiles vs legacy settings (max_tokens=4000, temperature=0.7)")
+    print("   Ceilings assume the model writes until max_tokens; prompt sized at the agent's budget.\n")
+    header = f"{'agent':<10} {'model':<30} {'max_tok':>7} {'temp':>5} {'max s':>7} {'legacy s':>8} {'max $':>9} {'legacy $':>9} {'saved':>6}"
+    print(header)
+    print("-" * len(header))
+
+    total_cost = total_legacy_cost = 0.0
+    for agent, profile in GENERATION_PROFILES.items():
+        prompt_tokens = get_prompt_budget(agent)
+        cost, seconds = profile_ceiling(profile, prompt_tokens)
+        # Legacy calls used the same model, just without the output cap
+        legacy = dict(LEGACY_PROFILE, model=profile["model"])
+        legacy_cost, legacy_seconds = profile_ceiling(legacy, prompt_tokens)
+        saved = 1 - cost / legacy_cost if legacy_cost else 0.0
+        total_cost += cost
+        total_legacy_cost += legacy_cost
+        print(f"{agent:<10} {profile['model']:<30} {profile['max_tokens']:>7} {profile['temperature']:>5.1f} "
+              f"{seconds:>7.1f} {legacy_seconds:>8.1f} {cost:>9.5f} {legacy_cost:>9.5f} {saved:>6.0%}")
+
+    print("-" * len(header))
+    print(f"Worst-case cost per full set of calls: ${total_cost:.4f} (legacy ${total_legacy_cost:.4f})")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def cached_share(rows):
+    """Fraction of prompt tokens served from the provider's prompt cache"""
+    prompt_tokens = sum(row['prompt_tokens'] or 0 for row in rows)
+    return sum(row['cached_tokens'] or 0 for row in rows) / prompt_tokens if prompt_tokens else 0.0
+
+
+def print_call_table(title, groups):
+    print(f"\n{title}")
+    header = f"{'':<30} {'calls':>6} {'errors':>6} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} {'ttft p50':>8} {'tokens in':>10} {'cached':>7} {'tokens out':>10} {'cost $':>9}"
+    print(header)
+    print("-" * len(header))
+    for name in sorted(groups):
+        rows = groups[name]
+        latencies = [row['latency'] for row in rows if row['latency'] is not None]
+        ttfts = [row['ttft'] for row in rows if row['ttft'] is not None]
+        errors = sum(1 for row in rows if row['status'] not in ('ok', 'aborted'))
+        print(f"{name:<30} {len(rows):>6} {errors:>6} {percentile(latencies, 50):>7.2f} "
+              f"{percentile(latencies, 95):>7.2f} {percentile(latencies, 99):>7.2f} {percentile(ttfts, 50):>8.2f} "
+              f"{sum(row['prompt_tokens'] or 0 for row in rows):>10} "
+              f"{cached_share(rows):>7.0%} "
+              f"{sum(row['completion_tokens'] or 0 for row in rows):>10} "
+              f"{sum(row['cost_usd'] or 0 for row in rows):>9.4f}")
+
+
+def report_calls(days, db_path):
+    """Latency percentiles and spend from the llm_calls telemetry table"""
+    since = (datetime.now() - timedelta(days=days)).isoformat(sep=' ') if days else None
+    rows = TwitterDatabase(db_path).get_llm_calls(since)
+    if not rows:
+        print(f"No LLM calls recorded in {db_path}" + (f" in the last {days} days" if days else ""))
+        return
+
+    print(f"📊 {len(rows)} LLM calls since {rows[0]['timestamp'][:19]} ({db_path})")
+    by_agent, by_model, by_day = defaultdict(list), defaultdict(list), defaultdict(list)
+    for row in rows:
+        by_agent[row['agent']].append(row)
+        by_model[row['model']].append(row)
+        by_day[row['timestamp'][:10]].append(row)
+
+    print_call_table("By agent", by_agent)
+    print_call_table("By model", by_model)
+    print_call_table("By day", by_day)
+
+    retried = sum(1 for row in rows if (row['attempt'] or 1) > 1)
+    total_cost = sum(row['cost_usd'] or 0 for row in rows)
+    print(f"\nTotal cost: ${total_cost:.4f}, {retried} calls were retries")
+
+
+def report_routing(days, db_path):
+    """How the model router's choices turned out"""
+    since = (datetime.now() - timedelta(days=days)).isoformat(sep=' ') if days else None
+    rows = TwitterDatabase(db_path).get_routing_history(since)
+    if not rows:
+        print(f"No routing decisions recorded in {db_path}" + (f" in the last {days} days" if days else ""))
+        return
+
+    # Per stage and model: how often the attempt it belonged to was approved
+    print(f"🧭 {len(rows)} routed stages since {rows[0]['timestamp'][:19]} ({db_path})\n")
+    header = f"{'stage':<10} {'model':<30} {'calls':>6} {'approved':>9} {'p50 s':>7} {'p95 s':>7}"
+    print(header)
+    print("-" * len(header))
+    by_stage = defaultdict(list)
+    for row in rows:
+        by_stage[(row['agent'], row['model'])].append(row)
+    for (agent, model), stage_rows in sorted(by_stage.items()):
+        verdicts = [row['approved'] for row in stage_rows if row['approved'] is not None]
+        approval = f"{sum(verdicts) / len(verdicts):.0%}" if verdicts else "-"
+        latencies = [row['latency'] for row in stage_rows if row['latency'] is not None]
+        print(f"{agent:<10} {model:<30} {len(stage_rows):>6} {approval:>9} "
+              f"{percentile(latencies, 50):>7.2f} {percentile(latencies, 95):>7.2f}")
+
+    # Why stages were routed where they were
+    print("\nReasons")
+    reasons = defaultdict(int)
+    for row in rows:
+        # Strip the numbers so e.g. every long-prompt decision lands in one bucket
+        reasons[(row['model'], row['reason'].split(' (')[0])] += 1
+    for (model, reason), count in sorted(reasons.items(), key=lambda item: -item[1]):
+        print(f"   {count:>5}  {model:<30} {reason}")
+
+    # End to end: all stage time spent across attempts, divided by tweets approved
+    runs = defaultdict(list)
+    for row in rows:
+        runs[row['run_id']].append(row)
+    approved_runs = [run for run in runs.values() if any(row['approved'] for row in run)]
+    total_latency = sum(row['latency'] or 0 for row in rows)
+    attempts = sum(len({row['attempt'] for row in run}) for run in runs.values())
+    print(f"\n{len(runs)} runs, {attempts} attempts, {len(approved_runs)} approved")
+    if approved_runs:
+        print(f"Latency per approved tweet: {total_latency / len(approved_runs):.1f}s "
+              f"(first-attempt approvals: {sum(1 for run in approved_runs if any(row['approved'] and row['attempt'] == 1 for row in run))})")
+
+
+def report_stages(days, db_path):
+    """Wall time and retries of every stage-graph node"""
+    since = (datetime.now() - timedelta(days=days)).isoformat(sep=' ') if days else None
+    rows = TwitterDatabase(db_path).get_stage_history(since)
+    if not rows:
+        print(f"No pipeline stages recorded in {db_path}" + (f" in the last {days} days" if days else ""))
+        return
+
+    attempts = {(row['run_id'], row['attempt']) for row in rows}
+    print(f"⏱️ {len(rows)} stage runs over {len(attempts)} pipeline attempts since {rows[0]['timestamp'][:19]} ({db_path})\n")
+    header = (f"{'stage':<26} {'runs':>5} {'p50 s':>7} {'p95 s':>7} {'max s':>7} {'retried':>7} {'timeout':>7} "
+              f"{'fallback':>8} {'failed':>6} {'reused':>6}")
+    print(header)
+    print("-" * len(header))
+    by_stage = defaultdict(list)
+    for row in rows:
+        by_stage[row['stage']].append(row)
+    for stage, stage_rows in sorted(by_stage.items()):
+        # Reused stages did not run on that attempt; their zero wall time would skew the percentiles
+        wall_times = [row['wall_time'] for row in stage_rows if row['wall_time'] is not None and row['status'] != 'reused']
+        statuses = defaultdict(int)
+        for row in stage_rows:
+            statuses[row['status']] += 1
+        print(f"{stage:<26} {len(stage_rows):>5} {percentile(wall_times, 50):>7.2f} {percentile(wall_times, 95):>7.2f} "
+              f"{max(wall_times, default=0.0):>7.2f} {sum(1 for row in stage_rows if (row['tries'] or 1) > 1):>7} "
+              f"{statuses['timeout']:>7} {statuses['fallback']:>8} {statuses['failed']:>6} {statuses['reused']:>6}")
+
+    lint_rows = by_stage.get('lint', [])
+    if lint_rows:
+        # A rejected lint row is an attempt whose drafts all broke a template rule, so the boss was never called
+        avoided = sum(1 for row in lint_rows if row['status'] == 'rejected')
+        print(f"\n🧹 Pre-review lint: {len(lint_rows)} checks, {avoided} boss calls avoided "
+              f"({avoided / len(lint_rows):.0%} of reviews)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM usage reports")
+    parser.add_argument("report", choices=["profiles", "calls", "routing", "stages"], help="which report to print")
+    parser.add_argument("--days", type=int, default=7, help="calls/routing/stages: look back this many days (0 for all)")
+    parser.add_argument("--db", default=os.getenv('LLM_TELEMETRY_DB') or os.getenv('TWITTER_DB_PATH', 'data/twitter_data.db'),
+                        help="calls/routing/stages: database holding the telemetry tables")
+    args = parser.parse_args()
+
+    if args.report == "profiles":
+        report_profiles()
+    elif args.report == "calls":
+        report_calls(args.days, args.db)
+    elif args.report == "routing":
+        report_routing(args.days, args.db)
+    elif args.report == "stages":
+        report_stages(args.days, args.db)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,14 @@
 import json
 import os
 import time
+import functools
 import schedule
 from datetime import datetime
 from agents.research_agent import ResearchAgent
 from agents.writer_agent import WriterAgent
 from agents.keyword_agent import KeywordAgent
 from agents.seo_agent import SEOAgent
+from agents.keyword_seo_agent import KeywordSEOAgent
 from agents.boss_agent import BossAgent
 from agents.monitoring_agent import MonitoringAgent
 from agents.trend_analysis_agent import TrendAnalysisAgent
@@ -17,6 +19,26 @@ from utils.twitter_client import TwitterClient
 from utils.database import TwitterDatabase
 from utils.content_calendar import ContentCalendar
 from utils.daily_reminder import DailyReminder
+from utils.openrouter_client import OpenRouterError
+from utils.model_router import ModelRouter
+from utils.prompt_budget import estimate_tokens
+from utils.stage_graph import Stage, StageGraph
+from utils.revision_scope import classify_feedback, reused_stages
+from utils.run_checkpoint import RunCheckpoint, find_resumable_run
+from utils.tweet_lint import TweetLinter, lint_feedback, pre_review_lint_enabled
+
+# Wall-clock limit per pipeline stage in seconds, above the HTTP retry budget. A timeout only stops the
+# wait: the worker thread's call runs on and its tokens are spent. So LLM stages are not retried on
+# timeout (a retry would pay for a second call beside the first); only the free Brave searches are.
+STAGE_TIMEOUTS = {
+    "search": float(os.getenv('STAGE_TIMEOUT_SEARCH', '45')),
+    "research": float(os.getenv('STAGE_TIMEOUT_RESEARCH', '300')),
+    "writer": float(os.getenv('STAGE_TIMEOUT_WRITER', '300')),
+    "keyword": float(os.getenv('STAGE_TIMEOUT_KEYWORD', '180')),
+    "seo": float(os.getenv('STAGE_TIMEOUT_SEO', '180')),
+    "keyword_seo": float(os.getenv('STAGE_TIMEOUT_KEYWORD_SEO', '180')),
+    "boss": float(os.getenv('STAGE_TIMEOUT_BOSS', '300')),
+}
 
 
 class TwitterAgentPipeline:
@@ -26,6 +48,7 @@ class TwitterAgentPipeline:
         self.writer_agent = WriterAgent()
         self.keyword_agent = KeywordAgent()
         self.seo_agent = SEOAgent()
+        self.keyword_seo_agent = KeywordSEOAgent()
         self.boss_agent = BossAgent()
         self.monitoring_agent = MonitoringAgent()
         self.trend_analysis_agent = TrendAnalysisAgent()
@@ -37,6 +60,13 @@ class TwitterAgentPipeline:
         self.db = TwitterDatabase()
         self.content_calendar = ContentCalendar()
         self.daily_reminder = DailyReminder()
+        self.model_router = ModelRouter(self.db)
+        # One keyword+SEO call instead of two; override per run with run_strategic_pipeline(fused_optimize=...)
+        self.fused_optimize = os.getenv('PIPELINE_FUSED_OPTIMIZE', '0').lower() in ('1', 'true', 'yes')
+        # Drafts written concurrently per attempt and judged in one boss call; 1 keeps the single-draft loop
+        self.candidates = int(os.getenv('PIPELINE_CANDIDATES', '1'))
+        # Template rules checked in code before the boss review; a draft that breaks one never costs a boss call
+        self.linter = TweetLinter(self.writer_agent.templates) if pre_review_lint_enabled() else None
 
         self.posted_tweets = []
 
@@ -49,7 +79,20 @@ class TwitterAgentPipeline:
             return False
 
         # Get today's planned content
-        daily_plan = self.content_calendar.get_today_content()
+        daily_plan = self.get_daily_plan()
+
+        # A run that crashed earlier today picks up where it stopped instead of paying for its stages again
+        unfinished = find_resumable_run(self.db, daily_plan['topic'])
+        if unfinished:
+            return self.run_strategic_pipeline(daily_plan, run_id=unfinished['run_id'])
+
+        # Run pipeline with strategic content
+        return self.run_strategic_pipeline(daily_plan)
+
+    def get_daily_plan(self):
+        """Today's calendar entry, with the weekly thread topic on thread days"""
+        # Copied so a thread day does not overwrite the calendar's own entry
+        daily_plan = dict(self.content_calendar.get_today_content())
 
         print(f"📅 Today's strategic content:")
         print(f"   Type: {daily_plan['type']}")
@@ -61,118 +104,160 @@ class TwitterAgentPipeline:
             print(f"🧵 THREAD DAY: {thread_topic}")
             daily_plan['topic'] = thread_topic
             daily_plan['is_thread'] = True
+        return daily_plan
+
+    def run_strategic_pipeline(self, daily_plan=None, max_attempts=3, fused_optimize=None, candidates=None,
+                               run_id=None):
+        """Create approved content for a plan and post it; True once the tweet is live
+
+        With the run_id of an earlier, interrupted run the plan and options are
+        taken from its checkpoint and the run resumes where it stopped; an
+        approved but unposted run goes straight to posting.
+        """
+        run = RunCheckpoint(self.db, run_id).load() if run_id else None
+        if run and run['status'] == 'posted':
+            print(f"✅ Run {run_id} was already posted (tweet {run['tweet_id']})")
+            return True
+        if run and run['status'] == 'posting':
+            # post_tweet may have gone through before the crash; posting again could duplicate the tweet
+            print(f"⚠️ Run {run_id} crashed while posting; check the timeline before reposting manually")
+            return False
+        if run and run['status'] == 'approved':
+            print(f"⏯️ Run {run_id} was approved before it stopped; posting the checkpointed content")
+            return self.publish_content(json.loads(run['approved']))
 
-        # Run pipeline with strategic content
-        return self.run_strategic_pipeline(daily_plan)
-
-    def run_strategic_pipeline(self, daily_plan, max_attempts=3):
-        """Enhanced pipeline with automatic feedback loop and iterative improvement"""
+        approved = self.create_approved_content(daily_plan, max_attempts, fused_optimize, candidates, run_id)
+        if approved is None:
+            return False
+        return self.publish_content(approved)
+
+    def create_approved_content(self, daily_plan=None, max_attempts=3, fused_optimize=None, candidates=None,
+                                run_id=None):
+        """Enhanced pipeline with automatic feedback loop and iterative improvement
+
+        Returns the approved post (content, content_type, topic, theme,
+        attempts, run_id) without posting it, or None when every attempt was
+        rejected or the models were unavailable. Every stage output is
+        checkpointed under the run id; passing the id of an unfinished run
+        resumes its current attempt with the stages that already finished
+        skipped.
+        """
+        # Ties every routed stage and checkpoint of this run together; a resumed run keeps its id
+        checkpoint = RunCheckpoint(self.db, run_id or self.model_router.start_run())
+        run_id = checkpoint.run_id
+        resumed = checkpoint.load()
+        if resumed and resumed['status'] == 'approved':
+            return json.loads(resumed['approved'])
+        if resumed and resumed['status'] != 'running':
+            print(f"⚠️ Run {run_id} already finished ({resumed['status']}); nothing to resume")
+            return None
+        if resumed:
+            daily_plan = json.loads(resumed['daily_plan'])
+            options = json.loads(resumed['options'])
+            fused_optimize, candidates = options['fused_optimize'], options['candidates']
+        elif daily_plan is None:
+            raise ValueError(f"No checkpointed run {run_id} to resume and no daily plan given")
 
         topic = daily_plan['topic']
         content_type = daily_plan['type']
+        if fused_optimize is None:
+            fused_optimize = self.fused_optimize
+        candidates = max(1, candidates or self.candidates)
 
         print(f"🔍 Starting strategic pipeline...")
         print(f"📝 Content Type: {content_type}")
         print(f"🎯 Topic: {topic}")
+        print(f"🧩 Optimization: {'fused keyword+SEO' if fused_optimize else 'separate keyword and SEO stages'}")
+        if candidates > 1:
+            print(f"🧪 Candidates: {candidates} per attempt, judged in one boss review")
 
         research_data = None
-        boss_feedback = None
-        attempt = 1
+        if resumed:
+            attempt = resumed['attempt']
+            context = checkpoint.load_values(attempt)
+            research_plan = context['research_plan']
+            boss_feedback = context['boss_feedback']
+            print(f"⏯️ Resuming run {run_id} at attempt {attempt} with {len(context)} checkpointed values")
+        else:
+            attempt = 1
+            boss_feedback = None
+            research_plan = self.research_agent.plan_research(content_type)
+            context = {"research_plan": research_plan, "boss_feedback": None}
+            checkpoint.start(daily_plan, {"fused_optimize": fused_optimize, "candidates": candidates})
+        # Seconds into a full attempt at which each stage's output was ready, for reporting reuse savings
+        ready_at = {}
+        saved = 0.0
 
         while attempt <= max_attempts:
             print(f"\n🔄 ATTEMPT {attempt}/{max_attempts}")
 
             try:
-                # Step 1: Research
-                print("1️⃣ Researching with strategy context...")
-                if attempt == 1:
-                    research_data = self.research_agent.research_topic(content_type)
-                else:
-                    research_data = self.research_agent.research_topic_with_feedback(
-                        content_type, boss_feedback
-                    )
-                print(f"   ✅ Research completed for {research_data['theme']} theme")
-
-                # Step 2: Writing
-                print("2️⃣ Writing with proven templates...")
-                if attempt == 1:
-                    writer_data = self.writer_agent.create_content(research_data)
-                else:
-                    writer_data = self.writer_agent.create_content_with_feedback(
-                        research_data, boss_feedback
-                    )
-                print(f"   ✅ Content written using {writer_data['content_type']} template")
-
-                # Step 3: Keyword optimization
-                print("3️⃣ Optimizing keywords...")
-                if attempt == 1:
-                    keyword_data = self.keyword_agent.optimize_keywords(writer_data)
-                else:
-                    keyword_data = self.keyword_agent.optimize_keywords_with_feedback(
-                        writer_data, boss_feedback
-                    )
-                print("   ✅ Keywords optimized")
-
-                # Step 4: SEO optimization
-                print("4️⃣ SEO optimization...")
-                if attempt == 1:
-                    seo_data = self.seo_agent.optimize_seo(keyword_data)
-                else:
-                    seo_data = self.seo_agent.optimize_seo_with_feedback(
-                        keyword_data, boss_feedback
-                    )
-                print("   ✅ SEO optimized")
-
-                # Step 5: Boss approval
-                print("5️⃣ Boss review (Claude Sonnet 3.5)...")
-                boss_decision = self.boss_agent.review_and_approve(
-                    research_data, writer_data, keyword_data, seo_data, attempt
+                # The attempt's starting values first, then each stage output as it finishes
+                checkpoint.set_status("running", attempt=attempt)
+                checkpoint.save_values(attempt, context)
+                # Searches run concurrently; each agent stage starts as soon as its inputs exist
+                graph = StageGraph(
+                    self._content_stages(run_id, attempt, content_type, research_plan, fused_optimize, candidates),
+                    on_stage=lambda record, outputs, attempt=attempt: self._record_stage(
+                        run_id, attempt, record, outputs, checkpoint)
                 )
+                stage_run = graph.run(context)
+                for record in stage_run.records:
+                    if record["status"] != "reused":
+                        ready_at[record["stage"]] = stage_run.finished[record["stage"]] + saved
+                research_data = stage_run["research_data"]
+                boss_decision = stage_run["boss_decision"]
+                if candidates == 1:
+                    writer_data = stage_run["writer_data"]
+                elif boss_decision.get("choice"):
+                    print(f"🏆 Boss picked candidate {boss_decision['choice']} of {candidates}")
+                    writer_data = stage_run[f"writer_data_{boss_decision['choice']}"]
+                else:
+                    writer_data = [stage_run[f"writer_data_{i}"] for i in range(1, candidates + 1)]
 
                 final_content = boss_decision.get("final_approved_content")
+                self.model_router.record_outcome(run_id, attempt, approved=bool(final_content))
 
                 if final_content:
-                    print("✅ APPROVED! Publishing to Twitter...")
-
-                    # DEBUG: Show what we're about to post
-                    print(f"🔍 DEBUG: About to post content:")
-                    print(f"   Length: {len(final_content)} characters")
-                    print(f"   Content: '{final_content}'")
-                    print(f"   Content repr: {repr(final_content)}")
-
-                    response = self.twitter_client.post_tweet(final_content)
-
-                    if response:
-                        tweet_data = {
-                            'tweet_id': str(response.data['id']),
-                            'content': final_content,
-                            'content_type': content_type,
-                            'theme': research_data.get('theme'),
-                            'posted_at': datetime.now(),
-                            'attempts_needed': attempt
-                        }
-                        self.db.save_tweet_analytics(tweet_data)
-                        self.posted_tweets.append(tweet_data)
-
-                        print(f"🎉 Tweet posted successfully after {attempt} attempts!")
-                        print(f"   📊 Tweet ID: {response.data['id']}")
-                        print(f"   📝 Content Type: {content_type}")
-                        print(f"   🎯 Theme: {research_data.get('theme')}")
-                        return True
+                    print(f"✅ APPROVED after {attempt} attempts")
+                    approved = {
+                        'content': final_content,
+                        'content_type': content_type,
+                        'topic': topic,
+                        'theme': research_data.get('theme'),
+                        'attempts': attempt,
+                        'run_id': run_id
+                    }
+                    checkpoint.set_status("approved", approved=approved)
+                    return approved
 
                 else:
                     print(f"❌ REJECTED - Attempt {attempt}")
-                    boss_feedback = boss_decision['decision']
+                    boss_feedback = boss_decision['feedback']
                     print(f"   📝 Boss feedback: {boss_feedback[:200]}...")
 
                     if attempt < max_attempts:
                         print(f"🔄 Sending feedback to agents for revision...")
+                        context, saved = self._revision_context(graph, stage_run, boss_feedback, ready_at)
                         attempt += 1
                         continue
                     else:
                         print(f"⚠️ Max attempts ({max_attempts}) reached. Saving for manual review.")
                         self.save_failed_content(research_data, writer_data, boss_feedback)
-                        return False
+                        checkpoint.set_status("rejected")
+                        return None
+
+            except OpenRouterError as e:
+                # Every model in the fallback chain failed; further attempts would fail the same way
+                print(f"❌ AI models unavailable on attempt {attempt}, aborting pipeline: {e}")
+                try:
+                    from autonomous_monitor import AutonomousMonitor
+                    monitor = AutonomousMonitor()
+                    monitor.post_failure_recovery(f"AI models unavailable: {str(e)}")
+                except Exception as monitor_error:
+                    print(f"❌ Failed to notify autonomous monitor: {monitor_error}")
+                # Left resumable: the checkpointed stages are reused once the models are back
+                return None
 
             except Exception as e:
                 print(f"❌ Pipeline error on attempt {attempt}: {e}")
@@ -192,9 +277,50 @@ class TwitterAgentPipeline:
                     attempt += 1
                     continue
                 else:
-                    return False
+                    checkpoint.set_status("failed")
+                    return None
+
+        return None
+
+    def publish_content(self, approved):
+        """Post approved content and record it; True once the tweet is live"""
+        final_content = approved['content']
+        print("📤 Publishing to Twitter...")
+
+        # DEBUG: Show what we're about to post
+        print(f"🔍 DEBUG: About to post content:")
+        print(f"   Length: {len(final_content)} characters")
+        print(f"   Content: '{final_content}'")
+        print(f"   Content repr: {repr(final_content)}")
+
+        checkpoint = RunCheckpoint(self.db, approved.get('run_id'))
+        if checkpoint.run_id:
+            checkpoint.set_status("posting")
+        response = self.twitter_client.post_tweet(final_content)
+        if not response:
+            # post_tweet has already reported the error to the autonomous monitor; nothing was posted
+            if checkpoint.run_id:
+                checkpoint.set_status("approved")
+            return False
+        if checkpoint.run_id:
+            checkpoint.set_status("posted", tweet_id=str(response.data['id']))
+
+        tweet_data = {
+            'tweet_id': str(response.data['id']),
+            'content': final_content,
+            'content_type': approved['content_type'],
+            'theme': approved.get('theme'),
+            'posted_at': datetime.now(),
+            'attempts_needed': approved.get('attempts', 1)
+        }
+        self.db.save_tweet_analytics(tweet_data)
+        self.posted_tweets.append(tweet_data)
 
-        return False
+        print(f"🎉 Tweet posted successfully after {tweet_data['attempts_needed']} attempts!")
+        print(f"   📊 Tweet ID: {response.data['id']}")
+        print(f"   📝 Content Type: {approved['content_type']}")
+        print(f"   🎯 Theme: {approved.get('theme')}")
+        return True
 
     def respond_to_comments(self):
         """Respond to comments on posted tweets using the monitoring agent"""
@@ -215,6 +341,212 @@ class TwitterAgentPipeline:
             print(f"❌ Error in comment response process: {e}")
             return False
 
+    def _content_stages(self, run_id, attempt, content_type, research_plan, fused_optimize, candidates=1):
+        """Stage-graph nodes for one pipeline attempt
+
+        Each agent node picks its normal or _with_feedback variant from
+        boss_feedback and runs under the model router, which chooses its model.
+        With several candidates the writer→keyword→SEO chain is repeated as
+        writer_1, writer_2, ... on the same research, and one boss call picks
+        among the finished candidates.
+        """
+        def research(research_plan, boss_feedback, **searches):
+            print("1️⃣ Researching with strategy context...")
+            trends = {name[len("search_"):]: results for name, results in searches.items()}
+            with self.model_router.stage(run_id, "research", attempt, content_type,
+                                         estimate_tokens(boss_feedback)) as model:
+                research_data = self.research_agent.write_research(research_plan, trends, boss_feedback,
+                                                                   model=model)
+            print(f"   ✅ Research completed for {research_data['theme']} theme")
+            return research_data
+
+        def writer(research_data, boss_feedback):
+            print("2️⃣ Writing with proven templates...")
+            with self.model_router.stage(run_id, "writer", attempt, content_type,
+                                         estimate_tokens(research_data['research'])) as model:
+                # Candidates share one prompt; each must be sampled, not coalesced into one call
+                if boss_feedback is None:
+                    writer_data = self.writer_agent.create_content(research_data, model=model,
+                                                                   dedupe=candidates == 1)
+                else:
+                    writer_data = self.writer_agent.create_content_with_feedback(
+                        research_data, boss_feedback, model=model, dedupe=candidates == 1
+                    )
+            print(f"   ✅ Content written using {writer_data['content_type']} template")
+            return writer_data
+
+        def keyword(writer_data, boss_feedback):
+            print("3️⃣ Optimizing keywords...")
+            with self.model_router.stage(run_id, "keyword", attempt, content_type,
+                                         estimate_tokens(writer_data['content'])) as model:
+                if boss_feedback is None:
+                    keyword_data = self.keyword_agent.optimize_keywords(writer_data, model=model)
+                else:
+                    keyword_data = self.keyword_agent.optimize_keywords_with_feedback(
+                        writer_data, boss_feedback, model=model
+                    )
+            print("   ✅ Keywords optimized")
+            return keyword_data
+
+        def seo(keyword_data, boss_feedback):
+            print("4️⃣ SEO optimization...")
+            with self.model_router.stage(run_id, "seo", attempt, content_type,
+                                         estimate_tokens(keyword_data['optimized_content'])) as model:
+                if boss_feedback is None:
+                    seo_data = self.seo_agent.optimize_seo(keyword_data, model=model)
+                else:
+                    seo_data = self.seo_agent.optimize_seo_with_feedback(keyword_data, boss_feedback, model=model)
+            print("   ✅ SEO optimized")
+            return seo_data
+
+        def keyword_seo(writer_data, boss_feedback):
+            print("3️⃣ Optimizing keywords + SEO (fused)...")
+            with self.model_router.stage(run_id, "keyword_seo", attempt, content_type,
+                                         estimate_tokens(writer_data['content'])) as model:
+                if boss_feedback is None:
+                    keyword_data, seo_data = self.keyword_seo_agent.optimize(writer_data, model=model)
+                else:
+                    keyword_data, seo_data = self.keyword_seo_agent.optimize_with_feedback(
+                        writer_data, boss_feedback, model=model
+                    )
+            print(f"   ✅ Keywords + SEO optimized ({len(seo_data['hashtags'])} hashtags)")
+            return keyword_data, seo_data
+
+        def boss(research_data, writer_data, keyword_data, seo_data):
+            issues = self._pre_review_lint(run_id, attempt, content_type, [seo_data])
+            if issues[0]:
+                return self._lint_rejection(lint_feedback(issues[0]), attempt)
+            print("5️⃣ Boss review (Claude Sonnet 3.5)...")
+            # The boss is not routed, but its latency counts toward each approved tweet
+            with self.model_router.stage(run_id, "boss", attempt, content_type):
+                return self.boss_agent.review_and_approve(research_data, writer_data, keyword_data, seo_data, attempt)
+
+        def boss_pick(research_data, **candidate_data):
+            drafts = [candidate_data[name] for name in candidate_outputs]
+            issues = self._pre_review_lint(run_id, attempt, content_type, drafts)
+            # Candidate numbers (1-based) that passed the lint; the boss only sees those
+            passing = [i for i, draft_issues in enumerate(issues, 1) if not draft_issues]
+            if not passing:
+                feedback = "\n".join(f"Candidate {i}: {lint_feedback(draft_issues)}"
+                                     for i, draft_issues in enumerate(issues, 1))
+                return self._lint_rejection(feedback, attempt)
+            print(f"5️⃣ Boss review of {len(passing)} candidates (one call)...")
+            with self.model_router.stage(run_id, "boss", attempt, content_type):
+                decision = self.boss_agent.review_candidates(
+                    research_data, [drafts[i - 1] for i in passing], attempt
+                )
+            if decision.get("choice"):
+                decision["choice"] = passing[decision["choice"] - 1]
+            return decision
+
+        # A search that cannot finish in time is reported like any other unavailable search
+        searches = [
+            Stage(f"search_{name}", functools.partial(self.research_agent.search_brave, query),
+                  timeout=STAGE_TIMEOUTS["search"], retries=1, fallback="Search unavailable (timed out)")
+            for name, query in research_plan["search_queries"].items()
+        ]
+        stages = searches + [
+            Stage("research", research, inputs=("research_plan", "boss_feedback") + tuple(s.name for s in searches),
+                  outputs=("research_data",), timeout=STAGE_TIMEOUTS["research"]),
+        ]
+        candidate_outputs = []
+        for i in range(1, candidates + 1):
+            # A single candidate keeps the plain stage and value names
+            n = f"_{i}" if candidates > 1 else ""
+            stages.append(Stage(f"writer{n}", writer, inputs=("research_data", "boss_feedback"),
+                                outputs=(f"writer_data{n}",), timeout=STAGE_TIMEOUTS["writer"]))
+            if fused_optimize:
+                stages.append(Stage(f"keyword_seo{n}", keyword_seo,
+                                    inputs={"writer_data": f"writer_data{n}", "boss_feedback": "boss_feedback"},
+                                    outputs=(f"keyword_data{n}", f"seo_data{n}"),
+                                    timeout=STAGE_TIMEOUTS["keyword_seo"]))
+            else:
+                stages += [
+                    Stage(f"keyword{n}", keyword,
+                          inputs={"writer_data": f"writer_data{n}", "boss_feedback": "boss_feedback"},
+                          outputs=(f"keyword_data{n}",), timeout=STAGE_TIMEOUTS["keyword"]),
+                    Stage(f"seo{n}", seo,
+                          inputs={"keyword_data": f"keyword_data{n}", "boss_feedback": "boss_feedback"},
+                          outputs=(f"seo_data{n}",), timeout=STAGE_TIMEOUTS["seo"]),
+                ]
+            candidate_outputs.append(f"seo_data{n}")
+
+        if candidates == 1:
+            stages.append(Stage("boss", boss, inputs=("research_data", "writer_data", "keyword_data", "seo_data"),
+                                outputs=("boss_decision",), timeout=STAGE_TIMEOUTS["boss"]))
+        else:
+            stages.append(Stage("boss", boss_pick, inputs=("research_data",) + tuple(candidate_outputs),
+                                outputs=("boss_decision",), timeout=STAGE_TIMEOUTS["boss"]))
+        return stages
+
+    def _revision_context(self, graph, stage_run, boss_feedback, ready_at):
+        """Context for the next attempt, carrying over outputs of stages the feedback does not implicate
+
+        StageGraph skips any stage whose outputs are already in its context, so
+        only the implicated level and everything downstream of it run again.
+        Returns (context, seconds saved), the saving being how far into a full
+        attempt the reused outputs were ready.
+        """
+        level, matches = classify_feedback(boss_feedback)
+        statuses = {record["stage"]: record["status"] for record in stage_run.records}
+        # A search that fell back is worth retrying whenever research is redone anyway
+        reused = [name for name in reused_stages([stage.name for stage in graph.stages], level)
+                  if not (statuses.get(name) == "fallback" and level == "research")]
+
+        context = {"research_plan": stage_run["research_plan"], "boss_feedback": boss_feedback}
+        for stage in graph.stages:
+            if stage.name in reused:
+                context.update({output: stage_run[output] for output in stage.outputs})
+        saved = max((ready_at.get(name, 0.0) for name in reused), default=0.0)
+
+        reason = f"feedback mentions {', '.join(matches)}" if matches else "feedback names no stage"
+        print(f"♻️ Revising from {level} ({reason}); skipping {', '.join(reused) or 'nothing'} (~{saved:.1f}s saved)")
+        return context, saved
+
+    def _pre_review_lint(self, run_id, attempt, content_type, drafts):
+        """Issue lists of the final drafts, one per draft; all empty when the linter is off
+
+        Recorded as a "lint" stage: rejected when every draft failed and the boss
+        call was skipped, passed otherwise, with the issues found as its error.
+        """
+        if self.linter is None:
+            return [[] for _ in drafts]
+        started = time.monotonic()
+        issues = [self.linter.lint(draft['final_content'], content_type) for draft in drafts]
+        self.linter.record(issues)
+        found = "; ".join(f"{i}: {' '.join(draft_issues)}" if len(drafts) > 1 else " ".join(draft_issues)
+                          for i, draft_issues in enumerate(issues, 1) if draft_issues)
+        self._record_stage(run_id, attempt, {
+            "stage": "lint",
+            "status": "rejected" if all(issues) else "passed",
+            "wall_time": time.monotonic() - started,
+            "error": found or None
+        })
+        if all(issues):
+            print(f"🧹 Pre-review lint rejected the draft{'s' if len(drafts) > 1 else ''}; boss call avoided "
+                  f"({self.linter.get_stats()['boss_calls_avoided']} so far)")
+        elif found:
+            dropped = [str(i) for i, draft_issues in enumerate(issues, 1) if draft_issues]
+            print(f"🧹 Pre-review lint dropped candidate {', '.join(dropped)} before the boss review")
+        return issues
+
+    @staticmethod
+    def _lint_rejection(feedback, attempt):
+        """A boss_decision-shaped rejection carrying the linter's feedback"""
+        return {
+            "decision": "REJECT",
+            "feedback": feedback,
+            "hashtags": [],
+            "attempt_number": attempt,
+            "final_approved_content": None,
+            "agent": "linter"
+        }
+
+    def _record_stage(self, run_id, attempt, record, outputs=None, checkpoint=None):
+        self.db.save_stage_record(dict(record, run_id=run_id, attempt=attempt))
+        if outputs and checkpoint is not None:
+            checkpoint.save_values(attempt, outputs)
+
     def save_failed_content(self, research_data, writer_data, feedback):
         """Save content that failed all attempts for manual review"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -336,17 +668,21 @@ class TwitterAgentPipeline:
             
             print(f"✅ Found {content['total']} pieces of content to engage with")
             
-            # Engage with each piece of content
-            for tweet in content['tweets']:
-                # Randomly decide on engagement type (be conservative with commenting)
-                import random
-                engagement_type = random.choices(
+            # Randomly decide on engagement type (be conservative with commenting)
+            import random
+            engagements = [
+                (tweet, random.choices(
                     ["like", "like_and_comment", "retweet"], 
                     weights=[0.6, 0.3, 0.1]  # 60% like, 30% like+comment, 10% retweet
-                )[0]
-                
-                result = self.engagement_agent.engage_with_content(tweet, engagement_type)
-                
+                )[0])
+                for tweet in content['tweets']
+            ]
+            
+            # Comments for every selected tweet are generated in one concurrent batch
+            results = self.engagement_agent.engage_with_content_batch(engagements)
+            
+            # Record each engagement
+            for (tweet, _), result in zip(engagements, results):
                 if "error" in result:
                     print(f"❌ Engagement failed for tweet {tweet['id']}: {result['error']}")
                     continue
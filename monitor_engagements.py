@@ -7,6 +7,7 @@ from datetime import datetime
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from agents.monitoring_agent import MonitoringAgent
+from utils.rate_limiter import rate_priority
 
 def main():
     """Main monitoring function"""
@@ -17,8 +18,9 @@ def main():
     # Initialize the monitoring agent
     monitor = MonitoringAgent()
     
-    # Run continuous monitoring
-    monitor.monitor_new_engagements(interval_minutes=5)
+    # Run continuous monitoring; replies yield shared API quota to posting jobs
+    with rate_priority("interactive"):
+        monitor.monitor_new_engagements(interval_minutes=5)
 
 if __name__ == "__main__":
     try:
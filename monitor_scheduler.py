@@ -9,6 +9,7 @@ from datetime import datetime
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from agents.monitoring_agent import MonitoringAgent
+from utils.rate_limiter import rate_priority
 
 def run_engagement_monitoring():
     """Run the engagement monitoring check"""
@@ -20,8 +21,9 @@ def run_engagement_monitoring():
         
         if monitor.initialize_agent():
             # Check for new mentions
-            mentions = monitor.monitor_mentions(max_results=20)
-            monitor.process_mentions(mentions)
+            with rate_priority("interactive"):
+                mentions = monitor.monitor_mentions(max_results=20)
+                monitor.process_mentions(mentions)
             
             print("✅ Scheduled engagement monitoring completed successfully!")
         else:
@@ -45,7 +47,8 @@ def run_trend_monitoring():
         db = TwitterDatabase()
         
         # Get trending topics
-        trends = trend_agent.get_trending_hashtags(woeid=23424977)  # US
+        with rate_priority("background"):
+            trends = trend_agent.get_trending_hashtags(woeid=23424977)  # US
         
         if "error" not in trends:
             # Save to database
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Local OpenRouter-compatible stub for load testing without spending tokens
+
+    python3 openrouter_stub.py --port 8099 --latency lognormal:0.7,0.5 --error-rate 0.05 --reject-rate 0.3
+    OPENROUTER_BASE_URL=http://127.0.0.1:8099/api/v1 python3 main.py
+
+Implements POST /api/v1/chat/completions (plain JSON and SSE streaming) with
+configurable latency distributions, injected errors and canned APPROVE/REJECT
+boss decisions. Requests with a json_schema response_format get canned JSON,
+optionally malformed to exercise the client's repair call, and drafts can be
+made to break the template rules to exercise the pre-review lint. GET /stats reports request counts and peak concurrency, which
+shows how many calls the client actually keeps in flight.
+"""
+
+import sys
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CANNED_TWEET = ("Most AI automation projects fail on the boring parts: data access, retries and "
+                "monitoring. Start with one workflow, measure it, then scale. Which one would you start with? "
+                "#AI #Automation")
+# What --lint-fail-rate drafts look like: no closing question and too many hashtags for the pre-review lint
+CANNED_BAD_TWEET = ("Most AI automation projects fail on the boring parts: data access, retries and monitoring. "
+                    "#AI #Automation #Agents #LLM #DevOps #Data")
+
+CANNED_RESEARCH = """Key insights:
+- Teams adopting AI agents report the biggest wins in repetitive back-office workflows
+- Reliability (retries, monitoring, human review) decides whether pilots reach production
+- Small, measurable automations build trust faster than big-bang rollouts
+
+Suggested angle: practical lessons from shipping one automation end to end."""
+
+CANNED_REJECTION = ("The hook is generic and the tweet lacks a concrete example. Open with a specific "
+                    "result or number, cut filler words and keep one clear call to action.")
+
+
+def parse_distribution(spec):
+    """Build a sampler from 'fixed:S', 'uniform:A,B', 'normal:MEAN,SD' or 'lognormal:MU,SIGMA'"""
+    kind, _, args = spec.partition(':')
+    values = [float(v) for v in args.split(',') if v]
+    samplers = {
+        "fixed": lambda: values[0],
+        "uniform": lambda: random.uniform(values[0], values[1]),
+        "normal": lambda: random.gauss(values[0], values[1]),
+        "lognormal": lambda: random.lognormvariate(values[0], values[1]),
+    }
+    if kind not in samplers:
+        raise argparse.ArgumentTypeError(f"unknown latency distribution: {spec}")
+    sampler = samplers[kind]
+    return lambda: max(0.0, sampler())
+
+
+class StubState:
+    """Counters shared by all handler threads"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.streamed = 0
+        self.errors = 0
+        self.approvals = 0
+        self.rejections = 0
+        self.malformed = 0
+        self.lint_failing_drafts = 0
+        self.inflight = 0
+        self.peak_inflight = 0
+        self.started_at = time.time()
+
+    def enter(self):
+        with self.lock:
+            self.requests += 1
+            self.inflight += 1
+            self.peak_inflight = max(self.peak_inflight, self.inflight)
+
+    def leave(self):
+        with self.lock:
+            self.inflight -= 1
+
+    def count(self, name):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "streamed": self.streamed,
+                "errors": self.errors,
+                "approvals": self.approvals,
+                "rejections": self.rejections,
+                "malformed": self.malformed,
+                "lint_failing_drafts": self.lint_failing_drafts,
+                "inflight": self.inflight,
+                "peak_inflight": self.peak_inflight,
+                "uptime": round(time.time() - self.started_at, 1)
+            }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Set by serve()
+    config = None
+    state = None
+
+    def log_message(self, format, *args):
+        if self.config.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path.rstrip('/') == "/stats":
+            self._send_json(200, self.state.snapshot())
+        else:
+            self._send_json(404, {"error": {"code": 404, "message": "not found"}})
+
+    def do_POST(self):
+        if self.path.rstrip('/') != "/api/v1/chat/completions":
+            self._send_json(404, {"error": {"code": 404, "message": "not found"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"code": 400, "message": "invalid JSON"}})
+            return
+
+        self.state.enter()
+        try:
+            self._complete(request)
+        finally:
+            self.state.leave()
+
+    def _complete(self, request):
+        latency = self.config.latency()
+        if random.random() < self.config.error_rate:
+            # Fail part-way through, like a real overloaded upstream
+            time.sleep(latency * random.random())
+            self.state.count("errors")
+            status = random.choice(self.config.error_statuses)
+            headers = {"Retry-After": str(self.config.retry_after)} if status == 429 else None
+            self._send_json(status, {"error": {"code": status, "message": f"stub injected {status}"}}, headers)
+            return
+
+        messages = request.get("messages", [])
+        content = self._canned_content(messages, request.get("response_format"))
+        prompt_tokens = sum(len(str(m.get("content", ""))) // 4 + 4 for m in messages)
+        completion_tokens = max(1, len(content) // 4)
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                 "total_tokens": prompt_tokens + completion_tokens}
+        model = request.get("model", "stub")
+
+        if request.get("stream"):
+            self.state.count("streamed")
+            self._stream(content, model, latency, usage if request.get("usage", {}).get("include") else None)
+            return
+
+        time.sleep(latency)
+        self._send_json(200, {
+            "id": f"gen-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                         "finish_reason": "stop"}],
+            "usage": usage
+        })
+
+    def _canned_content(self, messages, response_format=None):
+        if response_format and response_format.get("type") == "json_schema":
+            return self._canned_json(response_format["json_schema"].get("name"), messages)
+        prompt = "\n".join(str(m.get("content", "")) for m in messages)
+        if "APPROVE or REJECT" in prompt:
+            if random.random() < self.config.reject_rate:
+                self.state.count("rejections")
+                return f"REJECT: {CANNED_REJECTION}"
+            self.state.count("approvals")
+            return f"APPROVE: {CANNED_TWEET}"
+        if messages and messages[0].get("role") == "system" and "research" in str(messages[0].get("content", "")).lower():
+            return CANNED_RESEARCH
+        return self._canned_draft()
+
+    def _canned_draft(self):
+        if random.random() < self.config.lint_fail_rate:
+            self.state.count("lint_failing_drafts")
+            return CANNED_BAD_TWEET
+        return CANNED_TWEET
+
+    def _canned_json(self, name, messages):
+        if random.random() < self.config.malformed_rate:
+            # Prose around a truncated object, like a model ignoring response_format
+            self.state.count("malformed")
+            return 'Here is my answer: {"verdict": "APPROVE", "tweet": "' + CANNED_TWEET[:60]
+        hashtags = [word for word in CANNED_TWEET.split() if word.startswith('#')]
+        if name == "boss_review":
+            if random.random() < self.config.reject_rate:
+                self.state.count("rejections")
+                return json.dumps({"verdict": "REJECT", "tweet": "", "feedback": CANNED_REJECTION,
+                                   "hashtags": []})
+            self.state.count("approvals")
+            return json.dumps({"verdict": "APPROVE", "tweet": CANNED_TWEET, "feedback": "",
+                               "hashtags": hashtags})
+        if name == "boss_pick":
+            # Each candidate passes on its own at 1 - reject_rate; the first that passes is picked
+            candidates = "\n".join(str(m.get("content", "")) for m in messages).count("CANDIDATE ")
+            passing = [i for i in range(1, candidates + 1) if random.random() >= self.config.reject_rate]
+            if not passing:
+                self.state.count("rejections")
+                return json.dumps({"verdict": "REJECT", "choice": 0, "tweet": "", "feedback": CANNED_REJECTION,
+                                   "hashtags": []})
+            self.state.count("approvals")
+            return json.dumps({"verdict": "APPROVE", "choice": passing[0], "tweet": CANNED_TWEET, "feedback": "",
+                               "hashtags": hashtags})
+        return json.dumps({"tweet": self._canned_draft(), "hashtags": hashtags})
+
+    def _stream(self, content, model, latency, usage):
+        """Send content as SSE chunks: first token after ttft, the rest spread over the remaining latency"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def send(line):
+            data = (line + "\n\n").encode('utf-8')
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        words = content.split(" ")
+        pieces = [w + (" " if i < len(words) - 1 else "") for i, w in enumerate(words)]
+        ttft = latency * self.config.ttft_fraction
+        per_piece = (latency - ttft) / max(1, len(pieces))
+        generation_id = f"gen-{uuid.uuid4().hex[:12]}"
+
+        try:
+            send(": OPENROUTER PROCESSING")
+            time.sleep(ttft)
+            for piece in pieces:
+                send("data: " + json.dumps({"id": generation_id, "model": model,
+                                            "choices": [{"index": 0, "delta": {"content": piece}}]}))
+                time.sleep(per_piece)
+            final = {"id": generation_id, "model": model,
+                     "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+            if usage:
+                final["usage"] = usage
+            send("data: " + json.dumps(final))
+            send("data: [DONE]")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client aborted the stream early (e.g. the tweet body was complete)
+            self.close_connection = True
+
+
+def serve(config):
+    StubHandler.config = config
+    StubHandler.state = StubState()
+    server = ThreadingHTTPServer((config.host, config.port), StubHandler)
+    server.daemon_threads = True
+    print(f"🧪 OpenRouter stub on http://{config.host}:{config.port}/api/v1 "
+          f"(latency {config.latency_spec}, errors {config.error_rate:.0%}, rejects {config.reject_rate:.0%})")
+    print(f"   export OPENROUTER_BASE_URL=http://{config.host}:{config.port}/api/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"📊 {json.dumps(StubHandler.state.snapshot())}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenRouter-compatible stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", dest="latency_spec", default="lognormal:0.0,0.5",
+                        help="fixed:S | uniform:A,B | normal:MEAN,SD | lognormal:MU,SIGMA (seconds)")
+    parser.add_argument("--ttft-fraction", type=float, default=0.3,
+                        help="share of the latency spent before the first streamed token")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--error-statuses", default="429,500,503",
+                        help="comma-separated statuses to pick from when failing")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--reject-rate", type=float, default=0.0, help="fraction of boss reviews that REJECT")
+    parser.add_argument("--malformed-rate", type=float, default=0.0,
+                        help="fraction of JSON-mode responses that come back malformed")
+    parser.add_argument("--lint-fail-rate", type=float, default=0.0,
+                        help="fraction of drafts that break the template rules the pre-review lint checks")
+    parser.add_argument("--seed", type=int, help="random seed for reproducible runs")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    config = parser.parse_args()
+
+    config.latency = parse_distribution(config.latency_spec)
+    config.error_statuses = [int(s) for s in config.error_statuses.split(',') if s]
+    if config.seed is not None:
+        random.seed(config.seed)
+    serve(config)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Resume an interrupted strategic pipeline run from its checkpoints
+
+    python3 resume_run.py              # list unfinished runs
+    python3 resume_run.py RUN_ID       # finish that run: skip completed stages, post once approved
+
+The scheduler's daily run resumes today's unfinished run on its own; this is
+for doing it by hand after a crash.
+"""
+
+import sys
+import os
+import json
+import argparse
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.database import TwitterDatabase
+from utils.rate_limiter import rate_priority
+from utils.run_checkpoint import RESUMABLE_STATUSES
+
+
+def list_runs(db):
+    runs = db.get_pipeline_runs(statuses=RESUMABLE_STATUSES + ("posting",))
+    if not runs:
+        print("No unfinished pipeline runs")
+        return
+    print(f"{'run id':<14} {'started':<20} {'status':<9} {'attempt':>7}  topic")
+    for run in runs:
+        topic = json.loads(run['daily_plan']).get('topic', '')
+        print(f"{run['run_id']:<14} {run['created_at'][:19]:<20} {run['status']:<9} {run['attempt']:>7}  {topic}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resume an interrupted strategic pipeline run")
+    parser.add_argument("run_id", nargs="?", help="run to resume (omit to list unfinished runs)")
+    args = parser.parse_args()
+
+    db = TwitterDatabase()
+    if not args.run_id:
+        list_runs(db)
+        return 0
+    if db.get_pipeline_run(args.run_id) is None:
+        print(f"❌ No checkpointed run {args.run_id}")
+        return 1
+
+    from main import TwitterAgentPipeline
+    pipeline = TwitterAgentPipeline()
+    with rate_priority("posting"):
+        success = pipeline.run_strategic_pipeline(run_id=args.run_id)
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
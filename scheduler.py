@@ -10,17 +10,40 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from main import TwitterAgentPipeline
 from autonomous_monitor import AutonomousMonitor
+from utils.rate_limiter import rate_priority
+from utils.content_buffer import ContentBuffer, content_buffer_enabled, CONTENT_BUFFER_QUIET_MINUTES
+from utils.run_checkpoint import RunCheckpoint
 
-def run_daily_posting():
-    """Run the daily Twitter posting pipeline"""
+# Daily posting times; the content buffer pre-generates one approved post per slot
+POSTING_SLOTS = ["09:00", "15:00"]
+CONTENT_BUFFER_FILL_MINUTES = int(os.getenv('CONTENT_BUFFER_FILL_MINUTES', '30'))
+
+def run_daily_posting(slot=None):
+    """Post the buffered content for this slot, or run the daily Twitter posting pipeline"""
     print(f"📅 Running scheduled Twitter posting - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     try:
         # Initialize the pipeline
         pipeline = TwitterAgentPipeline()
         
-        # Run the daily content pipeline
-        success = pipeline.run_daily_content()
+        buffered = None
+        if slot and content_buffer_enabled():
+            buffer = ContentBuffer(POSTING_SLOTS, pipeline.db)
+            buffered = buffer.take(datetime.now().date().isoformat(), slot, pipeline.get_daily_plan()['topic'])
+        
+        # Posting gets first claim on shared API quota
+        with rate_priority("posting"):
+            if buffered:
+                # Generated ahead of time; only the post itself happens now
+                print(f"📦 Posting buffered content for {buffered['slot_date']} {slot}")
+                success = pipeline.publish_content(buffered)
+                if success:
+                    buffer.mark_posted(buffered['id'], pipeline.posted_tweets[-1]['tweet_id'])
+                else:
+                    buffer.mark_failed(buffered['id'])
+            else:
+                # Nothing buffered (fill job not run yet, or the draft went stale): generate live
+                success = pipeline.run_daily_content()
         
         if success:
             print("✅ Scheduled posting completed successfully!")
@@ -39,6 +62,43 @@ def run_daily_posting():
         monitor = AutonomousMonitor()
         monitor.post_failure_recovery(f"Scheduled posting failed with exception: {str(e)}")
 
+def run_content_buffer_fill():
+    """Generate approved posts for the upcoming posting slots ahead of time"""
+    if not content_buffer_enabled():
+        return
+    
+    try:
+        pipeline = TwitterAgentPipeline()
+        buffer = ContentBuffer(POSTING_SLOTS, pipeline.db)
+        daily_plan = pipeline.get_daily_plan()
+        buffer.expire(topic=daily_plan['topic'])
+        
+        missing = buffer.missing_slots()
+        if not missing:
+            return
+        print(f"📦 Filling content buffer for {len(missing)} slots - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        
+        for slot_date, slot in missing:
+            # Jobs run one at a time, so a generation started just before a slot would delay its post
+            if buffer.minutes_to_next_slot() < CONTENT_BUFFER_QUIET_MINUTES:
+                print("⏸️ Posting slot coming up; pausing buffer fill")
+                return
+            
+            # Idle-time work: yields API quota to posting and interactive jobs
+            with rate_priority("background"):
+                approved = pipeline.create_approved_content(daily_plan)
+            if approved is None:
+                print(f"❌ Could not pre-generate content for {slot_date} {slot}; will retry next fill")
+                return
+            buffer.put(slot_date, slot, approved)
+            # The buffer owns the post now; the run must not be resumed and posted on its own
+            RunCheckpoint(pipeline.db, approved['run_id']).set_status("buffered")
+            
+    except Exception as e:
+        print(f"❌ Error in content buffer fill: {e}")
+        import traceback
+        traceback.print_exc()
+
 def run_trend_analysis():
     """Analyze trending topics"""
     print(f"🔍 Running scheduled trend analysis - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -48,7 +108,8 @@ def run_trend_analysis():
         pipeline = TwitterAgentPipeline()
         
         # Analyze trends
-        trends = pipeline.analyze_trends()
+        with rate_priority("background"):
+            trends = pipeline.analyze_trends()
         
         if trends:
             print("✅ Scheduled trend analysis completed successfully!")
@@ -69,7 +130,8 @@ def run_performance_analysis():
         pipeline = TwitterAgentPipeline()
         
         # Analyze performance
-        performance = pipeline.analyze_performance()
+        with rate_priority("background"):
+            performance = pipeline.analyze_performance()
         
         if performance:
             print("✅ Scheduled performance analysis completed successfully!")
@@ -90,7 +152,8 @@ def run_proactive_engagement():
         pipeline = TwitterAgentPipeline()
         
         # Proactive engagement
-        success = pipeline.proactive_engagement()
+        with rate_priority("background"):
+            success = pipeline.proactive_engagement()
         
         if success:
             print("✅ Scheduled proactive engagement completed successfully!")
@@ -111,7 +174,8 @@ def run_comment_response():
         pipeline = TwitterAgentPipeline()
         
         # Respond to comments
-        success = pipeline.respond_to_comments()
+        with rate_priority("interactive"):
+            success = pipeline.respond_to_comments()
         
         if success:
             print("✅ Scheduled comment response completed successfully!")
@@ -129,10 +193,13 @@ def main():
     print("=" * 50)
     
     # Schedule the daily posting for 9:00 AM
-    schedule.every().day.at("09:00").do(run_daily_posting)
+    schedule.every().day.at("09:00").do(run_daily_posting, "09:00")
     
     # Also schedule for 3:00 PM as a second daily post
-    schedule.every().day.at("15:00").do(run_daily_posting)
+    schedule.every().day.at("15:00").do(run_daily_posting, "15:00")
+    
+    # Keep approved posts ready ahead of both slots
+    schedule.every(CONTENT_BUFFER_FILL_MINUTES).minutes.do(run_content_buffer_fill)
     
     # Schedule trend analysis once per day at 10:00 AM
     schedule.every().day.at("10:00").do(run_trend_analysis)
@@ -149,6 +216,7 @@ def main():
     print("⏰ Scheduled tasks:")
     print("   • 9:00 AM - Morning post")
     print("   • 3:00 PM - Afternoon post")
+    print(f"   • Every {CONTENT_BUFFER_FILL_MINUTES} minutes - Pre-generate posts for upcoming slots")
     print("   • 10:00 AM - Daily trend analysis")
     print("   • 11:00 PM - Daily performance analysis")
     print("   • Every 4 hours - Proactive engagement")
@@ -157,6 +225,7 @@ def main():
     
     # Run any pending jobs immediately when starting
     schedule.run_pending()
+    run_content_buffer_fill()
     
     # Keep the scheduler running
     while True:
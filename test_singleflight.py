@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+import asyncio
+from utils.singleflight import SingleFlight
+
+
+def test_cancelled_follower_does_not_break_others():
+    """A follower's timeout must not cancel the call the leader and other followers share"""
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def slow_call():
+            await release.wait()
+            return "result"
+
+        leader = asyncio.ensure_future(flight.do("key", slow_call))
+        await asyncio.sleep(0)
+        impatient = asyncio.ensure_future(asyncio.wait_for(flight.do("key", slow_call), timeout=0.01))
+        patient = asyncio.ensure_future(flight.do("key", slow_call))
+        await asyncio.sleep(0.05)
+        assert impatient.done()
+        release.set()
+
+        results = await asyncio.gather(leader, patient, impatient, return_exceptions=True)
+        assert results[0] == "result"
+        assert results[1] == "result"
+        assert isinstance(results[2], asyncio.TimeoutError)
+        assert flight.get_stats() == {"calls": 3, "executed": 1, "coalesced": 2, "inflight": 0}
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    test_cancelled_follower_does_not_break_others()
+    print("✅ SingleFlight survives a cancelled follower")
@@ -0,0 +1,244 @@
+import os
+import json
+import time
+import hashlib
+import importlib
+import threading
+from datetime import datetime
+
+# off | record | replay
+CASSETTE_MODE = os.getenv('CASSETTE_MODE', 'off').lower()
+CASSETTE_PATH = os.getenv('CASSETTE_PATH', 'data/cassettes/default.json')
+# Multiplier on recorded latencies during replay; 0 replays instantly
+CASSETTE_LATENCY_SCALE = float(os.getenv('CASSETTE_LATENCY_SCALE', '1.0'))
+
+_JSON_TYPES = (str, int, float, bool, type(None))
+
+
+class CassetteMissError(Exception):
+    """Replay found no recorded exchange for a request"""
+
+
+def request_key(target, request):
+    """Stable hash of a request; cassettes store this instead of the request body"""
+    raw = json.dumps([target, request], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def encode_value(value):
+    """JSON-safe form of a recorded result, including tweepy responses and models"""
+    if isinstance(value, _JSON_TYPES):
+        return value
+    if isinstance(value, dict):
+        return {str(k): encode_value(v) for k, v in value.items()}
+    # tweepy.Response is a namedtuple of (data, includes, errors, meta)
+    if isinstance(value, tuple) and hasattr(value, '_fields'):
+        return {"__namedtuple__": f"{type(value).__module__}.{type(value).__name__}",
+                "fields": {name: encode_value(getattr(value, name)) for name in value._fields}}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(v) for v in value]
+    # tweepy v2 objects (Tweet, User, ...) are built from their raw data dict
+    if isinstance(getattr(value, 'data', None), dict):
+        return {"__object__": f"{type(value).__module__}.{type(value).__name__}",
+                "data": encode_value(value.data)}
+    # tweepy v1.1 models keep the raw payload in _json
+    if isinstance(getattr(value, '_json', None), (dict, list)):
+        return {"__model__": f"{type(value).__module__}.{type(value).__name__}",
+                "json": encode_value(value._json)}
+    return str(value)
+
+
+def _load_class(path):
+    module, _, name = path.rpartition('.')
+    return getattr(importlib.import_module(module), name)
+
+
+def decode_value(value):
+    if isinstance(value, list):
+        return [decode_value(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if "__namedtuple__" in value:
+        fields = {name: decode_value(v) for name, v in value["fields"].items()}
+        return _load_class(value["__namedtuple__"])(**fields)
+    if "__object__" in value:
+        return _load_class(value["__object__"])(decode_value(value["data"]))
+    if "__model__" in value:
+        return _load_class(value["__model__"]).parse(None, decode_value(value["json"]))
+    return {k: decode_value(v) for k, v in value.items()}
+
+
+def encode_error(error):
+    attrs = {k: v for k, v in vars(error).items() if isinstance(v, _JSON_TYPES)}
+    return {"type": f"{type(error).__module__}.{type(error).__name__}", "message": str(error), "attrs": attrs}
+
+
+def decode_error(data):
+    """Rebuild a recorded exception without calling its constructor"""
+    try:
+        cls = _load_class(data["type"])
+    except (ImportError, AttributeError, ValueError):
+        return CassetteMissError(f"{data['type']}: {data['message']}")
+    error = cls.__new__(cls)
+    Exception.__init__(error, data["message"])
+    error.__dict__.update(data.get("attrs", {}))
+    return error
+
+
+class Cassette:
+    """Records external calls to a JSON file and serves them back offline
+
+    Each interaction stores the request hash, a short label (target method or
+    agent:model), the observed latency and the result or raised error. Replay
+    prefers an exact request match and otherwise takes the next unused
+    interaction with the same label, so prompts that embed dates or random
+    choices still replay in order.
+    """
+
+    def __init__(self, path=None, mode=None, latency_scale=None):
+        self.path = path or CASSETTE_PATH
+        self.mode = (mode or CASSETTE_MODE).lower()
+        self.latency_scale = CASSETTE_LATENCY_SCALE if latency_scale is None else latency_scale
+        self.interactions = []
+        self._used = set()
+        self._lock = threading.Lock()
+        self.stats = {"recorded": 0, "replayed": 0, "fuzzy": 0, "misses": 0}
+
+        if self.mode == 'replay':
+            with open(self.path) as f:
+                self.interactions = json.load(f).get('interactions', [])
+            print(f"📼 Replaying {len(self.interactions)} interactions from {self.path}")
+        elif self.mode == 'record':
+            print(f"📼 Recording external calls to {self.path}")
+
+    @property
+    def active(self):
+        return self.mode in ('record', 'replay')
+
+    def call(self, target, request, fn, label=None, errors=(Exception,)):
+        """Run fn() through the cassette
+
+        request is any JSON-able description of the call (hashed, not stored).
+        Exceptions of the given types are recorded and re-raised on replay.
+        """
+        if self.mode == 'replay':
+            return self._replay(target, request_key(target, request), label or target)
+        if self.mode != 'record':
+            return fn()
+
+        start = time.monotonic()
+        try:
+            result = fn()
+        except errors as e:
+            self._record(target, request, label, time.monotonic() - start, error=encode_error(e))
+            raise
+        self._record(target, request, label, time.monotonic() - start, response=encode_value(result))
+        return result
+
+    def _record(self, target, request, label, latency, response=None, error=None):
+        interaction = {
+            "target": target,
+            "key": request_key(target, request),
+            "label": label or target,
+            "latency": round(latency, 4),
+            "recorded_at": datetime.now().isoformat(timespec='seconds')
+        }
+        if error is not None:
+            interaction["error"] = error
+        else:
+            interaction["response"] = response
+        with self._lock:
+            self.interactions.append(interaction)
+            self.stats["recorded"] += 1
+            self._save()
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"version": 1, "interactions": self.interactions}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def _find(self, target, key, label):
+        unused = [i for i in range(len(self.interactions)) if i not in self._used]
+        for i in unused:
+            if self.interactions[i]["target"] == target and self.interactions[i]["key"] == key:
+                return i, False
+        for i in unused:
+            if self.interactions[i]["target"] == target and self.interactions[i]["label"] == label:
+                return i, True
+        # Everything for this request has been served; repeat the last exact match
+        for i in reversed(range(len(self.interactions))):
+            if self.interactions[i]["target"] == target and self.interactions[i]["key"] == key:
+                return i, False
+        return None, False
+
+    def _replay(self, target, key, label):
+        with self._lock:
+            index, fuzzy = self._find(target, key, label)
+            if index is None:
+                self.stats["misses"] += 1
+                raise CassetteMissError(f"No recorded {target} interaction for {label}")
+            self._used.add(index)
+            self.stats["replayed"] += 1
+            if fuzzy:
+                self.stats["fuzzy"] += 1
+            interaction = self.interactions[index]
+
+        if self.latency_scale > 0:
+            time.sleep(interaction["latency"] * self.latency_scale)
+        if "error" in interaction:
+            raise decode_error(interaction["error"])
+        return decode_value(interaction["response"])
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats, mode=self.mode, path=self.path, interactions=len(self.interactions))
+
+
+class CassetteProxy:
+    """Routes every method call on a wrapped API client through a cassette"""
+
+    def __init__(self, wrapped, target, cassette):
+        self._wrapped = wrapped
+        self._target = target
+        self._cassette = cassette
+
+    def __getattr__(self, name):
+        # Replays never build the real client, so every attribute is treated as a method
+        attr = getattr(self._wrapped, name) if self._wrapped is not None else None
+        if attr is not None and not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            return self._cassette.call(self._target, [name, list(args), kwargs],
+                                       lambda: attr(*args, **kwargs), label=name)
+        return call
+
+
+_cassette = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette():
+    """Process-wide cassette configured from CASSETTE_MODE / CASSETTE_PATH"""
+    global _cassette
+    if _cassette is None:
+        with _cassette_lock:
+            if _cassette is None:
+                _cassette = Cassette()
+    return _cassette
+
+
+def wrap_client(target, build_client):
+    """Build an API client, wrapped when recording or replaying
+
+    Replays skip build_client() entirely so no credentials are needed.
+    """
+    cassette = get_cassette()
+    if cassette.mode == 'replay':
+        return CassetteProxy(None, target, cassette)
+    client = build_client()
+    return CassetteProxy(client, target, cassette) if cassette.active else client
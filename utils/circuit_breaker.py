@@ -0,0 +1,117 @@
+import os
+import time
+import threading
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Per-model breaker that trips on consecutive failures or slow calls
+
+    Once open, calls are refused until the cool-down passes. Then one probe
+    is let through (half-open): success closes the breaker, failure re-opens it.
+    A probe that has not reported back within the probe timeout counts as a
+    failure, so a lost probe cannot hold the breaker half-open.
+    """
+
+    def __init__(self, name, failure_threshold=None, slow_call_threshold=None,
+                 latency_threshold=None, cooldown=None, probe_timeout=None):
+        self.name = name
+        self.failure_threshold = failure_threshold or int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '3'))
+        self.slow_call_threshold = slow_call_threshold or int(os.getenv('CIRCUIT_SLOW_CALL_THRESHOLD', '3'))
+        self.latency_threshold = latency_threshold or float(os.getenv('CIRCUIT_LATENCY_THRESHOLD', '45'))
+        self.cooldown = cooldown or float(os.getenv('CIRCUIT_COOLDOWN', '60'))
+        self.probe_timeout = probe_timeout or float(os.getenv('CIRCUIT_PROBE_TIMEOUT', str(self.cooldown)))
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.consecutive_slow_calls = 0
+        self.opened_at = None
+        self.trips = 0
+        self._probe_in_flight = False
+        self._probe_started = None
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.cooldown:
+                    return False
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            # Half-open: exactly one probe at a time
+            if self._probe_in_flight:
+                if time.monotonic() - self._probe_started < self.probe_timeout:
+                    return False
+                # The probe hung or was lost without reporting; treat it as failed
+                self._probe_in_flight = False
+                self._trip(f"probe unanswered for {self.probe_timeout:.0f}s")
+                return False
+            self._probe_in_flight = True
+            self._probe_started = time.monotonic()
+            return True
+
+    def record_success(self, latency=None):
+        with self._lock:
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+            if latency is not None and latency > self.latency_threshold:
+                self.consecutive_slow_calls += 1
+                if self.consecutive_slow_calls >= self.slow_call_threshold:
+                    self._trip(f"{self.consecutive_slow_calls} calls slower than {self.latency_threshold:.0f}s")
+                    return
+            else:
+                self.consecutive_slow_calls = 0
+            self.state = CLOSED
+
+    def release_probe(self):
+        """End a half-open probe that never reached the model (refused quota, cancelled) without judging it"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self._trip(f"{self.consecutive_failures} consecutive failures")
+
+    def _trip(self, reason):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.trips += 1
+        self.consecutive_slow_calls = 0
+        print(f"🔌 Circuit open for {self.name}: {reason} (cooling down {self.cooldown:.0f}s)")
+
+    def get_status(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "consecutive_slow_calls": self.consecutive_slow_calls,
+                "trips": self.trips
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(model):
+    """Process-wide breaker for a model"""
+    with _breakers_lock:
+        breaker = _breakers.get(model)
+        if breaker is None:
+            breaker = CircuitBreaker(model)
+            _breakers[model] = breaker
+        return breaker
+
+
+def get_breaker_status():
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {model: breaker.get_status() for model, breaker in breakers.items()}
@@ -0,0 +1,110 @@
+import os
+from datetime import datetime, timedelta
+from utils.database import TwitterDatabase
+
+# Slots are generated this far ahead of their posting time, but never before their own day starts
+CONTENT_BUFFER_HORIZON_HOURS = float(os.getenv('CONTENT_BUFFER_HORIZON_HOURS', '12'))
+# A draft older than this is discarded even if its slot is still ahead, so posts stay current
+CONTENT_BUFFER_MAX_AGE_HOURS = float(os.getenv('CONTENT_BUFFER_MAX_AGE_HOURS', '18'))
+# No new generation starts this close to a slot, so a long fill never delays a post
+CONTENT_BUFFER_QUIET_MINUTES = float(os.getenv('CONTENT_BUFFER_QUIET_MINUTES', '20'))
+# A post whose slot passed this long ago was missed (scheduler down) and is not posted late
+SLOT_GRACE = timedelta(hours=1)
+
+
+def content_buffer_enabled():
+    return os.getenv('CONTENT_BUFFER_ENABLED', '1').lower() not in ('0', 'false', 'no')
+
+
+class ContentBuffer:
+    """Approved posts generated ahead of time, keyed by calendar day and slot
+
+    A fill job writes posts for the upcoming slots into the content_buffer
+    table; the posting job takes the one for its slot and only has to post
+    it. Each post moves ready -> posting -> posted (or failed); drafts whose
+    slot has passed, that are older than the max age, or whose topic is no
+    longer the calendar's are marked expired and regenerated.
+    """
+
+    def __init__(self, slots, db=None, horizon_hours=None, max_age_hours=None):
+        self.slots = sorted(slots)
+        self.db = db or TwitterDatabase()
+        self.horizon = timedelta(hours=horizon_hours if horizon_hours is not None else CONTENT_BUFFER_HORIZON_HOURS)
+        self.max_age = timedelta(hours=max_age_hours if max_age_hours is not None else CONTENT_BUFFER_MAX_AGE_HOURS)
+
+    @staticmethod
+    def slot_time(slot_date, slot):
+        return datetime.strptime(f"{slot_date} {slot}", "%Y-%m-%d %H:%M")
+
+    def upcoming_slots(self, now=None):
+        """(slot_date, slot) pairs still ahead of now and within the horizon, soonest first
+
+        The horizon stops at midnight. Only today's calendar entry is known (the
+        strategy day advances with progress, not with the date), so a post
+        generated before midnight for tomorrow would carry today's topic and be
+        expired and paid for again once the day turns.
+        """
+        now = now or datetime.now()
+        today = now.date().isoformat()
+        end_of_day = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        end = min(now + self.horizon, end_of_day)
+        return [(today, slot) for slot in self.slots if now < self.slot_time(today, slot) <= end]
+
+    def minutes_to_next_slot(self, now=None):
+        now = now or datetime.now()
+        tomorrow = (now + timedelta(days=1)).date().isoformat()
+        times = [self.slot_time(day, slot) for day in (now.date().isoformat(), tomorrow) for slot in self.slots]
+        return min((t - now).total_seconds() / 60 for t in times if t > now)
+
+    def _stale_reason(self, post, now, topic, check_slot=True):
+        if check_slot and self.slot_time(post['slot_date'], post['slot']) + SLOT_GRACE < now:
+            return "slot passed"
+        if now - datetime.fromisoformat(str(post['created_at'])) > self.max_age:
+            return "too old"
+        if topic is not None and post['topic'] != topic:
+            return "calendar moved on"
+        return None
+
+    def expire(self, now=None, topic=None):
+        """Mark stale ready posts expired; returns how many"""
+        now = now or datetime.now()
+        expired = 0
+        for post in self.db.get_buffered_posts("ready"):
+            reason = self._stale_reason(post, now, topic)
+            if reason and self.db.update_buffered_post(post['id'], "expired", expected_status="ready"):
+                print(f"🗑️ Expired buffered post for {post['slot_date']} {post['slot']} ({reason})")
+                expired += 1
+        return expired
+
+    def missing_slots(self, now=None):
+        """Upcoming slots with nothing ready, posting or posted for them"""
+        filled = {(post['slot_date'], post['slot']) for post in self.db.get_buffered_posts()
+                  if post['status'] in ("ready", "posting", "posted")}
+        return [key for key in self.upcoming_slots(now) if key not in filled]
+
+    def put(self, slot_date, slot, approved):
+        post_id = self.db.save_buffered_post(dict(approved, slot_date=slot_date, slot=slot))
+        print(f"📥 Buffered post for {slot_date} {slot} ({approved['content_type']})")
+        return post_id
+
+    def take(self, slot_date, slot, topic=None, now=None):
+        """Claim the ready post for a slot, or None; a claimed post is not handed out twice"""
+        now = now or datetime.now()
+        for post in self.db.get_buffered_posts("ready"):
+            if (post['slot_date'], post['slot']) != (slot_date, slot):
+                continue
+            # Called at slot time, so only age and topic can make it stale
+            reason = self._stale_reason(post, now, topic, check_slot=False)
+            if reason:
+                self.db.update_buffered_post(post['id'], "expired", expected_status="ready")
+                print(f"🗑️ Buffered post for {slot_date} {slot} is stale ({reason})")
+                continue
+            if self.db.update_buffered_post(post['id'], "posting", expected_status="ready"):
+                return post
+        return None
+
+    def mark_posted(self, post_id, tweet_id=None):
+        self.db.update_buffered_post(post_id, "posted", tweet_id=tweet_id)
+
+    def mark_failed(self, post_id):
+        self.db.update_buffered_post(post_id, "failed")
@@ -5,7 +5,9 @@ from datetime import datetime
 from typing import Dict, List, Any
 
 class TwitterDatabase:
-    def __init__(self, db_path="data/twitter_data.db"):
+    def __init__(self, db_path=None):
+        # TWITTER_DB_PATH lets offline replays write to a scratch database
+        db_path = db_path or os.getenv('TWITTER_DB_PATH', 'data/twitter_data.db')
         self.db_path = db_path
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         self.init_database()
@@ -87,6 +89,107 @@ class TwitterDatabase:
             )
         """)
         
+        # LLM call telemetry table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS llm_calls (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TIMESTAMP,
+                agent TEXT,
+                model TEXT,
+                prompt_tokens INTEGER,
+                completion_tokens INTEGER,
+                cached_tokens INTEGER DEFAULT 0,
+                latency REAL,
+                ttft REAL,
+                status TEXT,
+                attempt INTEGER,
+                streamed BOOLEAN,
+                cost_usd REAL,
+                error TEXT
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_llm_calls_timestamp ON llm_calls (timestamp)")
+        
+        # Model routing decisions per pipeline stage, with the boss outcome filled in later
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS model_routing (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TIMESTAMP,
+                run_id TEXT,
+                attempt INTEGER,
+                agent TEXT,
+                content_type TEXT,
+                model TEXT,
+                reason TEXT,
+                prompt_tokens INTEGER,
+                latency REAL,
+                status TEXT,
+                approved BOOLEAN
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_model_routing_run ON model_routing (run_id, attempt)")
+        
+        # Create pipeline_stages table (wall time and tries of every stage-graph node)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pipeline_stages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TIMESTAMP,
+                run_id TEXT,
+                attempt INTEGER,
+                stage TEXT,
+                status TEXT,
+                wall_time REAL,
+                tries INTEGER,
+                error TEXT
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_pipeline_stages_run ON pipeline_stages (run_id, attempt)")
+        
+        # Create content_buffer table (approved posts generated ahead of their posting slot)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS content_buffer (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                slot_date TEXT,
+                slot TEXT,
+                content TEXT,
+                content_type TEXT,
+                topic TEXT,
+                theme TEXT,
+                attempts INTEGER,
+                run_id TEXT,
+                created_at TIMESTAMP,
+                status TEXT,
+                tweet_id TEXT,
+                updated_at TIMESTAMP
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_content_buffer_slot ON content_buffer (slot_date, slot, status)")
+        
+        # Create pipeline_runs and pipeline_checkpoints tables (resumable strategic pipeline runs)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pipeline_runs (
+                run_id TEXT PRIMARY KEY,
+                created_at TIMESTAMP,
+                updated_at TIMESTAMP,
+                daily_plan TEXT,
+                options TEXT,
+                status TEXT,
+                attempt INTEGER,
+                approved TEXT,
+                tweet_id TEXT
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pipeline_checkpoints (
+                run_id TEXT,
+                attempt INTEGER,
+                name TEXT,
+                value TEXT,
+                created_at TIMESTAMP,
+                PRIMARY KEY (run_id, attempt, name)
+            )
+        """)
+        
         conn.commit()
         conn.close()
     
@@ -235,3 +338,308 @@ class TwitterDatabase:
         
         conn.commit()
         conn.close()
+    
+    def save_llm_calls(self, calls: List[Dict]):
+        """Save a batch of LLM call telemetry rows in one transaction"""
+        if not calls:
+            return
+        
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        
+        cursor.executemany("""
+            INSERT INTO llm_calls 
+            (timestamp, agent, model, prompt_tokens, completion_tokens, cached_tokens, latency, ttft,
+             status, attempt, streamed, cost_usd, error)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(
+            call.get('timestamp'),
+            call.get('agent'),
+            call.get('model'),
+            call.get('prompt_tokens', 0),
+            call.get('completion_tokens', 0),
+            call.get('cached_tokens', 0),
+            call.get('latency'),
+            call.get('ttft'),
+            call.get('status'),
+            call.get('attempt', 1),
+            call.get('streamed', False),
+            call.get('cost_usd', 0),
+            call.get('error')
+        ) for call in calls])
+        
+        conn.commit()
+        conn.close()
+    
+    def get_llm_calls(self, since=None) -> List[Dict]:
+        """Get LLM call telemetry rows, optionally only those after a timestamp"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        if since:
+            cursor.execute("SELECT * FROM llm_calls WHERE timestamp >= ? ORDER BY timestamp", (since,))
+        else:
+            cursor.execute("SELECT * FROM llm_calls ORDER BY timestamp")
+        rows = [dict(row) for row in cursor.fetchall()]
+        
+        conn.close()
+        return rows
+    
+    def save_routing_decision(self, decision: Dict):
+        """Save one routed pipeline stage"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            INSERT INTO model_routing 
+            (timestamp, run_id, attempt, agent, content_type, model, reason, prompt_tokens, latency, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            decision.get('timestamp', datetime.now().isoformat(sep=' ')),
+            decision.get('run_id'),
+            decision.get('attempt', 1),
+            decision.get('agent'),
+            decision.get('content_type'),
+            decision.get('model'),
+            decision.get('reason'),
+            decision.get('prompt_tokens', 0),
+            decision.get('latency'),
+            decision.get('status', 'ok')
+        ))
+        
+        conn.commit()
+        conn.close()
+    
+    def update_routing_outcome(self, run_id: str, attempt: int, approved: bool):
+        """Record the boss verdict for every stage of one pipeline attempt"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            UPDATE model_routing 
+            SET approved = ? 
+            WHERE run_id = ? AND attempt = ?
+        """, (approved, run_id, attempt))
+        
+        conn.commit()
+        conn.close()
+    
+    def get_recent_approvals(self, agent: str, model: str, limit: int = 20) -> List[bool]:
+        """Boss verdicts for the latest attempts where an agent ran on a model, newest first"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT approved FROM model_routing 
+            WHERE agent = ? AND model = ? AND approved IS NOT NULL 
+            ORDER BY id DESC LIMIT ?
+        """, (agent, model, limit))
+        approvals = [bool(row[0]) for row in cursor.fetchall()]
+        
+        conn.close()
+        return approvals
+    
+    def save_stage_record(self, record: Dict):
+        """Save the timing of one pipeline stage"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            INSERT INTO pipeline_stages 
+            (timestamp, run_id, attempt, stage, status, wall_time, tries, error)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            record.get('started_at', datetime.now().isoformat(sep=' ')),
+            record.get('run_id'),
+            record.get('attempt', 1),
+            record.get('stage'),
+            record.get('status', 'ok'),
+            record.get('wall_time'),
+            record.get('tries', 1),
+            record.get('error')
+        ))
+        
+        conn.commit()
+        conn.close()
+    
+    def save_buffered_post(self, post: Dict) -> int:
+        """Queue an approved post for a posting slot; returns its id"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        
+        now = datetime.now().isoformat(sep=' ')
+        cursor.execute("""
+            INSERT INTO content_buffer 
+            (slot_date, slot, content, content_type, topic, theme, attempts, run_id, created_at, status, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            post.get('slot_date'),
+            post.get('slot'),
+            post.get('content'),
+            post.get('content_type'),
+            post.get('topic'),
+            post.get('theme'),
+            post.get('attempts', 1),
+            post.get('run_id'),
+            post.get('created_at', now),
+            post.get('status', 'ready'),
+            now
+        ))
+        post_id = cursor.lastrowid
+        
+        conn.commit()
+        conn.close()
+        return post_id
+    
+    def get_buffered_posts(self, status=None) -> List[Dict]:
+        """Buffered posts, optionally only those with one status, oldest slot first"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        if status:
+            cursor.execute("SELECT * FROM content_buffer WHERE status = ? ORDER BY slot_date, slot, id", (status,))
+        else:
+            cursor.execute("SELECT * FROM content_buffer ORDER BY slot_date, slot, id")
+        rows = [dict(row) for row in cursor.fetchall()]
+        
+        conn.close()
+        return rows
+    
+    def update_buffered_post(self, post_id: int, status: str, tweet_id: str = None, expected_status: str = None) -> bool:
+        """Move a buffered post to a new status; with expected_status, only if it is still in that one"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        
+        query = "UPDATE content_buffer SET status = ?, tweet_id = COALESCE(?, tweet_id), updated_at = ? WHERE id = ?"
+        params = [status, tweet_id, datetime.now().isoformat(sep=' '), post_id]
+        if expected_status:
+            query += " AND status = ?"
+            params.append(expected_status)
+        cursor.execute(query, params)
+        updated = cursor.rowcount > 0
+        
+        conn.commit()
+        conn.close()
+        return updated
+    
+    def save_pipeline_run(self, run: Dict):
+        """Create the durable record of a strategic pipeline run"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        
+        now = datetime.now().isoformat(sep=' ')
+        cursor.execute("""
+            INSERT OR REPLACE INTO pipeline_runs 
+            (run_id, created_at, updated_at, daily_plan, options, status, attempt)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (
+            run.get('run_id'),
+            now,
+            now,
+            run.get('daily_plan'),
+            run.get('options'),
+            run.get('status', 'running'),
+            run.get('attempt', 1)
+        ))
+        
+        conn.commit()
+        conn.close()
+    
+    def update_pipeline_run(self, run_id: str, **fields):
+        """Update status, attempt, approved or tweet_id of a pipeline run"""
+        columns = [name for name in ('status', 'attempt', 'approved', 'tweet_id') if name in fields]
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        
+        assignments = ", ".join(f"{name} = ?" for name in columns)
+        cursor.execute(f"UPDATE pipeline_runs SET {assignments}, updated_at = ? WHERE run_id = ?",
+                       [fields[name] for name in columns] + [datetime.now().isoformat(sep=' '), run_id])
+        
+        conn.commit()
+        conn.close()
+    
+    def get_pipeline_run(self, run_id: str):
+        """One pipeline run record, or None"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT * FROM pipeline_runs WHERE run_id = ?", (run_id,))
+        row = cursor.fetchone()
+        
+        conn.close()
+        return dict(row) if row else None
+    
+    def get_pipeline_runs(self, since=None, statuses=None) -> List[Dict]:
+        """Pipeline runs started after a timestamp, optionally only some statuses, newest first"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        query, params = "SELECT * FROM pipeline_runs WHERE created_at >= ?", [since or '']
+        if statuses:
+            query += f" AND status IN ({', '.join('?' for _ in statuses)})"
+            params += list(statuses)
+        cursor.execute(query + " ORDER BY created_at DESC", params)
+        rows = [dict(row) for row in cursor.fetchall()]
+        
+        conn.close()
+        return rows
+    
+    def save_checkpoint_values(self, run_id: str, attempt: int, values: Dict[str, str]):
+        """Store serialized stage-graph values for one attempt of a run"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        
+        now = datetime.now().isoformat(sep=' ')
+        cursor.executemany("""
+            INSERT OR REPLACE INTO pipeline_checkpoints (run_id, attempt, name, value, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        """, [(run_id, attempt, name, value, now) for name, value in values.items()])
+        
+        conn.commit()
+        conn.close()
+    
+    def get_checkpoint_values(self, run_id: str, attempt: int) -> Dict[str, str]:
+        """Serialized stage-graph values checkpointed for one attempt of a run"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT name, value FROM pipeline_checkpoints WHERE run_id = ? AND attempt = ?",
+                       (run_id, attempt))
+        values = dict(cursor.fetchall())
+        
+        conn.close()
+        return values
+    
+    def get_stage_history(self, since=None) -> List[Dict]:
+        """Get pipeline stage timings, optionally only those after a timestamp"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        if since:
+            cursor.execute("SELECT * FROM pipeline_stages WHERE timestamp >= ? ORDER BY id", (since,))
+        else:
+            cursor.execute("SELECT * FROM pipeline_stages ORDER BY id")
+        rows = [dict(row) for row in cursor.fetchall()]
+        
+        conn.close()
+        return rows
+    
+    def get_routing_history(self, since=None) -> List[Dict]:
+        """Get routing decisions, optionally only those after a timestamp"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        if since:
+            cursor.execute("SELECT * FROM model_routing WHERE timestamp >= ? ORDER BY id", (since,))
+        else:
+            cursor.execute("SELECT * FROM model_routing ORDER BY id")
+        rows = [dict(row) for row in cursor.fetchall()]
+        
+        conn.close()
+        return rows
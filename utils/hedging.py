@@ -0,0 +1,111 @@
+import os
+import threading
+from collections import deque
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies per model"""
+
+    def __init__(self, window=200):
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, model, latency):
+        with self._lock:
+            samples = self._samples.setdefault(model, deque(maxlen=self.window))
+            samples.append(latency)
+
+    def count(self, model):
+        with self._lock:
+            return len(self._samples.get(model, ()))
+
+    def percentile(self, model, pct):
+        with self._lock:
+            samples = sorted(self._samples.get(model, ()))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(pct / 100.0 * (len(samples) - 1))))
+        return samples[index]
+
+
+class HedgePolicy:
+    """Decides when to fire a duplicate request for a slow call
+
+    A hedge fires once the primary has run longer than the configured
+    percentile of recent latency for its model, as long as the share of
+    recent calls that hedged stays under max_hedge_rate.
+    """
+
+    def __init__(self, enabled=None, percentile=None, min_samples=None, max_hedge_rate=None,
+                 fallback_models=None, window=200):
+        if enabled is None:
+            enabled = os.getenv('OPENROUTER_HEDGE_ENABLED', '0').lower() in ('1', 'true', 'yes')
+        self.enabled = enabled
+        self.percentile = percentile or float(os.getenv('OPENROUTER_HEDGE_PERCENTILE', '95'))
+        self.min_samples = min_samples or int(os.getenv('OPENROUTER_HEDGE_MIN_SAMPLES', '20'))
+        self.max_hedge_rate = max_hedge_rate or float(os.getenv('OPENROUTER_HEDGE_MAX_RATE', '0.1'))
+        # Optional model to send the hedge to instead of repeating the primary
+        self.fallback_models = fallback_models if fallback_models is not None else self._fallbacks_from_env()
+
+        self.latency = LatencyTracker(window)
+        self._recent = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "hedges_fired": 0, "hedge_wins": 0, "primary_wins": 0, "hedges_capped": 0,
+                      "hedges_skipped_open": 0}
+
+    def _fallbacks_from_env(self):
+        # OPENROUTER_HEDGE_FALLBACKS="anthropic/claude-3.5-sonnet=anthropic/claude-3-haiku,..."
+        fallbacks = {}
+        for pair in os.getenv('OPENROUTER_HEDGE_FALLBACKS', '').split(','):
+            if '=' in pair:
+                primary, fallback = pair.split('=', 1)
+                fallbacks[primary.strip()] = fallback.strip()
+        return fallbacks
+
+    def hedge_delay(self, model):
+        """Seconds to wait before hedging, or None when there is no basis yet"""
+        if not self.enabled or self.latency.count(model) < self.min_samples:
+            return None
+        return self.latency.percentile(model, self.percentile)
+
+    def start_call(self):
+        with self._lock:
+            self.stats["calls"] += 1
+
+    def try_acquire_hedge(self):
+        """Reserve a hedge if it keeps the recent hedge rate under the cap"""
+        with self._lock:
+            hedged = sum(self._recent)
+            if self._recent and (hedged + 1) / (len(self._recent) + 1) > self.max_hedge_rate:
+                self.stats["hedges_capped"] += 1
+                self._recent.append(0)
+                return False
+            self._recent.append(1)
+            self.stats["hedges_fired"] += 1
+            return True
+
+    def record_skipped_open(self):
+        """A hedge was due but its model's circuit breaker refused it"""
+        with self._lock:
+            self.stats["hedges_skipped_open"] += 1
+            self._recent.append(0)
+
+    def record_unhedged(self):
+        with self._lock:
+            self._recent.append(0)
+
+    def record_winner(self, hedge_won):
+        with self._lock:
+            self.stats["hedge_wins" if hedge_won else "primary_wins"] += 1
+
+    def fallback_for(self, model):
+        return self.fallback_models.get(model, model)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        fired = stats["hedges_fired"]
+        stats["hedge_rate"] = fired / stats["calls"] if stats["calls"] else 0.0
+        stats["hedge_win_rate"] = stats["hedge_wins"] / fired if fired else 0.0
+        return stats
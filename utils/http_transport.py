@@ -0,0 +1,89 @@
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Connection pool sizing shared by every client in the process
+POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', '4'))
+POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '16'))
+
+# (connect, read) timeouts in seconds. Sonnet reviews are slower than Haiku drafts.
+DEFAULT_TIMEOUT = (5.0, 90.0)
+MODEL_TIMEOUTS = {
+    "anthropic/claude-3-haiku": (5.0, 60.0),
+    "anthropic/claude-3.5-sonnet": (5.0, 120.0),
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the process-wide keep-alive session (created on first use)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=POOL_CONNECTIONS,
+                    pool_maxsize=POOL_MAXSIZE,
+                    pool_block=False
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def get_timeout(model=None):
+    """Get the (connect, read) timeout for a model, honouring env overrides"""
+    connect, read = MODEL_TIMEOUTS.get(model, DEFAULT_TIMEOUT)
+    connect = float(os.getenv('HTTP_CONNECT_TIMEOUT', connect))
+    read = float(os.getenv('HTTP_READ_TIMEOUT', read))
+    return (connect, read)
+
+
+def get_transport_stats():
+    """Summarise connection reuse across every pooled host"""
+    stats = {"hosts": {}, "requests": 0, "new_connections": 0, "reused_connections": 0}
+    if _session is None:
+        return stats
+
+    seen = set()
+    for adapter in _session.adapters.values():
+        if id(adapter) in seen:
+            continue
+        seen.add(id(adapter))
+
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{pool.scheme}://{pool.host}"
+            requests_made = pool.num_requests
+            new_connections = pool.num_connections
+            stats["hosts"][host] = {
+                "requests": requests_made,
+                "new_connections": new_connections,
+                "reused_connections": max(0, requests_made - new_connections)
+            }
+            stats["requests"] += requests_made
+            stats["new_connections"] += new_connections
+
+    stats["reused_connections"] = max(0, stats["requests"] - stats["new_connections"])
+    stats["reuse_rate"] = (stats["reused_connections"] / stats["requests"]) if stats["requests"] else 0.0
+    return stats
+
+
+def close_session():
+    """Close the shared session and drop all pooled connections"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,190 @@
+import sqlite3
+import hashlib
+import json
+import os
+import time
+import threading
+from typing import Dict, Optional
+
+# Seconds a cached completion stays fresh, per agent. Research reuses the same
+# prompt for the whole calendar day; replies should almost never be reused.
+AGENT_TTLS = {
+    "research": 6 * 3600,
+    "writer": 3600,
+    "keyword": 3600,
+    "seo": 3600,
+    "keyword_seo": 3600,
+    "boss": 1800,
+    "response": 300,
+}
+DEFAULT_TTL = 3600
+
+
+def cache_enabled():
+    """The cache is opt-in via LLM_CACHE_ENABLED=1"""
+    return os.getenv('LLM_CACHE_ENABLED', '0').lower() in ('1', 'true', 'yes')
+
+
+def make_cache_key(model, messages, params):
+    """Content address for a completion request"""
+    payload = json.dumps(
+        {"model": model, "messages": messages, "params": params},
+        sort_keys=True, separators=(',', ':'), ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, db_path=None, max_entries=None):
+        self.db_path = db_path or os.getenv('LLM_CACHE_PATH', 'data/llm_cache.db')
+        self.max_entries = max_entries or int(os.getenv('LLM_CACHE_MAX_ENTRIES', '2000'))
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self.init_database()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def init_database(self):
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                cache_key TEXT PRIMARY KEY,
+                agent TEXT,
+                model TEXT,
+                response TEXT,
+                created_at REAL,
+                expires_at REAL,
+                last_accessed REAL,
+                hit_count INTEGER DEFAULT 0
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_lru ON llm_cache (last_accessed)")
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache_stats (
+                agent TEXT PRIMARY KEY,
+                hits INTEGER DEFAULT 0,
+                misses INTEGER DEFAULT 0,
+                evictions INTEGER DEFAULT 0
+            )
+        """)
+
+        conn.commit()
+        conn.close()
+
+    def get_ttl(self, agent):
+        return AGENT_TTLS.get(agent, DEFAULT_TTL)
+
+    def get(self, cache_key, agent=None) -> Optional[str]:
+        """Return a fresh cached response, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT response, expires_at FROM llm_cache WHERE cache_key = ?", (cache_key,))
+            row = cursor.fetchone()
+
+            if row and row[1] > now:
+                cursor.execute("""
+                    UPDATE llm_cache SET last_accessed = ?, hit_count = hit_count + 1
+                    WHERE cache_key = ?
+                """, (now, cache_key))
+                self._bump_stat(cursor, agent, 'hits')
+                response = row[0]
+            else:
+                if row:
+                    cursor.execute("DELETE FROM llm_cache WHERE cache_key = ?", (cache_key,))
+                self._bump_stat(cursor, agent, 'misses')
+                response = None
+
+            conn.commit()
+            conn.close()
+        return response
+
+    def set(self, cache_key, response, agent=None, model=None, ttl=None):
+        """Store a response and evict least-recently-used entries over the cap"""
+        now = time.time()
+        ttl = self.get_ttl(agent) if ttl is None else ttl
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                INSERT OR REPLACE INTO llm_cache
+                (cache_key, agent, model, response, created_at, expires_at, last_accessed, hit_count)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+            """, (cache_key, agent, model, response, now, now + ttl, now))
+
+            # Expired rows go first, then the least recently used beyond the cap
+            cursor.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+            cursor.execute("SELECT COUNT(*) FROM llm_cache")
+            overflow = cursor.fetchone()[0] - self.max_entries
+            if overflow > 0:
+                cursor.execute("""
+                    DELETE FROM llm_cache WHERE cache_key IN (
+                        SELECT cache_key FROM llm_cache ORDER BY last_accessed ASC LIMIT ?
+                    )
+                """, (overflow,))
+                self._bump_stat(cursor, agent, 'evictions', overflow)
+
+            conn.commit()
+            conn.close()
+
+    def _bump_stat(self, cursor, agent, column, amount=1):
+        cursor.execute("INSERT OR IGNORE INTO llm_cache_stats (agent) VALUES (?)", (agent or 'unknown',))
+        cursor.execute(f"UPDATE llm_cache_stats SET {column} = {column} + ? WHERE agent = ?",
+                       (amount, agent or 'unknown'))
+
+    def get_stats(self) -> Dict:
+        """Hit/miss statistics per agent plus overall totals"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute("SELECT agent, hits, misses, evictions FROM llm_cache_stats ORDER BY agent")
+        rows = cursor.fetchall()
+        cursor.execute("SELECT COUNT(*) FROM llm_cache")
+        entries = cursor.fetchone()[0]
+        conn.close()
+
+        stats = {"agents": {}, "hits": 0, "misses": 0, "evictions": 0, "entries": entries}
+        for agent, hits, misses, evictions in rows:
+            lookups = hits + misses
+            stats["agents"][agent] = {
+                "hits": hits,
+                "misses": misses,
+                "evictions": evictions,
+                "hit_rate": hits / lookups if lookups else 0.0
+            }
+            stats["hits"] += hits
+            stats["misses"] += misses
+            stats["evictions"] += evictions
+
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def clear(self):
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM llm_cache")
+        conn.commit()
+        conn.close()
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache():
+    """Process-wide cache instance, or None when caching is disabled"""
+    global _shared_cache
+    if not cache_enabled():
+        return None
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = LLMCache()
+    return _shared_cache
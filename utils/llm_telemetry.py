@@ -0,0 +1,89 @@
+import os
+import time
+import atexit
+import threading
+from datetime import datetime
+from utils.database import TwitterDatabase
+from config.generation_profiles import get_pricing, CACHE_READ_PRICE_FACTOR
+
+
+def telemetry_enabled():
+    return os.getenv('LLM_TELEMETRY_ENABLED', '1').lower() not in ('0', 'false', 'no')
+
+
+def estimate_cost(model, prompt_tokens, completion_tokens, cached_tokens=0):
+    """USD for one call; prompt tokens served from the provider's prompt cache are billed at a discount"""
+    pricing = get_pricing(model)
+    cached_tokens = min(cached_tokens or 0, prompt_tokens or 0)
+    input_cost = ((prompt_tokens or 0) - cached_tokens + cached_tokens * CACHE_READ_PRICE_FACTOR) * pricing["input"]
+    return (input_cost + (completion_tokens or 0) * pricing["output"]) / 1_000_000
+
+
+class LLMTelemetry:
+    """Buffers one row per OpenRouter HTTP call and writes them in batches
+
+    Rows go to the llm_calls table (the main Twitter database by default, or a
+    sidecar DB via LLM_TELEMETRY_DB). A batch is flushed when it reaches
+    batch_size rows, when flush_interval seconds have passed since the last
+    flush, and at interpreter exit.
+    """
+
+    def __init__(self, db_path=None, batch_size=None, flush_interval=None):
+        self.db = TwitterDatabase(db_path or os.getenv('LLM_TELEMETRY_DB'))
+        self.batch_size = batch_size or int(os.getenv('LLM_TELEMETRY_BATCH_SIZE', '20'))
+        self.flush_interval = flush_interval or float(os.getenv('LLM_TELEMETRY_FLUSH_INTERVAL', '30'))
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        atexit.register(self.flush)
+
+    def record(self, agent, model, status, latency, ttft=None, prompt_tokens=0, completion_tokens=0,
+               cached_tokens=0, attempt=1, streamed=False, error=None):
+        row = {
+            'timestamp': datetime.now().isoformat(sep=' '),
+            'agent': agent or 'unknown',
+            'model': model,
+            'prompt_tokens': prompt_tokens or 0,
+            'completion_tokens': completion_tokens or 0,
+            'cached_tokens': cached_tokens or 0,
+            'latency': latency,
+            'ttft': ttft,
+            'status': status,
+            'attempt': attempt,
+            'streamed': streamed,
+            'cost_usd': estimate_cost(model, prompt_tokens, completion_tokens, cached_tokens),
+            'error': str(error)[:500] if error else None
+        }
+        with self._lock:
+            self._buffer.append(row)
+            due = (len(self._buffer) >= self.batch_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+        if not batch:
+            return
+        try:
+            self.db.save_llm_calls(batch)
+        except Exception as e:
+            print(f"⚠️ Could not write {len(batch)} LLM telemetry rows: {e}")
+
+
+_telemetry = None
+_telemetry_lock = threading.Lock()
+
+
+def get_telemetry():
+    """Process-wide telemetry writer, or None when disabled"""
+    global _telemetry
+    if not telemetry_enabled():
+        return None
+    if _telemetry is None:
+        with _telemetry_lock:
+            if _telemetry is None:
+                _telemetry = LLMTelemetry()
+    return _telemetry
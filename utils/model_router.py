@@ -0,0 +1,106 @@
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from utils.database import TwitterDatabase
+from config.generation_profiles import HAIKU_MODEL, SONNET_MODEL, get_profile
+
+# Pipeline stages whose model is chosen per call; the boss always reviews on its profile model
+ROUTED_AGENTS = ("research", "writer", "keyword", "seo", "keyword_seo")
+
+
+def _env_set(name, default):
+    return {item.strip() for item in os.getenv(name, default).split(',') if item.strip()}
+
+
+class ModelRouter:
+    """Picks the model for each pipeline stage from cheap signals
+
+    First drafts go to the fast model. A stage moves to the strong model when
+    the attempt follows a rejection, the content type is known to be hard, the
+    prompt is long, or the fast model's recent approval rate for that stage
+    has dropped. Every decision is logged to the model_routing table with its
+    latency, and the boss verdict is attached afterwards so the policy can be
+    tuned on latency per approved tweet (python3 llm_report.py routing).
+    """
+
+    def __init__(self, db=None, fast_model=None, strong_model=None):
+        self.db = db or TwitterDatabase()
+        self.enabled = os.getenv('MODEL_ROUTER_ENABLED', '1').lower() not in ('0', 'false', 'no')
+        self.fast_model = fast_model or os.getenv('ROUTER_FAST_MODEL', HAIKU_MODEL)
+        self.strong_model = strong_model or os.getenv('ROUTER_STRONG_MODEL', SONNET_MODEL)
+        # Threads pack several tweets into one draft and are rejected more often
+        self.hard_content_types = _env_set('ROUTER_HARD_CONTENT_TYPES', 'education_explainer')
+        self.long_prompt_tokens = int(os.getenv('ROUTER_LONG_PROMPT_TOKENS', '2000'))
+        self.approval_window = int(os.getenv('ROUTER_APPROVAL_WINDOW', '20'))
+        self.min_samples = int(os.getenv('ROUTER_MIN_SAMPLES', '5'))
+        self.min_approval_rate = float(os.getenv('ROUTER_MIN_APPROVAL_RATE', '0.5'))
+
+    def start_run(self):
+        """Id tying together every stage and attempt of one pipeline run"""
+        return uuid.uuid4().hex[:12]
+
+    def approval_rate(self, agent, model):
+        """(rate, samples) over the latest boss verdicts for this stage on this model"""
+        try:
+            approvals = self.db.get_recent_approvals(agent, model, self.approval_window)
+        except Exception as e:
+            print(f"⚠️ Could not read routing history: {e}")
+            return None, 0
+        if not approvals:
+            return None, 0
+        return sum(approvals) / len(approvals), len(approvals)
+
+    def route(self, agent, attempt=1, content_type=None, prompt_tokens=0):
+        """Decide the model for one stage call; returns {"model", "reason"}"""
+        if agent not in ROUTED_AGENTS:
+            return {"model": get_profile(agent)["model"], "reason": "not routed"}
+        if not self.enabled:
+            return {"model": get_profile(agent)["model"], "reason": "router disabled"}
+
+        if attempt > 1:
+            return {"model": self.strong_model, "reason": f"escalated on retry (attempt {attempt})"}
+        if content_type in self.hard_content_types:
+            return {"model": self.strong_model, "reason": f"hard content type {content_type}"}
+        if prompt_tokens > self.long_prompt_tokens:
+            return {"model": self.strong_model, "reason": f"long prompt (~{prompt_tokens} tokens)"}
+
+        rate, samples = self.approval_rate(agent, self.fast_model)
+        if samples >= self.min_samples and rate < self.min_approval_rate:
+            return {"model": self.strong_model,
+                    "reason": f"fast model approval {rate:.0%} over last {samples} < {self.min_approval_rate:.0%}"}
+        return {"model": self.fast_model, "reason": "easy first draft"}
+
+    @contextmanager
+    def stage(self, run_id, agent, attempt=1, content_type=None, prompt_tokens=0):
+        """Route a stage, yield its model, then log the decision with the stage latency
+
+            with router.stage(run_id, "writer", attempt, content_type) as model:
+                writer_data = writer_agent.create_content(research_data, model=model)
+        """
+        decision = self.route(agent, attempt, content_type, prompt_tokens)
+        print(f"🧭 [{agent}] attempt {attempt} -> {decision['model']} ({decision['reason']})")
+        start = time.monotonic()
+        status = "ok"
+        try:
+            yield decision["model"]
+        except Exception as e:
+            status = type(e).__name__
+            raise
+        finally:
+            self._log(dict(decision, run_id=run_id, agent=agent, attempt=attempt, content_type=content_type,
+                           prompt_tokens=prompt_tokens, latency=time.monotonic() - start, status=status))
+
+    def record_outcome(self, run_id, attempt, approved):
+        """Attach the boss verdict to every stage of this attempt"""
+        try:
+            self.db.update_routing_outcome(run_id, attempt, approved)
+        except Exception as e:
+            print(f"⚠️ Could not record routing outcome: {e}")
+
+    def _log(self, decision):
+        # Routing telemetry must never break the pipeline
+        try:
+            self.db.save_routing_decision(decision)
+        except Exception as e:
+            print(f"⚠️ Could not log routing decision: {e}")
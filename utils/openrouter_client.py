@@ -1,33 +1,702 @@
 import requests
 import json
 import os
+import asyncio
+import time
+import weakref
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from utils.http_transport import get_session, get_timeout, get_transport_stats
+from utils.llm_cache import get_shared_cache, make_cache_key
+from utils.singleflight import SingleFlight
+from utils.hedging import HedgePolicy
+from utils.circuit_breaker import get_breaker, get_breaker_status
+from utils.retry import RetryEngine, parse_retry_after, retry_metrics, current_attempt
+from utils.prompt_budget import estimate_tokens, estimate_messages_tokens, get_prompt_budget
+from utils.llm_telemetry import get_telemetry, estimate_cost
+from utils.cassette import get_cassette
+from utils.rate_limiter import get_rate_limiter, RateLimitExceeded
+from utils.structured_output import response_format, parse_structured, json_object_complete, schema_prompt
+from config.generation_profiles import get_profile, REPAIR_MODEL
 
 load_dotenv()
 
+# Point at a local stub (openrouter_stub.py) or a proxy instead of the real API
+OPENROUTER_BASE_URL = os.getenv('OPENROUTER_BASE_URL', 'https://openrouter.ai/api/v1')
+
+# Mark static system prompts for provider-side prompt caching (profiles opt in)
+PROMPT_CACHE_ENABLED = os.getenv('OPENROUTER_PROMPT_CACHE', '1').lower() not in ('0', 'false', 'no')
+
+# Anthropic ignores cache_control on a prefix shorter than this many tokens
+PROMPT_CACHE_MIN_TOKENS = 1024
+PROMPT_CACHE_MIN_TOKENS_HAIKU = 2048
+
+
+def prompt_cache_minimum(model):
+    return PROMPT_CACHE_MIN_TOKENS_HAIKU if "haiku" in model else PROMPT_CACHE_MIN_TOKENS
+
+# Upper bound on completions in flight across the whole process
+MAX_CONCURRENCY = int(os.getenv('OPENROUTER_MAX_CONCURRENCY', '8'))
+
+# Blocking HTTP calls run here so an event loop can keep many completions in flight
+_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix="openrouter")
+
+# Identical requests already in flight anywhere in the process share one call
+_singleflight = SingleFlight()
+
+# Tail-latency hedging, off unless OPENROUTER_HEDGE_ENABLED=1
+hedge_policy = HedgePolicy()
+
+# asyncio primitives are bound to a loop, so keep one limiter per running loop
+_async_limiters = weakref.WeakKeyDictionary()
+
+# Structured outputs that validated first time, needed a repair call, or failed both
+_structured_stats = {"valid": 0, "repaired": 0, "failed": 0}
+_structured_lock = threading.Lock()
+
+
+class OpenRouterError(Exception):
+    """Base class for completion failures"""
+
+    def __init__(self, message, model=None):
+        super().__init__(message)
+        self.model = model
+
+
+class OpenRouterAPIError(OpenRouterError):
+    """OpenRouter answered with an error or an unusable body"""
+
+    def __init__(self, message, model=None, status_code=None, retry_after=None):
+        super().__init__(message, model)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class OpenRouterTimeoutError(OpenRouterError):
+    """The request timed out"""
+
+
+class OpenRouterConnectionError(OpenRouterError):
+    """The request never got a response"""
+
+
+class CircuitOpenError(OpenRouterError):
+    """The model's circuit breaker is refusing calls"""
+
+
+class OpenRouterRateLimitError(OpenRouterError):
+    """This caller's share of the API key's quota is exhausted; every model on the key is affected"""
+
+    def __init__(self, message, model=None, wait=None):
+        super().__init__(message, model)
+        self.wait = wait
+
+
+class StructuredOutputError(OpenRouterError):
+    """Output did not match the requested JSON schema, even after a repair call"""
+
+    def __init__(self, message, model=None, errors=None, output=None):
+        super().__init__(message, model)
+        self.errors = errors or []
+        self.output = output
+
+
+class AllModelsFailedError(OpenRouterError):
+    """Every model in the fallback chain failed or was unavailable"""
+
+    def __init__(self, message, errors):
+        super().__init__(message)
+        self.errors = errors
+
+
+# 429/5xx, timeouts and dropped connections are retried per model before falling back
+_retry = RetryEngine("openrouter", retry_on=(OpenRouterTimeoutError, OpenRouterConnectionError))
+
+
+def get_async_limiter():
+    """Get the shared semaphore for the running event loop"""
+    loop = asyncio.get_running_loop()
+    limiter = _async_limiters.get(loop)
+    if limiter is None:
+        limiter = asyncio.Semaphore(MAX_CONCURRENCY)
+        _async_limiters[loop] = limiter
+    return limiter
+
+
+def run_sync(coro):
+    """Run a coroutine to completion from synchronous code"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    # Called from inside a running loop: drive the coroutine on a helper thread
+    with ThreadPoolExecutor(max_workers=1) as helper:
+        # Copy the context so the priority class and retry attempt carry over
+        return helper.submit(contextvars.copy_context().run, asyncio.run, coro).result()
+
+
 class OpenRouterClient:
-    def __init__(self):
+    def __init__(self, agent_name=None, fallback_models=None):
         self.api_key = os.getenv('OPENROUTER_API_KEY')
-        self.base_url = "https://openrouter.ai/api/v1/chat/completions"
-        
-    def chat_completion(self, messages, model="anthropic/claude-3-haiku"):
-        headers = {
+        self.base_url = f"{OPENROUTER_BASE_URL.rstrip('/')}/chat/completions"
+        self.agent_name = agent_name
+        # Sampling settings and fallback chain come from the agent's generation profile
+        self.profile = get_profile(agent_name)
+        # Tried in order after the requested model fails or its circuit is open
+        if fallback_models is None:
+            fallback_models = self.profile["fallback_models"]
+        self.fallback_models = list(fallback_models)
+        # Every agent builds its own client, so they all share one pooled session
+        self.session = get_session()
+        # Opt-in response cache (LLM_CACHE_ENABLED=1)
+        self.cache = get_shared_cache()
+        # Timing of the most recent call made through this client
+        self.last_call_stats = {}
+        # Running totals for successful calls made through this client
+        self.usage = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "latency": 0.0, "cost": 0.0}
+
+    def chat_completion(self, messages, model=None, use_cache=True, dedupe=True, response_format=None):
+        """Blocking wrapper around achat_completion"""
+        return run_sync(self.achat_completion(messages, model, use_cache=use_cache, dedupe=dedupe,
+                                              response_format=response_format))
+
+    async def achat_completion(self, messages, model=None, use_cache=True, dedupe=True, response_format=None):
+        """Get a completion without blocking the event loop
+
+        Pass use_cache=False when the caller needs a fresh generation, and
+        dedupe=False when identical concurrent prompts should yield
+        independent samples. Raises AllModelsFailedError when the whole
+        fallback chain fails.
+        """
+        model = model or self.profile["model"]
+        params = self._sampling_params(response_format)
+        self._log_prompt_size(messages, model)
+        request_key = make_cache_key(model, messages, params)
+        use_cache = self.cache is not None and use_cache
+
+        if use_cache:
+            cached = self.cache.get(request_key, self.agent_name)
+            if cached is not None:
+                return cached
+
+        if dedupe:
+            content = await _singleflight.do(
+                request_key, lambda: self._with_fallbacks(self._fetch_completion, messages, model, params)
+            )
+        else:
+            content = await self._with_fallbacks(self._fetch_completion, messages, model, params)
+
+        if use_cache:
+            self.cache.set(request_key, content, agent=self.agent_name, model=model)
+        return content
+
+    def chat_completion_many(self, requests, max_concurrency=None, use_cache=True, dedupe=True):
+        """Blocking wrapper around achat_completion_many"""
+        return run_sync(self.achat_completion_many(
+            requests, max_concurrency=max_concurrency, use_cache=use_cache, dedupe=dedupe
+        ))
+
+    async def achat_completion_many(self, requests, max_concurrency=None, use_cache=True, dedupe=True):
+        """Run a batch of completions concurrently, at most max_concurrency at a time
+
+        Each request is a messages list, or a dict with "messages" and an
+        optional "model". Returns one dict per request, in the same order:
+        {"index", "model", "content", "error", "latency"}. A failed item has
+        content None and the exception in "error"; the rest of the batch
+        still completes.
+        """
+        # The process-wide limiter still applies; this only caps this batch's share of it
+        batch_limiter = asyncio.Semaphore(max_concurrency or MAX_CONCURRENCY)
+
+        async def run_one(index, request):
+            if isinstance(request, dict):
+                messages, model = request["messages"], request.get("model")
+            else:
+                messages, model = request, None
+            result = {"index": index, "model": model or self.profile["model"],
+                      "content": None, "error": None, "latency": 0.0}
+            async with batch_limiter:
+                start = time.monotonic()
+                try:
+                    result["content"] = await self.achat_completion(
+                        messages, model, use_cache=use_cache, dedupe=dedupe
+                    )
+                except Exception as e:
+                    result["error"] = e
+                result["latency"] = time.monotonic() - start
+            return result
+
+        start = time.monotonic()
+        results = await asyncio.gather(*(run_one(i, r) for i, r in enumerate(requests)))
+        failed = sum(1 for r in results if r["error"] is not None)
+        print(f"📦 [{self.agent_name or 'client'}] {len(results)} completions in "
+              f"{time.monotonic() - start:.1f}s ({failed} failed)")
+        return results
+
+    def chat_completion_json(self, messages, schema, name, model=None, check=None, stream=False, use_cache=True):
+        """Blocking wrapper around achat_completion_json"""
+        return run_sync(self.achat_completion_json(messages, schema, name, model, check=check,
+                                                   stream=stream, use_cache=use_cache))
+
+    async def achat_completion_json(self, messages, schema, name, model=None, check=None, stream=False,
+                                    use_cache=True):
+        """Get a completion constrained to a JSON schema and validated locally
+
+        The provider is asked for schema-constrained output, but models that
+        ignore response_format still get parsed and validated here. Invalid
+        output gets one repair call on the cheap REPAIR_MODEL, which fixes the
+        format without regenerating the content. check(data) may return extra
+        errors the schema cannot express. Returns the parsed object; raises
+        StructuredOutputError if the repair is invalid too.
+        """
+        model = model or self.profile["model"]
+        output_format = response_format(name, schema)
+        if stream:
+            # Hang up as soon as the object closes
+            text = await self.achat_completion_stream(messages, model, on_text=json_object_complete,
+                                                      response_format=output_format)
+        else:
+            text = await self.achat_completion(messages, model, use_cache=use_cache,
+                                               response_format=output_format)
+        data, errors = parse_structured(text, schema, check)
+        if not errors:
+            self._count_structured("valid")
+            return data
+
+        print(f"🩹 [{self.agent_name or 'client'}] {name} output invalid ({errors[0]}), "
+              f"repairing with {REPAIR_MODEL}")
+        repaired = await self.achat_completion(self._repair_messages(text, schema, errors), REPAIR_MODEL,
+                                               use_cache=False, response_format=output_format)
+        data, repair_errors = parse_structured(repaired, schema, check)
+        if repair_errors:
+            self._count_structured("failed")
+            raise StructuredOutputError(f"{name} output invalid after repair: {'; '.join(repair_errors)}",
+                                        model, repair_errors, repaired)
+        self._count_structured("repaired")
+        return data
+
+    @staticmethod
+    def _repair_messages(text, schema, errors):
+        return [
+            {
+                "role": "system",
+                "content": "You fix malformed JSON. Keep the meaning and wording of the original output; "
+                           "only change its structure. Reply with a single JSON object matching this schema "
+                           f"and nothing else:\n{schema_prompt(schema)}"
+            },
+            {
+                "role": "user",
+                "content": "Problems: " + "; ".join(errors) + f"\n\nOutput to fix:\n{text}"
+            }
+        ]
+
+    @staticmethod
+    def _count_structured(outcome):
+        with _structured_lock:
+            _structured_stats[outcome] += 1
+
+    def chat_completion_stream(self, messages, model=None, on_text=None, response_format=None):
+        """Blocking wrapper around achat_completion_stream"""
+        return run_sync(self.achat_completion_stream(messages, model, on_text=on_text,
+                                                     response_format=response_format))
+
+    async def achat_completion_stream(self, messages, model=None, on_text=None, response_format=None):
+        """Stream a completion over SSE, optionally stopping early
+
+        on_text(text_so_far) is called after every chunk; returning True aborts
+        the stream and the text received so far is returned. Streamed calls skip
+        the cache and deduplication since callers may stop at different points.
+        """
+        model = model or self.profile["model"]
+        params = self._sampling_params(response_format)
+        self._log_prompt_size(messages, model)
+
+        async def stream_once(messages, candidate, params):
+            return await _retry.acall(
+                lambda: self._call_model(self._post_stream, messages, candidate, params, on_text)
+            )
+
+        return await self._with_fallbacks(stream_once, messages, model, params)
+
+    def _log_prompt_size(self, messages, model):
+        tokens = estimate_messages_tokens(messages)
+        budget = get_prompt_budget(self.agent_name)
+        flag = " ⚠️ over budget" if tokens > budget else ""
+        print(f"🧮 [{self.agent_name or 'client'}] {model}: ~{tokens} prompt tokens (budget {budget}){flag}")
+        return tokens
+
+    def _model_chain(self, model):
+        chain = [model]
+        for fallback in self.fallback_models:
+            if fallback not in chain:
+                chain.append(fallback)
+        return chain
+
+    async def _with_fallbacks(self, fetch, messages, model, params):
+        """Try each model in the chain, skipping any whose circuit is open"""
+        errors = []
+        for candidate in self._model_chain(model):
+            if not get_breaker(candidate).allow_request():
+                errors.append(CircuitOpenError(f"Circuit open for {candidate}", candidate))
+                continue
+            try:
+                return await fetch(messages, candidate, params)
+            except OpenRouterRateLimitError:
+                # The quota belongs to the key, so the next model would be refused too
+                raise
+            except OpenRouterError as e:
+                errors.append(e)
+                print(f"⚠️ {candidate} failed ({e}), trying next model")
+
+        summary = "; ".join(f"{e.model}: {e}" for e in errors)
+        raise AllModelsFailedError(f"All models failed for {self.agent_name or 'client'}: {summary}", errors)
+
+    async def _fetch_completion(self, messages, model, params):
+        """Fetch a completion, hedging with a duplicate request if it runs slow"""
+        hedge_policy.start_call()
+        delay = hedge_policy.hedge_delay(model)
+        if delay is None:
+            hedge_policy.record_unhedged()
+            return await self._fetch_once(messages, model, params)
+
+        primary = asyncio.ensure_future(self._fetch_once(messages, model, params))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            hedge_policy.record_unhedged()
+            return await primary
+
+        hedge_model = hedge_policy.fallback_for(model)
+        hedge_breaker = get_breaker(hedge_model)
+        # A hedge to a model whose circuit is open would only fail, and add load to a struggling provider
+        if not hedge_breaker.allow_request():
+            hedge_policy.record_skipped_open()
+            return await primary
+        if not hedge_policy.try_acquire_hedge():
+            hedge_breaker.release_probe()
+            return await primary
+
+        print(f"⏱️ {model} slower than {delay:.1f}s, hedging with {hedge_model}")
+        hedge = asyncio.ensure_future(self._fetch_once(messages, hedge_model, params))
+
+        pending = {primary, hedge}
+        last_error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            finished = done.pop()
+            # Take the first usable answer; only wait on the other if this one failed
+            try:
+                content = finished.result()
+            except OpenRouterError as e:
+                last_error = e
+                continue
+            hedge_policy.record_winner(hedge_won=finished is hedge)
+            for task in pending:
+                # The HTTP call keeps running on its worker thread; its result is discarded
+                task.cancel()
+            return content
+
+        raise last_error
+
+    async def _fetch_once(self, messages, model, params):
+        start = time.monotonic()
+        content = await _retry.acall(
+            lambda: self._call_model(self._post_completion, messages, model, params)
+        )
+        hedge_policy.latency.record(model, time.monotonic() - start)
+        return content
+
+    async def _call_model(self, post, messages, model, *args):
+        """Run one blocking HTTP call under the limiters, feed the model's breaker and record telemetry"""
+        breaker = get_breaker(model)
+        # The first attempt was admitted by _with_fallbacks or the hedge check; a retry asks again,
+        # so a circuit that opened during the retries (say a failed half-open probe) stops them
+        if current_attempt.get() > 1 and not breaker.allow_request():
+            raise CircuitOpenError(f"Circuit open for {model}", model)
+        judged = False
+        try:
+            # Quota is shared with every other process using this key; wait outside the
+            # concurrency limiter so a queued call does not hold a slot
+            reserved_tokens = estimate_messages_tokens(messages) + args[0].get("max_tokens", 0)
+            rate_limiter = get_rate_limiter()
+            try:
+                await rate_limiter.aacquire("openrouter", self.api_key, reserved_tokens)
+            except RateLimitExceeded as e:
+                raise OpenRouterRateLimitError(str(e), model, e.wait) from e
+            async with get_async_limiter():
+                loop = asyncio.get_running_loop()
+                start = time.monotonic()
+                try:
+                    content, stats = await loop.run_in_executor(
+                        _executor, self._recorded_post, post, messages, model, *args
+                    )
+                except OpenRouterError as e:
+                    judged = True
+                    breaker.record_failure()
+                    self._record_call(model, messages, {
+                        "streamed": post == self._post_stream,
+                        "latency": time.monotonic() - start
+                    }, status=type(e).__name__, error=e)
+                    raise
+            judged = True
+            breaker.record_success(stats["latency"])
+        finally:
+            # Refused by the rate limiter or cancelled (a hedge won): the model was never judged,
+            # so a half-open probe must not stay claimed or the breaker never closes again
+            if not judged:
+                breaker.release_probe()
+        if stats.get("prompt_tokens") is not None:
+            rate_limiter.refund("openrouter", self.api_key,
+                                reserved_tokens - stats["prompt_tokens"] - (stats.get("completion_tokens") or 0))
+        self.last_call_stats = stats
+        self._add_usage(model, messages, stats)
+        self._record_call(model, messages, stats, status="aborted" if stats.get("aborted") else "ok")
+        return content
+
+    def _recorded_post(self, post, messages, model, params, *args):
+        """Send the request, or serve it from the cassette when recording/replaying"""
+        request = [post.__name__, make_cache_key(model, messages, params)]
+        return get_cassette().call("openrouter", request, lambda: post(messages, model, params, *args),
+                                   label=f"{self.agent_name or 'client'}:{model}", errors=(OpenRouterError,))
+
+    def _add_usage(self, model, messages, stats):
+        prompt_tokens = stats.get("prompt_tokens")
+        if prompt_tokens is None:
+            prompt_tokens = estimate_messages_tokens(messages)
+        completion_tokens = stats.get("completion_tokens") or 0
+        self.usage["calls"] += 1
+        self.usage["prompt_tokens"] += prompt_tokens
+        self.usage["completion_tokens"] += completion_tokens
+        self.usage["latency"] += stats.get("latency") or 0.0
+        # Priced per call, since routing and fallbacks change the model from call to call
+        self.usage["cost"] += estimate_cost(model, prompt_tokens, completion_tokens, stats.get("cached_tokens"))
+
+    def _record_call(self, model, messages, stats, status, error=None):
+        telemetry = get_telemetry()
+        if telemetry is None:
+            return
+        # Prefer OpenRouter's usage block; estimate locally when it is missing
+        prompt_tokens = stats.get("prompt_tokens")
+        if prompt_tokens is None:
+            prompt_tokens = estimate_messages_tokens(messages)
+        telemetry.record(
+            agent=self.agent_name,
+            model=model,
+            status=status,
+            latency=stats.get("latency"),
+            ttft=stats.get("ttft"),
+            prompt_tokens=prompt_tokens,
+            completion_tokens=stats.get("completion_tokens") or 0,
+            cached_tokens=stats.get("cached_tokens") or 0,
+            attempt=current_attempt.get(),
+            streamed=stats.get("streamed", False),
+            error=error
+        )
+
+    @staticmethod
+    def _usage_stats(usage):
+        """Token counts from an OpenRouter usage block"""
+        if not usage:
+            return {}
+        details = usage.get('prompt_tokens_details') or {}
+        return {
+            "prompt_tokens": usage.get('prompt_tokens'),
+            "completion_tokens": usage.get('completion_tokens'),
+            "cached_tokens": details.get('cached_tokens') or 0
+        }
+
+    def _sampling_params(self, response_format=None):
+        params = {
+            "max_tokens": self.profile["max_tokens"],
+            "temperature": self.profile["temperature"]
+        }
+        if self.profile.get("stop"):
+            params["stop"] = list(self.profile["stop"])
+        if response_format:
+            params["response_format"] = response_format
+        return params
+
+    def _wire_messages(self, messages, model):
+        """Messages as sent: the leading system prompt carries a cache breakpoint when enabled
+
+        Anthropic models on OpenRouter cache everything up to a cache_control
+        marker. Agents keep that system prompt byte-identical across calls, so
+        repeats within the cache lifetime are billed and processed as cache reads.
+        A prompt below the model's minimum cacheable length is sent unmarked,
+        since the provider would ignore the marker.
+        """
+        if not (PROMPT_CACHE_ENABLED and self.profile.get("prompt_cache") and model.startswith("anthropic/")):
+            return messages
+        if not messages or messages[0].get("role") != "system" or not isinstance(messages[0].get("content"), str):
+            return messages
+        if estimate_tokens(messages[0]["content"]) < prompt_cache_minimum(model):
+            return messages
+        system = dict(messages[0], content=[{
+            "type": "text",
+            "text": messages[0]["content"],
+            "cache_control": {"type": "ephemeral"}
+        }])
+        return [system] + list(messages[1:])
+
+    def _headers(self):
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
-        
+
+    def _api_error(self, response, error, model):
+        # OpenRouter can report upstream failures inside a 200 body with their own code
+        status_code = response.status_code
+        if isinstance(error, dict) and isinstance(error.get('code'), int):
+            status_code = error['code']
+        return OpenRouterAPIError(
+            str(error)[:500], model, status_code,
+            retry_after=parse_retry_after(response.headers.get('Retry-After'))
+        )
+
+    def _post_completion(self, messages, model, params):
         data = {
             "model": model,
-            "messages": messages,
-            "max_tokens": 4000,
-            "temperature": 0.7
+            "messages": self._wire_messages(messages, model),
+            # Usage accounting includes cached prompt tokens
+            "usage": {"include": True},
+            **params
         }
-        
-        response = requests.post(self.base_url, headers=headers, json=data)
-        result = response.json()
-        
+
+        start = time.monotonic()
+        try:
+            response = self.session.post(self.base_url, headers=self._headers(), json=data,
+                                         timeout=get_timeout(model))
+            result = response.json()
+        except requests.Timeout as e:
+            raise OpenRouterTimeoutError(str(e), model) from e
+        except ValueError as e:
+            # Checked before RequestException: requests' JSONDecodeError is both
+            raise OpenRouterAPIError(f"Invalid JSON response (status {response.status_code})",
+                                     model, response.status_code) from e
+        except requests.RequestException as e:
+            raise OpenRouterConnectionError(str(e), model) from e
+        latency = time.monotonic() - start
+
         if 'choices' in result and len(result['choices']) > 0:
-            return result['choices'][0]['message']['content']
+            content = result['choices'][0]['message']['content']
+            stats = {"model": model, "streamed": False, "ttft": latency, "latency": latency}
+            stats.update(self._usage_stats(result.get('usage')))
+            if stats.get("completion_tokens") is None:
+                stats["completion_tokens"] = estimate_tokens(content)
+            return content, stats
         else:
             print(f"API Error: {result}")
-            return "Error: Could not get response from AI"
+            raise self._api_error(response, result.get('error', result), model)
+
+    def _post_stream(self, messages, model, params, on_text=None):
+        data = {
+            "model": model,
+            "messages": self._wire_messages(messages, model),
+            "stream": True,
+            # Ask for token counts in the final chunk
+            "usage": {"include": True},
+            **params
+        }
+
+        start = time.monotonic()
+        ttft = None
+        parts = []
+        aborted = False
+        usage = None
+        try:
+            with self.session.post(self.base_url, headers=self._headers(), json=data,
+                                   timeout=get_timeout(model), stream=True) as response:
+                if response.status_code != 200:
+                    print(f"API Error: {response.status_code} {response.text[:500]}")
+                    raise self._api_error(response, response.text, model)
+
+                response.encoding = 'utf-8'
+                for line in response.iter_lines(decode_unicode=True):
+                    # Blank lines separate events; ":" lines are keep-alive comments
+                    if not line or line.startswith(':') or not line.startswith('data:'):
+                        continue
+
+                    payload = line[len('data:'):].strip()
+                    if payload == '[DONE]':
+                        break
+
+                    chunk = json.loads(payload)
+                    if 'error' in chunk:
+                        print(f"API Error: {chunk['error']}")
+                        raise self._api_error(response, chunk['error'], model)
+
+                    if chunk.get('usage'):
+                        usage = chunk['usage']
+
+                    choices = chunk.get('choices') or [{}]
+                    delta = (choices[0].get('delta') or {}).get('content') or ''
+                    if not delta:
+                        continue
+
+                    if ttft is None:
+                        ttft = time.monotonic() - start
+                    parts.append(delta)
+
+                    # Leaving the with-block closes the connection, which stops generation
+                    if on_text and on_text(''.join(parts)):
+                        aborted = True
+                        break
+        except requests.Timeout as e:
+            raise OpenRouterTimeoutError(str(e), model) from e
+        except ValueError as e:
+            raise OpenRouterAPIError(f"Invalid SSE chunk: {e}", model) from e
+        except requests.RequestException as e:
+            raise OpenRouterConnectionError(str(e), model) from e
+
+        content = ''.join(parts)
+        stats = {
+            "model": model,
+            "streamed": True,
+            "ttft": ttft,
+            "latency": time.monotonic() - start,
+            "aborted": aborted
+        }
+        stats.update(self._usage_stats(usage))
+        if stats.get("completion_tokens") is None:
+            stats["completion_tokens"] = estimate_tokens(content)
+        return content, stats
+
+    def get_usage(self):
+        """Calls, tokens, model time and estimated USD spent through this client so far"""
+        return dict(self.usage)
+
+    def get_cache_stats(self):
+        """Hit/miss statistics for the response cache, if enabled"""
+        return self.cache.get_stats() if self.cache is not None else {}
+
+    def get_dedupe_stats(self):
+        """How many identical in-flight calls were coalesced"""
+        return _singleflight.get_stats()
+
+    def get_hedge_stats(self):
+        """How often hedges fired and how often they beat the primary"""
+        return hedge_policy.get_stats()
+
+    def get_retry_metrics(self):
+        """Attempts, retries and backoff time for this process"""
+        return retry_metrics.snapshot()
+
+    def get_breaker_status(self):
+        """State of every model's circuit breaker"""
+        return get_breaker_status()
+
+    def get_structured_output_stats(self):
+        """Structured outputs that were valid, repaired, or failed after repair"""
+        with _structured_lock:
+            return dict(_structured_stats)
+
+    def get_rate_limit_stats(self):
+        """Calls admitted, delayed and rejected by the shared rate limiter"""
+        return get_rate_limiter().get_stats()
+
+    def get_transport_stats(self):
+        """Connection reuse counters for the shared transport"""
+        return get_transport_stats()
@@ -0,0 +1,122 @@
+import math
+import os
+import re
+
+# Max prompt tokens per agent. Sections are trimmed lowest-priority first to fit.
+AGENT_PROMPT_BUDGETS = {
+    "research": 2500,
+    "writer": 3000,
+    "keyword": 1500,
+    "seo": 1500,
+    "keyword_seo": 1500,
+    "boss": 2500,
+    "response": 1500,
+}
+DEFAULT_PROMPT_BUDGET = 3000
+
+# Per-message overhead of the chat format (role markers, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+TRIM_MARKER = "\n[...trimmed]"
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+
+def estimate_tokens(text):
+    """Fast local token estimate, erring on the high side
+
+    Claude-style tokenizers average roughly 4 characters per token for English
+    prose; punctuation-heavy text (URLs, JSON) runs closer to one token per
+    symbol, so take whichever estimate is larger.
+    """
+    if not text:
+        return 0
+    by_chars = math.ceil(len(text) / 4)
+    by_pieces = len(_TOKEN_PATTERN.findall(text))
+    return max(by_chars, by_pieces)
+
+
+def estimate_messages_tokens(messages):
+    return sum(estimate_tokens(m.get('content', '')) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+
+def get_prompt_budget(agent):
+    override = os.getenv(f'PROMPT_BUDGET_{(agent or "").upper()}')
+    if override:
+        return int(override)
+    return AGENT_PROMPT_BUDGETS.get(agent, DEFAULT_PROMPT_BUDGET)
+
+
+def truncate_to_tokens(text, max_tokens):
+    """Cut text to roughly max_tokens, preferring a line boundary"""
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    # Shrink proportionally until the estimate fits, then back off to a newline
+    cut = len(text)
+    while cut > 0 and estimate_tokens(text[:cut]) + estimate_tokens(TRIM_MARKER) > max_tokens:
+        cut = int(cut * 0.9)
+    trimmed = text[:cut]
+    newline = trimmed.rfind("\n")
+    if newline > cut // 2:
+        trimmed = trimmed[:newline]
+    return trimmed.rstrip() + TRIM_MARKER if trimmed.strip() else ""
+
+
+def format_search_results(current_trends, max_description_chars=200):
+    """Compact text rendering of Brave results instead of the dict repr"""
+    lines = []
+    for query_name, results in current_trends.items():
+        lines.append(f"{query_name}:")
+        if isinstance(results, list):
+            for result in results:
+                description = (result.get('description') or '')[:max_description_chars]
+                lines.append(f"- {result.get('title', '')}: {description}")
+        else:
+            lines.append(f"- {results}")
+    return "\n".join(lines)
+
+
+class PromptBudget:
+    """Fits a prompt into an agent's token budget
+
+    build_messages(**sections) renders the messages from named section texts.
+    Each section has a priority; when the rendered prompt is over budget the
+    lowest-priority sections are trimmed (then dropped) until it fits.
+    Required content should simply not be passed as a section.
+    """
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.budget = get_prompt_budget(agent)
+
+    def fit(self, build_messages, sections):
+        """sections: {name: (text, priority)}; higher priority is trimmed last"""
+        texts = {name: text or "" for name, (text, _) in sections.items()}
+        messages = build_messages(**texts)
+        total = estimate_messages_tokens(messages)
+        if total <= self.budget:
+            return messages
+
+        overflow = total - self.budget
+        # Lowest priority first; ties broken by declaration order so trimming is deterministic
+        order = sorted(sections, key=lambda name: sections[name][1])
+        trimmed = []
+        for name in order:
+            if overflow <= 0:
+                break
+            current = estimate_tokens(texts[name])
+            if current == 0:
+                continue
+            keep = max(0, current - overflow)
+            texts[name] = truncate_to_tokens(texts[name], keep)
+            overflow -= current - estimate_tokens(texts[name])
+            trimmed.append(name)
+
+        messages = build_messages(**texts)
+        new_total = estimate_messages_tokens(messages)
+        print(f"✂️ [{self.agent}] prompt ~{total} tokens over budget {self.budget}, "
+              f"trimmed {', '.join(trimmed) or 'nothing'} -> ~{new_total} tokens")
+        return messages
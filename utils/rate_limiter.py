@@ -0,0 +1,235 @@
+import os
+import time
+import sqlite3
+import asyncio
+import hashlib
+import threading
+import contextvars
+from contextlib import contextmanager
+
+# Shared by every process on the host that uses the same API keys
+RATE_LIMIT_DB = os.getenv('RATE_LIMIT_DB', 'data/rate_limits.db')
+
+# Per-key budgets; a bucket holds one minute's worth, so short bursts are allowed
+RATE_LIMITS = {
+    "openrouter": {
+        "requests_per_minute": float(os.getenv('RATE_LIMIT_OPENROUTER_RPM', '60')),
+        "tokens_per_minute": float(os.getenv('RATE_LIMIT_OPENROUTER_TPM', '200000')),
+    },
+    "brave": {
+        "requests_per_minute": float(os.getenv('RATE_LIMIT_BRAVE_RPM', '60')),
+        "tokens_per_minute": None,
+    },
+}
+
+# reserve: share of each bucket this class may not dip into, kept for higher classes
+# max_wait: seconds a caller queues for quota before RateLimitExceeded (0 = fail fast)
+PRIORITY_CLASSES = {
+    "posting": {"reserve": 0.0, "max_wait": float(os.getenv('RATE_LIMIT_POSTING_MAX_WAIT', '300'))},
+    "interactive": {"reserve": 0.2, "max_wait": float(os.getenv('RATE_LIMIT_INTERACTIVE_MAX_WAIT', '60'))},
+    "background": {"reserve": 0.5, "max_wait": float(os.getenv('RATE_LIMIT_BACKGROUND_MAX_WAIT', '0'))},
+}
+DEFAULT_PRIORITY = os.getenv('RATE_LIMIT_PRIORITY', 'interactive')
+
+# Priority class of the job currently running in this context
+current_priority = contextvars.ContextVar('rate_limit_priority', default=None)
+
+
+def rate_limit_enabled():
+    """On by default; cassette replays and local stub runs turn it off"""
+    return os.getenv('RATE_LIMIT_ENABLED', '1').lower() not in ('0', 'false', 'no')
+
+
+class RateLimitExceeded(Exception):
+    """Quota for a shared API key is exhausted for this caller's priority class"""
+
+    def __init__(self, name, priority, wait):
+        super().__init__(f"{name} quota exhausted for {priority} callers (next slot in {wait:.1f}s)")
+        self.name = name
+        self.priority = priority
+        self.wait = wait
+
+
+@contextmanager
+def rate_priority(priority):
+    """Run a block under a priority class
+
+        with rate_priority("posting"):
+            pipeline.run_daily_content()
+    """
+    if priority not in PRIORITY_CLASSES:
+        raise ValueError(f"Unknown priority class: {priority}")
+    token = current_priority.set(priority)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+def get_priority():
+    priority = current_priority.get() or DEFAULT_PRIORITY
+    return priority if priority in PRIORITY_CLASSES else 'interactive'
+
+
+class RateLimiter:
+    """Token buckets in SQLite, shared by every process using the same API keys
+
+    Each bucket tracks requests and (for OpenRouter) prompt+completion tokens
+    per API key. Refill is computed from the stored timestamp inside a
+    BEGIN IMMEDIATE transaction, so concurrent processes never double-spend.
+    Lower priority classes stop short of a reserved share of the bucket, so
+    posting jobs still find quota when background engagement has used its part.
+    """
+
+    def __init__(self, db_path=None, limits=None):
+        self.db_path = db_path or RATE_LIMIT_DB
+        self.limits = limits or RATE_LIMITS
+        self._lock = threading.Lock()
+        self.stats = {"acquired": 0, "waited": 0, "wait_seconds": 0.0, "rejected": 0}
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self.init_database()
+
+    def _connect(self):
+        # Autocommit mode so BEGIN IMMEDIATE controls the write lock explicitly
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def init_database(self):
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS rate_buckets (
+                bucket TEXT PRIMARY KEY,
+                requests REAL,
+                tokens REAL,
+                updated_at REAL
+            )
+        """)
+        conn.close()
+
+    @staticmethod
+    def bucket_id(name, api_key=None):
+        """One bucket per API key; only a hash of the key is stored"""
+        if not api_key:
+            return name
+        return f"{name}:{hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:12]}"
+
+    def try_acquire(self, name, api_key=None, tokens=0, priority=None):
+        """Take one request (and tokens) if available; returns 0 or the seconds to wait"""
+        limit = self.limits[name]
+        reserve = PRIORITY_CLASSES[priority or get_priority()]["reserve"]
+        request_capacity = limit["requests_per_minute"]
+        token_capacity = limit.get("tokens_per_minute")
+        # A request larger than the whole bucket would never fit; charge a full bucket instead
+        tokens = min(tokens, token_capacity) if token_capacity else 0
+        bucket = self.bucket_id(name, api_key)
+
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT requests, tokens, updated_at FROM rate_buckets WHERE bucket = ?",
+                               (bucket,)).fetchone()
+            now = time.time()
+            if row is None:
+                available_requests, available_tokens = request_capacity, token_capacity or 0
+            else:
+                elapsed = max(0.0, now - row[2])
+                available_requests = min(request_capacity, row[0] + elapsed * request_capacity / 60)
+                available_tokens = min(token_capacity or 0, row[1] + elapsed * (token_capacity or 0) / 60)
+
+            request_shortfall = reserve * request_capacity + 1 - available_requests
+            token_shortfall = (reserve * token_capacity + tokens - available_tokens) if token_capacity else 0
+            wait = max(0.0, request_shortfall * 60 / request_capacity,
+                       token_shortfall * 60 / token_capacity if token_capacity else 0.0)
+            if wait == 0:
+                available_requests -= 1
+                available_tokens -= tokens
+
+            conn.execute("INSERT OR REPLACE INTO rate_buckets (bucket, requests, tokens, updated_at) "
+                         "VALUES (?, ?, ?, ?)", (bucket, available_requests, available_tokens, now))
+            conn.execute("COMMIT")
+            return wait
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def refund(self, name, api_key=None, tokens=0):
+        """Return tokens reserved up front but not used (estimate above actual usage)"""
+        token_capacity = self.limits[name].get("tokens_per_minute")
+        if not rate_limit_enabled() or not token_capacity or tokens <= 0:
+            return
+        conn = self._connect()
+        try:
+            conn.execute("UPDATE rate_buckets SET tokens = MIN(?, tokens + ?) WHERE bucket = ?",
+                         (token_capacity, tokens, self.bucket_id(name, api_key)))
+        finally:
+            conn.close()
+
+    def _check_wait(self, name, priority, wait, deadline):
+        if time.monotonic() + wait > deadline:
+            self._count(rejected=1)
+            print(f"🚦 {name} quota exhausted for {priority} caller (next slot in {wait:.1f}s)")
+            raise RateLimitExceeded(name, priority, wait)
+
+    def acquire(self, name, api_key=None, tokens=0):
+        """Block until quota is available, or raise RateLimitExceeded per the caller's priority"""
+        if not rate_limit_enabled():
+            return
+        priority = get_priority()
+        deadline = time.monotonic() + PRIORITY_CLASSES[priority]["max_wait"]
+        start = None
+        while True:
+            wait = self.try_acquire(name, api_key, tokens, priority)
+            if wait == 0:
+                self._record_acquired(start)
+                return
+            self._check_wait(name, priority, wait, deadline)
+            start = start or time.monotonic()
+            time.sleep(wait)
+
+    async def aacquire(self, name, api_key=None, tokens=0):
+        """Async acquire: waits with asyncio.sleep so other completions keep running"""
+        if not rate_limit_enabled():
+            return
+        priority = get_priority()
+        deadline = time.monotonic() + PRIORITY_CLASSES[priority]["max_wait"]
+        start = None
+        while True:
+            wait = self.try_acquire(name, api_key, tokens, priority)
+            if wait == 0:
+                self._record_acquired(start)
+                return
+            self._check_wait(name, priority, wait, deadline)
+            start = start or time.monotonic()
+            await asyncio.sleep(wait)
+
+    def _record_acquired(self, start):
+        # start is set only once the caller had to sleep for quota
+        if start is None:
+            self._count(acquired=1)
+        else:
+            self._count(acquired=1, waited=1, wait_seconds=time.monotonic() - start)
+
+    def _count(self, **increments):
+        with self._lock:
+            for key, amount in increments.items():
+                self.stats[key] += amount
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats)
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Process-wide limiter over the shared RATE_LIMIT_DB store"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter()
+    return _rate_limiter
@@ -0,0 +1,231 @@
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import threading
+import contextvars
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+
+# Statuses worth retrying: throttling and transient upstream failures
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+# 1-based attempt number of the call currently running under a RetryEngine
+current_attempt = contextvars.ContextVar('retry_attempt', default=1)
+
+METRICS_DIR = os.getenv('RETRY_METRICS_DIR', 'data/retry_metrics')
+# Snapshots not rewritten for this long belong to processes that are gone; they are deleted on read
+METRICS_MAX_AGE_HOURS = float(os.getenv('RETRY_METRICS_MAX_AGE_HOURS', '24'))
+
+
+class RetryableHTTPError(Exception):
+    """An HTTP response that should be retried"""
+
+    def __init__(self, status_code, retry_after=None, message=None):
+        super().__init__(message or f"HTTP {status_code}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryBudget:
+    """Process-wide token bucket: every retry spends a token
+
+    Keeps a provider outage from multiplying our request volume. When the
+    bucket is empty, failures surface immediately instead of being retried.
+    """
+
+    def __init__(self, capacity=None, refill_per_second=None):
+        self.capacity = capacity or float(os.getenv('RETRY_BUDGET_CAPACITY', '20'))
+        self.refill_per_second = refill_per_second or float(os.getenv('RETRY_BUDGET_REFILL_PER_SEC', '0.1'))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_spend(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+            self.updated_at = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+    def available(self):
+        with self._lock:
+            return self.tokens
+
+
+class RetryMetrics:
+    """Attempt and backoff counters, per target"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.targets = {}
+
+    def _target(self, name):
+        return self.targets.setdefault(name, {
+            "calls": 0, "attempts": 0, "retries": 0, "backoff_seconds": 0.0,
+            "gave_up": 0, "budget_exhausted": 0
+        })
+
+    def record(self, name, **increments):
+        with self._lock:
+            target = self._target(name)
+            for key, amount in increments.items():
+                target[key] += amount
+
+    def snapshot(self):
+        with self._lock:
+            return {name: dict(values) for name, values in self.targets.items()}
+
+    def write_snapshot(self):
+        """Persist this process's counters so the autonomous monitor can read them"""
+        try:
+            os.makedirs(METRICS_DIR, exist_ok=True)
+            process = os.path.splitext(os.path.basename(sys.argv[0] or 'python'))[0] or 'python'
+            path = os.path.join(METRICS_DIR, f"{process}.json")
+            with open(path, 'w') as f:
+                json.dump({
+                    "process": process,
+                    "pid": os.getpid(),
+                    "updated_at": datetime.now().isoformat(),
+                    "targets": self.snapshot()
+                }, f, indent=2)
+        except OSError as e:
+            print(f"⚠️ Could not write retry metrics: {e}")
+
+
+def load_retry_metrics(max_age_hours=None):
+    """Read the retry snapshots written by every process, pruning stale ones"""
+    snapshots = []
+    if not os.path.isdir(METRICS_DIR):
+        return snapshots
+    cutoff = datetime.now() - timedelta(hours=max_age_hours if max_age_hours is not None else METRICS_MAX_AGE_HOURS)
+    for filename in sorted(os.listdir(METRICS_DIR)):
+        if filename.endswith('.json'):
+            path = os.path.join(METRICS_DIR, filename)
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+                if datetime.fromisoformat(snapshot['updated_at']) < cutoff:
+                    os.remove(path)
+                    continue
+                snapshots.append(snapshot)
+            except (OSError, ValueError, KeyError):
+                continue
+    return snapshots
+
+
+retry_budget = RetryBudget()
+retry_metrics = RetryMetrics()
+
+
+class RetryEngine:
+    """Retries transient failures with decorrelated-jitter backoff
+
+    Honours Retry-After when the server sends one, and draws every retry from
+    the shared retry budget.
+    """
+
+    def __init__(self, name, retry_on=(), max_attempts=None, base_delay=None, max_delay=None,
+                 max_retry_after=None, budget=None, metrics=None):
+        self.name = name
+        # Exception types that are always transient (timeouts, dropped connections)
+        self.retry_on = tuple(retry_on)
+        self.max_attempts = max_attempts or int(os.getenv('RETRY_MAX_ATTEMPTS', '3'))
+        self.base_delay = base_delay or float(os.getenv('RETRY_BASE_DELAY', '0.5'))
+        self.max_delay = max_delay or float(os.getenv('RETRY_MAX_DELAY', '20'))
+        # A Retry-After longer than this is not worth waiting for
+        self.max_retry_after = max_retry_after or float(os.getenv('RETRY_MAX_RETRY_AFTER', '60'))
+        self.budget = budget or retry_budget
+        self.metrics = metrics or retry_metrics
+
+    def is_retryable(self, error):
+        if isinstance(error, self.retry_on):
+            return True
+        return getattr(error, 'status_code', None) in RETRY_STATUSES
+
+    def next_delay(self, previous_delay, error):
+        """Decorrelated jitter, unless the server told us how long to wait"""
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after is not None:
+            return retry_after
+        return min(self.max_delay, random.uniform(self.base_delay, previous_delay * 3))
+
+    def _plan_retry(self, attempt, previous_delay, error):
+        """Delay before the next attempt, or None to give up and re-raise"""
+        if attempt >= self.max_attempts or not self.is_retryable(error):
+            if self.is_retryable(error):
+                self.metrics.record(self.name, gave_up=1)
+            return None
+
+        delay = self.next_delay(previous_delay, error)
+        if delay > self.max_retry_after:
+            self.metrics.record(self.name, gave_up=1)
+            return None
+
+        if not self.budget.try_spend():
+            print(f"⚠️ Retry budget exhausted, not retrying {self.name}: {error}")
+            self.metrics.record(self.name, budget_exhausted=1, gave_up=1)
+            self.metrics.write_snapshot()
+            return None
+
+        self.metrics.record(self.name, retries=1, backoff_seconds=delay)
+        self.metrics.write_snapshot()
+        print(f"🔄 {self.name} attempt {attempt} failed ({error}), retrying in {delay:.1f}s")
+        return delay
+
+    def call(self, fn, *args, **kwargs):
+        """Call fn, retrying transient failures (blocking)"""
+        self.metrics.record(self.name, calls=1)
+        delay = self.base_delay
+        attempt = 0
+        while True:
+            attempt += 1
+            self.metrics.record(self.name, attempts=1)
+            current_attempt.set(attempt)
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._plan_retry(attempt, delay, e)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+
+    async def acall(self, coro_factory):
+        """Await coro_factory(), retrying transient failures without blocking the loop"""
+        self.metrics.record(self.name, calls=1)
+        delay = self.base_delay
+        attempt = 0
+        while True:
+            attempt += 1
+            self.metrics.record(self.name, attempts=1)
+            current_attempt.set(attempt)
+            try:
+                return await coro_factory()
+            except Exception as e:
+                delay = self._plan_retry(attempt, delay, e)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
@@ -0,0 +1,68 @@
+import os
+import re
+
+# Pipeline levels, upstream first; a revision reruns the level the feedback implicates and everything after it.
+# Searches depend only on the research plan, so feedback never implicates them; the boss always reviews again.
+REVISION_LEVELS = ("search", "research", "writer", "optimize", "boss")
+
+STAGE_LEVELS = {
+    "research": "research",
+    "writer": "writer",
+    "keyword": "optimize",
+    "seo": "optimize",
+    "keyword_seo": "optimize",
+    "boss": "boss",
+}
+
+# Phrases in boss feedback that point at a level; the most upstream match wins. Only phrases
+# that name a stage's own responsibility belong here: words like "specific" or "professional"
+# turn up in almost every critique and would send every revision back to research.
+FEEDBACK_RULES = {
+    "research": [
+        r"\bresearch\b", r"\bfactual", r"\bfact[- ]check", r"\binaccura", r"\boutdated", r"\bout of date",
+        r"\bincorrect (claim|fact|figure|stat)", r"\bunsupported claim", r"\bmisleading claim",
+        r"\bcite (a|the)? ?sources?\b", r"\bwrong (topic|theme)\b", r"\boff[- ]topic\b",
+    ],
+    "writer": [
+        r"\bhook\b", r"\btone\b", r"\bvoice\b", r"\bcall[- ]to[- ]action\b", r"\bcta\b", r"\btemplate\b",
+        r"\bopening line\b", r"\bstructure\b", r"\bwording\b", r"\bfiller\b", r"\brewrite\b", r"\bstory\b",
+    ],
+    "optimize": [
+        r"\bhashtags?\b", r"#\w", r"\bkeywords?\b", r"\bseo\b", r"\bdiscoverab", r"\bemojis?\b",
+        r"\btoo long\b", r"\b280\b", r"\bcharacter (count|limit)\b",
+    ],
+}
+
+# Feedback no rule recognises reruns from here: the boss only sees the final tweet, so a critique
+# that names no stage is about the draft. REVISION_DEFAULT_LEVEL=research redoes research too.
+DEFAULT_REVISION_LEVEL = os.getenv('REVISION_DEFAULT_LEVEL', 'writer')
+
+_COMPILED_RULES = {level: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+                   for level, patterns in FEEDBACK_RULES.items()}
+
+
+def stage_level(stage_name):
+    """Level of a stage-graph node; candidate copies (writer_2) and searches (search_news) map to their base"""
+    if stage_name.startswith("search_"):
+        return "search"
+    return STAGE_LEVELS.get(re.sub(r'_\d+$', '', stage_name), "boss")
+
+
+def classify_feedback(feedback):
+    """(level, matched phrases) for a boss rejection: the most upstream level the feedback implicates"""
+    for level in REVISION_LEVELS:
+        matches = []
+        for pattern in _COMPILED_RULES.get(level, []):
+            match = pattern.search(feedback or "")
+            if match:
+                matches.append(match.group(0).lower())
+        if matches:
+            return level, matches
+    level = DEFAULT_REVISION_LEVEL if DEFAULT_REVISION_LEVEL in REVISION_LEVELS else "writer"
+    return level, []
+
+
+def reused_stages(stage_names, level):
+    """Stages upstream of level, whose outputs the revision keeps"""
+    cutoff = REVISION_LEVELS.index(level)
+    return [name for name in stage_names if REVISION_LEVELS.index(stage_level(name)) < cutoff]
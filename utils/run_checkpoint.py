@@ -0,0 +1,78 @@
+import os
+import json
+from datetime import datetime, timedelta
+from utils.database import TwitterDatabase
+
+# Unfinished runs younger than this are resumed by the next daily run instead of starting over
+PIPELINE_RESUME_HOURS = float(os.getenv('PIPELINE_RESUME_HOURS', '6'))
+
+# running: attempts in progress; approved: waiting to be posted; posting: post_tweet was called;
+# posted, buffered (handed to the content buffer), rejected and failed are final
+RESUMABLE_STATUSES = ("running", "approved")
+
+
+class RunCheckpoint:
+    """Durable record of one strategic pipeline run and its stage outputs
+
+    The run row in pipeline_runs holds the plan, options, current attempt and
+    status; pipeline_checkpoints holds every value of the current attempt's
+    stage-graph context as JSON. A restarted run loads those values back as
+    the graph context, and StageGraph skips every stage whose outputs are
+    already there, so no paid call is made twice.
+    """
+
+    def __init__(self, db=None, run_id=None):
+        self.db = db or TwitterDatabase()
+        self.run_id = run_id
+
+    def load(self):
+        """The run row, or None when this run id has never been checkpointed"""
+        return self._safe(lambda: self.db.get_pipeline_run(self.run_id))
+
+    def start(self, daily_plan, options):
+        self._safe(lambda: self.db.save_pipeline_run({
+            "run_id": self.run_id,
+            "daily_plan": json.dumps(daily_plan, default=str),
+            "options": json.dumps(options),
+            "status": "running",
+            "attempt": 1
+        }))
+
+    def save_values(self, attempt, values):
+        """Checkpoint context values or stage outputs for an attempt"""
+        serialized = {name: json.dumps(value, default=str) for name, value in values.items()}
+        self._safe(lambda: self.db.save_checkpoint_values(self.run_id, attempt, serialized))
+
+    def load_values(self, attempt):
+        rows = self._safe(lambda: self.db.get_checkpoint_values(self.run_id, attempt)) or {}
+        return {name: json.loads(value) for name, value in rows.items()}
+
+    def set_status(self, status, **fields):
+        """Update status plus any of attempt, approved (a dict) and tweet_id"""
+        if "approved" in fields:
+            fields["approved"] = json.dumps(fields["approved"], default=str)
+        self._safe(lambda: self.db.update_pipeline_run(self.run_id, status=status, **fields))
+
+    @staticmethod
+    def _safe(operation):
+        # Checkpointing must never break the run it protects
+        try:
+            return operation()
+        except Exception as e:
+            print(f"⚠️ Could not access run checkpoint: {e}")
+            return None
+
+
+def find_resumable_run(db, topic, max_age_hours=None):
+    """Newest unfinished run for a topic started within the resume window, or None"""
+    max_age = timedelta(hours=max_age_hours if max_age_hours is not None else PIPELINE_RESUME_HOURS)
+    since = (datetime.now() - max_age).isoformat(sep=' ')
+    try:
+        runs = db.get_pipeline_runs(since, RESUMABLE_STATUSES)
+    except Exception as e:
+        print(f"⚠️ Could not read unfinished runs: {e}")
+        return None
+    for run in runs:
+        if json.loads(run["daily_plan"]).get("topic") == topic:
+            return run
+    return None
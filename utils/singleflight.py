@@ -0,0 +1,52 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Coalesce identical in-flight calls so they share one result
+
+    Works across threads and event loops: the first caller for a key runs the
+    call, everyone else arriving before it finishes waits on the same future.
+    A waiter that is cancelled (say by its own wait_for timeout) stops
+    waiting without cancelling the shared future for the others.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "executed": 0, "coalesced": 0}
+
+    async def do(self, key, coro_factory):
+        with self._lock:
+            self.stats["calls"] += 1
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+                self.stats["executed"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            # Cancelling a bare wrap_future would cancel the shared future under everyone else
+            return await asyncio.shield(asyncio.wrap_future(future))
+
+        try:
+            result = await coro_factory()
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+            raise
+        else:
+            if not future.done():
+                future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats, inflight=len(self._inflight))
@@ -0,0 +1,218 @@
+import os
+import time
+import asyncio
+import functools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from utils.openrouter_client import run_sync
+
+# Blocking agent calls run here; independent stages of one graph overlap on these threads
+STAGE_WORKERS = int(os.getenv('STAGE_WORKERS', '8'))
+_stage_executor = ThreadPoolExecutor(max_workers=STAGE_WORKERS, thread_name_prefix="stage")
+
+_NO_FALLBACK = object()
+
+
+class StageGraphError(Exception):
+    """The graph is malformed: duplicate outputs, missing inputs or a cycle"""
+
+
+class StageTimeoutError(Exception):
+    """A stage ran past its timeout"""
+
+    def __init__(self, stage, timeout):
+        super().__init__(f"Stage {stage} timed out after {timeout:g}s")
+        self.stage = stage
+        self.timeout = timeout
+
+
+class Stage:
+    """One node of a StageGraph
+
+    fn is called with the declared inputs as keyword arguments and returns
+    its single output, or a tuple in the order of outputs when it declares
+    several. inputs is a sequence of value names, or a mapping of argument
+    name to value name so one function can serve several copies of a stage
+    (writer_1, writer_2, ...). Outputs default to the stage name. A stage that times out or
+    raises one of retry_on is tried again up to retries times; when it still
+    fails, fallback (a value, or a callable taking the error) stands in for
+    its output if given, otherwise the error ends the run. A timeout cannot
+    stop fn's worker thread, so retrying a timed-out stage runs a second call
+    next to the first: keep retries at 0 for stages whose calls cost money.
+    """
+
+    def __init__(self, name, fn, inputs=(), outputs=None, timeout=None, retries=0,
+                 retry_on=(StageTimeoutError,), fallback=_NO_FALLBACK):
+        self.name = name
+        self.fn = fn
+        # argument name -> value name
+        self.inputs = dict(inputs) if isinstance(inputs, dict) else {name: name for name in inputs}
+        self.outputs = tuple(outputs) if outputs else (name,)
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_on = retry_on
+        self.fallback = fallback
+
+    def fallback_value(self, error):
+        value = self.fallback(error) if callable(self.fallback) else self.fallback
+        return value if len(self.outputs) > 1 else (value,)
+
+
+class StageRun:
+    """Outputs and per-stage records of one graph execution"""
+
+    def __init__(self, values):
+        self.values = values
+        self.started = time.monotonic()
+        self.records = []
+        # Seconds from the start of the run until each stage finished
+        self.finished = {}
+        self.wall_time = 0.0
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+    def summary(self):
+        parts = []
+        for record in self.records:
+            part = f"{record['stage']} {record['wall_time']:.1f}s"
+            if record["tries"] > 1:
+                part += f" ({record['tries']} tries)"
+            if record["status"] != "ok":
+                part += f" [{record['status']}]"
+            parts.append(part)
+        return " | ".join(parts) + f" => {self.wall_time:.1f}s wall"
+
+
+class StageGraph:
+    """Runs stages as soon as their inputs exist, independent ones concurrently
+
+    Values already in the initial context count as available, and a stage
+    whose outputs are all present is not run at all (recorded as "reused").
+    on_stage(record, outputs) is called as each stage finishes, with outputs
+    None for failures; records hold stage, status (ok, fallback, reused,
+    failed, timeout, cancelled), started_at, wall_time, tries and error.
+    """
+
+    def __init__(self, stages, on_stage=None, executor=None):
+        self.stages = list(stages)
+        self.on_stage = on_stage
+        self.executor = executor or _stage_executor
+        self._producers = {}
+        for stage in self.stages:
+            for output in stage.outputs:
+                if output in self._producers:
+                    raise StageGraphError(f"{output} is produced by both {self._producers[output]} and {stage.name}")
+                self._producers[output] = stage.name
+
+    def validate(self, available):
+        """Raise StageGraphError unless every stage can eventually run"""
+        available = set(available)
+        remaining = [s for s in self.stages if not all(o in available for o in s.outputs)]
+        while remaining:
+            ready = [s for s in remaining if all(i in available for i in s.inputs.values())]
+            if not ready:
+                missing = {i for s in remaining for i in s.inputs.values()
+                           if i not in available and i not in self._producers}
+                detail = f"missing inputs {sorted(missing)}" if missing else "cycle between " + \
+                    ", ".join(s.name for s in remaining)
+                raise StageGraphError(f"Cannot run stages: {detail}")
+            for stage in ready:
+                available.update(stage.outputs)
+            remaining = [s for s in remaining if s not in ready]
+
+    def run(self, context):
+        """Blocking wrapper around arun"""
+        return run_sync(self.arun(context))
+
+    async def arun(self, context):
+        self.validate(context)
+        run = StageRun(dict(context))
+        pending = []
+        for stage in self.stages:
+            if all(output in run.values for output in stage.outputs):
+                self._finish(run, stage, self._record(stage, "reused"), None)
+            else:
+                pending.append(stage)
+
+        running = {}
+        try:
+            while pending or running:
+                for stage in [s for s in pending if all(i in run.values for i in s.inputs.values())]:
+                    pending.remove(stage)
+                    kwargs = {arg: run.values[name] for arg, name in stage.inputs.items()}
+                    running[asyncio.ensure_future(self._run_stage(stage, kwargs))] = stage
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    stage = running.pop(task)
+                    record, outputs, error = task.result()
+                    if error is not None:
+                        self._finish(run, stage, record, None)
+                        raise error
+                    run.values.update(outputs)
+                    self._finish(run, stage, record, outputs)
+        finally:
+            # Worker threads cannot be interrupted; their results are simply dropped
+            for task, stage in running.items():
+                task.cancel()
+                self._finish(run, stage, self._record(stage, "cancelled"), None)
+            run.wall_time = time.monotonic() - run.started
+            print(f"⏱️ {run.summary()}")
+        return run
+
+    async def _run_stage(self, stage, kwargs):
+        """Returns (record, outputs, error); never raises so siblings are not orphaned"""
+        loop = asyncio.get_running_loop()
+        record = self._record(stage, "ok")
+        start = time.monotonic()
+        error = None
+        for try_number in range(1, stage.retries + 2):
+            record["tries"] = try_number
+            # Copy the context so priority classes and other context vars reach the worker thread
+            call = functools.partial(contextvars.copy_context().run, stage.fn, **kwargs)
+            future = loop.run_in_executor(self.executor, call)
+            try:
+                if stage.timeout:
+                    result = await asyncio.wait_for(future, stage.timeout)
+                else:
+                    result = await future
+                error = None
+                break
+            except asyncio.TimeoutError:
+                error = StageTimeoutError(stage.name, stage.timeout)
+            except Exception as e:
+                error = e
+            if try_number > stage.retries or not isinstance(error, stage.retry_on):
+                break
+            print(f"🔁 [{stage.name}] {error}; retrying ({try_number}/{stage.retries})")
+
+        record["wall_time"] = time.monotonic() - start
+        if error is not None:
+            record["error"] = str(error)[:500]
+            if stage.fallback is _NO_FALLBACK:
+                record["status"] = "timeout" if isinstance(error, StageTimeoutError) else "failed"
+                return record, None, error
+            record["status"] = "fallback"
+            print(f"⚠️ [{stage.name}] {error}; using fallback output")
+            result = stage.fallback_value(error)
+        elif len(stage.outputs) == 1:
+            result = (result,)
+        return record, dict(zip(stage.outputs, result)), None
+
+    @staticmethod
+    def _record(stage, status):
+        return {"stage": stage.name, "status": status, "started_at": datetime.now().isoformat(sep=' '),
+                "wall_time": 0.0, "tries": 0, "error": None}
+
+    def _finish(self, run, stage, record, outputs):
+        run.records.append(record)
+        run.finished[stage.name] = time.monotonic() - run.started
+        if self.on_stage is None:
+            return
+        # Recording must never break the run
+        try:
+            self.on_stage(record, outputs)
+        except Exception as e:
+            print(f"⚠️ Could not record stage {stage.name}: {e}")
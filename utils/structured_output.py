@@ -0,0 +1,141 @@
+import re
+import json
+
+# Boss verdict: the tweet to post on APPROVE, actionable feedback on REJECT
+BOSS_REVIEW_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "verdict": {"type": "string", "enum": ["APPROVE", "REJECT"]},
+        "tweet": {"type": "string"},
+        "feedback": {"type": "string"},
+        "hashtags": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["verdict", "tweet", "feedback", "hashtags"],
+    "additionalProperties": False
+}
+
+# Comparative boss review: the 1-based candidate picked (0 when all are rejected) plus the verdict fields
+BOSS_PICK_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "verdict": {"type": "string", "enum": ["APPROVE", "REJECT"]},
+        "choice": {"type": "integer"},
+        "tweet": {"type": "string"},
+        "feedback": {"type": "string"},
+        "hashtags": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["verdict", "choice", "tweet", "feedback", "hashtags"],
+    "additionalProperties": False
+}
+
+# SEO pass: the final tweet and the hashtags placed in it
+SEO_TWEET_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "tweet": {"type": "string", "minLength": 1},
+        "hashtags": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["tweet", "hashtags"],
+    "additionalProperties": False
+}
+
+_JSON_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+}
+
+_FENCE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$', re.IGNORECASE)
+
+
+def response_format(name, schema):
+    """OpenRouter response_format asking the provider to constrain output to a schema"""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "strict": True, "schema": schema}
+    }
+
+
+def schema_prompt(schema):
+    """Schema text for prompts, for models that ignore response_format"""
+    return json.dumps(schema, separators=(',', ':'))
+
+
+def extract_json(text):
+    """Parse the JSON object in a completion, tolerating code fences and stray prose around it"""
+    text = _FENCE.sub('', (text or '').strip())
+    start, end = text.find('{'), text.rfind('}')
+    if start == -1 or end < start:
+        raise ValueError("no JSON object in output")
+    return json.loads(text[start:end + 1])
+
+
+def json_object_complete(text):
+    """True once a streamed completion has closed its top-level JSON object"""
+    depth = 0
+    in_string = escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return True
+    return False
+
+
+def validate(data, schema, path="$"):
+    """Check data against the JSON Schema subset used here; returns a list of error strings"""
+    expected = schema.get("type")
+    if expected:
+        types = _JSON_TYPES[expected]
+        # bool is an int in Python but not in JSON
+        if not isinstance(data, types) or (expected in ("integer", "number") and isinstance(data, bool)):
+            return [f"{path}: expected {expected}, got {type(data).__name__}"]
+
+    errors = []
+    if "enum" in schema and data not in schema["enum"]:
+        errors.append(f"{path}: {data!r} is not one of {schema['enum']}")
+    if isinstance(data, str):
+        if len(data) < schema.get("minLength", 0):
+            errors.append(f"{path}: shorter than {schema['minLength']} characters")
+        if "maxLength" in schema and len(data) > schema["maxLength"]:
+            errors.append(f"{path}: longer than {schema['maxLength']} characters")
+    if isinstance(data, dict):
+        properties = schema.get("properties", {})
+        for name in schema.get("required", []):
+            if name not in data:
+                errors.append(f"{path}: missing required field {name!r}")
+        for name, value in data.items():
+            if name in properties:
+                errors.extend(validate(value, properties[name], f"{path}.{name}"))
+            elif schema.get("additionalProperties") is False:
+                errors.append(f"{path}: unexpected field {name!r}")
+    if isinstance(data, list) and "items" in schema:
+        for i, item in enumerate(data):
+            errors.extend(validate(item, schema["items"], f"{path}[{i}]"))
+    return errors
+
+
+def parse_structured(text, schema, check=None):
+    """(data, errors) for a completion; check(data) may add errors the schema cannot express"""
+    try:
+        data = extract_json(text)
+    except ValueError as e:
+        return None, [f"invalid JSON: {e}"]
+    errors = validate(data, schema)
+    if not errors and check is not None:
+        errors = check(data)
+    return data, errors
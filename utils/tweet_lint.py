@@ -0,0 +1,135 @@
+import os
+import re
+import threading
+
+TWEET_LIMIT = 280
+# Twitter wraps every link in a t.co URL of this length, whatever the original length
+URL_LENGTH = 23
+MAX_HASHTAGS = int(os.getenv('LINT_MAX_HASHTAGS', '5'))
+# WriterAgent rule: "Maximum 1 emoji per tweet", not counting the emojis a template's own hook uses
+MAX_EXTRA_EMOJIS = int(os.getenv('LINT_MAX_EMOJIS', '1'))
+
+# Code points twitter-text counts as 1; everything else (CJK, emoji, ...) counts as 2
+_LIGHT_RANGES = ((0x0000, 0x10FF), (0x2000, 0x200D), (0x2010, 0x201F), (0x2032, 0x2037))
+
+_URL = re.compile(r'https?://\S+|\bwww\.\S+', re.IGNORECASE)
+_HASHTAG = re.compile(r'(?<!\w)#\w+')
+# One emoji, with its variation selector, skin tone and any zero-width-joined parts
+_EMOJI = re.compile(
+    r'(?:[\U0001F000-\U0001FAFF\u2300-\u23FF\u2600-\u27BF\u2B00-\u2BFF]\uFE0F?[\U0001F3FB-\U0001F3FF]?)'
+    r'(?:\u200D[\U0001F000-\U0001FAFF\u2600-\u27BF\u2640\u2642]\uFE0F?)*'
+)
+# Closing lines the templates prescribe: End with: "Agree?" / Engagement closer: "What would you build with this?"
+_TEMPLATE_CLOSER = re.compile(r'(?:End with|Engagement closer):\s*"([^"]+)"', re.IGNORECASE)
+_ENGAGEMENT_PHRASES = re.compile(
+    r'\?|👇|\b(?:drop|comment|reply|share|let me know|tell me|your thoughts|thoughts below|dm me|follow)\b',
+    re.IGNORECASE
+)
+
+
+def _char_weight(char):
+    code = ord(char)
+    return 1 if any(low <= code <= high for low, high in _LIGHT_RANGES) else 2
+
+
+def weighted_length(text):
+    """Length as Twitter counts it: URLs are 23, emojis and CJK characters 2, everything else 1"""
+    text = _URL.sub('x' * URL_LENGTH, text or '')
+    length = 0
+    position = 0
+    for match in _EMOJI.finditer(text):
+        length += sum(_char_weight(char) for char in text[position:match.start()]) + 2
+        position = match.end()
+    return length + sum(_char_weight(char) for char in text[position:])
+
+
+def truncate_weighted(text, limit=TWEET_LIMIT, ellipsis="..."):
+    """Cut text to fit limit by Twitter's count, ending in ellipsis when anything was cut"""
+    if weighted_length(text) <= limit:
+        return text
+    budget = limit - weighted_length(ellipsis)
+    # Drop whole characters from the end until the rest fits; never splits an emoji sequence
+    cut = len(text)
+    while cut > 0 and weighted_length(text[:cut]) > budget:
+        cut -= 1
+    return text[:cut].rstrip() + ellipsis
+
+
+def pre_review_lint_enabled():
+    return os.getenv('PRE_REVIEW_LINT', '1').lower() not in ('0', 'false', 'no')
+
+
+class TweetLinter:
+    """Deterministic checks a draft must pass before the boss reviews it
+
+    The rules come from WriterAgent: its system prompt (280 characters,
+    at most one emoji, always end with an engagement hook), the keyword
+    stage's 3-5 hashtags, and each template's own hook emojis and closing
+    line. A failing draft is rejected with machine feedback instead of a
+    Sonnet review it would fail anyway.
+    """
+
+    def __init__(self, templates):
+        self.closers = {}
+        self.template_emojis = {}
+        for content_type, template in templates.items():
+            self.closers[content_type] = [closer.strip() for closer in _TEMPLATE_CLOSER.findall(template)]
+            self.template_emojis[content_type] = set(_EMOJI.findall(template))
+        self._lock = threading.Lock()
+        self.stats = {"checked": 0, "rejected": 0, "boss_calls_avoided": 0}
+
+    def lint(self, text, content_type=None):
+        """List of problems with a final draft; empty when it may go to review"""
+        text = (text or '').strip()
+        if not text:
+            return ["The draft is empty."]
+
+        issues = []
+        length = weighted_length(text)
+        if length > TWEET_LIMIT:
+            issues.append(f"The tweet is too long: {length} characters by Twitter's count (emojis and links "
+                          f"count extra), limit {TWEET_LIMIT}. Cut {length - TWEET_LIMIT} characters.")
+
+        hashtags = _HASHTAG.findall(text)
+        if len(hashtags) > MAX_HASHTAGS:
+            issues.append(f"Too many hashtags: {len(hashtags)} ({' '.join(hashtags)}); use at most {MAX_HASHTAGS}.")
+
+        sanctioned = self.template_emojis.get(content_type, set())
+        extra = [emoji for emoji in _EMOJI.findall(text) if emoji not in sanctioned]
+        if len(extra) > MAX_EXTRA_EMOJIS:
+            issues.append(f"Too many emojis: {len(extra)} ({''.join(extra)}); use at most {MAX_EXTRA_EMOJIS} "
+                          f"besides the template's own.")
+
+        if not self._has_engagement_hook(text, content_type):
+            closers = self.closers.get(content_type)
+            example = f' such as "{closers[0]}"' if closers else ""
+            issues.append(f"No engagement hook at the end: finish with a question or call to reply{example}.")
+        return issues
+
+    def _has_engagement_hook(self, text, content_type):
+        # Hashtags trail the hook, so look at the last sentences before them
+        body = _HASHTAG.sub('', text).strip()
+        ending = body[-140:]
+        if any(closer.lower().rstrip('?!.') in body.lower() for closer in self.closers.get(content_type, [])):
+            return True
+        return _ENGAGEMENT_PHRASES.search(ending) is not None
+
+    def record(self, results):
+        """Count one pre-review check: the issue lists of every draft the boss would have seen
+
+        The boss call is avoided only when every draft failed.
+        """
+        with self._lock:
+            self.stats["checked"] += len(results)
+            self.stats["rejected"] += sum(1 for issues in results if issues)
+            if results and all(results):
+                self.stats["boss_calls_avoided"] += 1
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats)
+
+
+def lint_feedback(issues):
+    """Machine feedback for the revision loop, worded like a boss rejection"""
+    return "Automated pre-review check failed; fix these before review:\n" + "\n".join(f"- {issue}" for issue in issues)
@@ -1,13 +1,20 @@
 import tweepy
 import os
 from dotenv import load_dotenv
+from utils.cassette import wrap_client
+from utils.tweet_lint import truncate_weighted
 
 load_dotenv()
 
 class TwitterClient:
     def __init__(self):
+        # Record or replay every API call when CASSETTE_MODE is set
+        self.client = wrap_client("twitter", self._build_client)
+        self.api = wrap_client("twitter_v1", self._build_api)
+    
+    def _build_client(self):
         # Initialize v2 API client
-        self.client = tweepy.Client(
+        return tweepy.Client(
             bearer_token=os.getenv('TWITTER_BEARER_TOKEN'),
             consumer_key=os.getenv('TWITTER_API_KEY'),
             consumer_secret=os.getenv('TWITTER_API_SECRET'),
@@ -15,7 +22,8 @@ class TwitterClient:
             access_token_secret=os.getenv('TWITTER_ACCESS_TOKEN_SECRET'),
             wait_on_rate_limit=True
         )
-        
+    
+    def _build_api(self):
         # Initialize v1.1 API client for trends functionality
         auth = tweepy.OAuth1UserHandler(
             os.getenv('TWITTER_API_KEY'),
@@ -23,13 +31,12 @@ class TwitterClient:
             os.getenv('TWITTER_ACCESS_TOKEN'),
             os.getenv('TWITTER_ACCESS_TOKEN_SECRET')
         )
-        self.api = tweepy.API(auth, wait_on_rate_limit=True)
+        return tweepy.API(auth, wait_on_rate_limit=True)
     
     def post_tweet(self, content):
         try:
-            # Ensure content is under 280 characters to avoid 403 errors
-            if len(content) >= 280:
-                content = content[:277] + "..."
+            # Ensure content fits 280 characters as Twitter counts them (emojis, links) to avoid 403 errors
+            content = truncate_weighted(content)
             
             response = self.client.create_tweet(text=content)
             print(f"✅ Tweet posted successfully: {response}")